@@ -1,9 +1,17 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
 from django.core.validators import FileExtensionValidator
 from users.models import User, JobSeekerProfile
 from jobs.models import Job
 import uuid
 
+
+def adjust_applications_count(job_id, delta):
+    # A single UPDATE, so concurrent applies can't overwrite each other's count
+    Job.objects.filter(pk=job_id).update(applications_count=Greatest(F('applications_count') + delta, 0))
+
+
 class JobApplication(models.Model):
     APPLICATION_STATUS = (
         ('pending', 'Pending'),
@@ -59,12 +67,33 @@ class JobApplication(models.Model):
     def __str__(self):
         return f"{self.applicant.email} applied for {self.job.title}"
     
+    @staticmethod
+    def is_counted(status):
+        """Whether an application in `status` counts toward Job.applications_count."""
+        return status is not None and status != 'withdrawn'
+    
     def save(self, *args, **kwargs):
-        # Update job applications count
-        if not self.pk:  # New application
-            self.job.applications_count += 1
-            self.job.save(update_fields=['applications_count'])
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            previous_status = self._previous_status(kwargs.get('update_fields'))
+            super().save(*args, **kwargs)
+            delta = self.is_counted(self.status) - self.is_counted(previous_status)
+            if delta:
+                adjust_applications_count(self.job_id, delta)
+    
+    def _previous_status(self, update_fields):
+        if self._state.adding:
+            return None
+        if update_fields is not None and 'status' not in update_fields:
+            return self.status
+        # Lock the row so two concurrent status changes can't both adjust the count
+        return (
+            JobApplication.objects.select_for_update()
+            .filter(pk=self.pk).values_list('status', flat=True).first()
+        )
+    
+    def withdraw(self):
+        self.status = 'withdrawn'
+        self.save(update_fields=['status', 'last_updated'])
     
     class Meta:
         db_table = 'job_applications'
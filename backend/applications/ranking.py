@@ -0,0 +1,132 @@
+"""Scores a job's applicants against its skill requirements in a fixed number of queries."""
+import numpy as np
+
+from jobs.recommendations import (
+    EXPERIENCE_FIT, EXPERIENCE_RANKS, NEUTRAL_FIT, PROFICIENCY_FACTORS, REQUIREMENT_WEIGHTS,
+    YEARS_SHORT_FACTOR,
+)
+from users.models import JobSeekerSkill
+from .models import JobApplication
+
+# Applicant scores leave location out: applicants chose the job, wherever it is
+SCORE_WEIGHTS = {'skills': 0.7, 'experience': 0.15, 'salary': 0.15}
+
+ORDERINGS = ('match_score', 'skill_score', 'applied_at')
+
+
+def applications_for(job, application_ids=None):
+    applications = (
+        JobApplication.objects.filter(job=job)
+        .exclude(status='withdrawn')
+        .select_related('applicant', 'job_seeker_profile')
+    )
+    if application_ids is not None:
+        applications = applications.filter(pk__in=application_ids)
+    return list(applications)
+
+
+def rank_applicants(job, applications):
+    """Score `applications` to `job`; returns (requirements, [ranking row, ...])."""
+    requirements = list(job.skill_requirements.select_related('skill').order_by('skill__name'))
+    skill_ids = [requirement.skill_id for requirement in requirements]
+    profile_ids = [application.job_seeker_profile_id for application in applications]
+
+    row_of = {profile_id: row for row, profile_id in enumerate(profile_ids)}
+    col_of = {skill_id: col for col, skill_id in enumerate(skill_ids)}
+    shape = (len(applications), len(requirements))
+    proficiency = np.zeros(shape)
+    years = np.zeros(shape)
+    held = np.zeros(shape, dtype=bool)
+    levels = np.full(shape, None, dtype=object)
+    seeker_skills = JobSeekerSkill.objects.filter(
+        job_seeker_id__in=profile_ids, skill_id__in=skill_ids,
+    ).values_list('job_seeker_id', 'skill_id', 'proficiency_level', 'years_of_experience')
+    for profile_id, skill_id, level, skill_years in seeker_skills:
+        cell = (row_of[profile_id], col_of[skill_id])
+        proficiency[cell] = PROFICIENCY_FACTORS.get(level, 0.4)
+        years[cell] = skill_years
+        held[cell] = True
+        levels[cell] = level
+
+    weight = np.array([REQUIREMENT_WEIGHTS.get(r.requirement_level, 1.0) for r in requirements])
+    min_years = np.array([r.min_experience_years for r in requirements], dtype=np.float64)
+    required = np.array([r.requirement_level == 'required' for r in requirements], dtype=bool)
+
+    meets_years = held & (years >= min_years)
+    credit = weight * proficiency * np.where(meets_years, 1.0, YEARS_SHORT_FACTOR)
+    total_weight = weight.sum()
+    skill_score = credit.sum(axis=1) / total_weight if total_weight else np.full(len(applications), NEUTRAL_FIT)
+    missing_required = (~held & required).sum(axis=1)
+
+    job_rank = EXPERIENCE_RANKS.get(job.experience_level, 0)
+    seeker_ranks = np.array(
+        [EXPERIENCE_RANKS.get(a.job_seeker_profile.experience_level, 0) for a in applications], dtype=np.intp,
+    )
+    experience_fit = EXPERIENCE_FIT[job_rank - seeker_ranks + 3]
+
+    expected = np.array(
+        [a.job_seeker_profile.expected_salary_min_monthly or np.nan for a in applications], dtype=np.float64,
+    )
+    salary_fit = np.full(len(applications), NEUTRAL_FIT)
+    if job.salary_max_monthly:
+        asked = ~np.isnan(expected)
+        # 1.0 when the job pays what the applicant expects, falling off as the gap grows
+        salary_fit[asked] = np.clip(job.salary_max_monthly / expected[asked], 0.0, 1.0) ** 2
+
+    match_score = (
+        SCORE_WEIGHTS['skills'] * skill_score + SCORE_WEIGHTS['experience'] * experience_fit
+        + SCORE_WEIGHTS['salary'] * salary_fit
+    )
+
+    rows = []
+    for row, application in enumerate(applications):
+        profile = application.job_seeker_profile
+        rows.append({
+            'application_id': application.pk,
+            'status': application.status,
+            'applied_at': application.applied_at,
+            'applicant': {
+                'id': application.applicant_id,
+                'name': application.applicant.get_full_name(),
+                'email': application.applicant.email,
+            },
+            'experience_level': profile.experience_level,
+            'city': profile.city,
+            'match_score': round(float(match_score[row]), 4),
+            'skill_score': round(float(skill_score[row]), 4),
+            'experience_fit': round(float(experience_fit[row]), 4),
+            'salary_fit': round(float(salary_fit[row]), 4),
+            'missing_required': int(missing_required[row]),
+            'skills': [
+                {
+                    'skill_id': requirement.skill_id,
+                    'proficiency_level': levels[row, col],
+                    'years_of_experience': int(years[row, col]) if held[row, col] else None,
+                    'meets_years': bool(meets_years[row, col]),
+                    'credit': round(float(credit[row, col] / total_weight), 4) if total_weight else 0.0,
+                }
+                for col, requirement in enumerate(requirements)
+            ],
+        })
+    return requirements, rows
+
+
+def sort_rankings(rows, ordering):
+    """Sort by one of ORDERINGS, '-' prefixed for descending; ties fall back to best match."""
+    field = ordering.lstrip('-')
+    if field not in ORDERINGS:
+        raise ValueError(ordering)
+    rows = sorted(rows, key=lambda row: (-row['match_score'], row['applied_at']))
+    return sorted(rows, key=lambda row: row[field], reverse=ordering.startswith('-'))
+
+
+def requirement_summary(requirements):
+    return [
+        {
+            'skill_id': requirement.skill_id,
+            'name': requirement.skill.name,
+            'requirement_level': requirement.requirement_level,
+            'min_experience_years': requirement.min_experience_years,
+        }
+        for requirement in requirements
+    ]
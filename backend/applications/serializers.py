@@ -0,0 +1,14 @@
+from rest_framework import serializers
+from jobs.serializers import JobSerializer
+from .models import JobApplication
+
+
+class JobApplicationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = JobApplication
+        fields = ['id', 'job', 'cover_letter', 'resume', 'status', 'applied_at', 'last_updated']
+        read_only_fields = ['id', 'job', 'status', 'applied_at', 'last_updated']
+
+
+class MyApplicationSerializer(JobApplicationSerializer):
+    job = JobSerializer(read_only=True)
@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from jobs.models import Job
+from monitoring import metrics
+from .models import JobApplication, adjust_applications_count
+
+
+@receiver(post_delete, sender=JobApplication)
+def decrement_applications_count(sender, instance, origin=None, **kwargs):
+    # Covers queryset and cascade deletes too; a deleted job takes its counter with it
+    if isinstance(origin, Job) or getattr(origin, 'model', None) is Job:
+        return
+    if JobApplication.is_counted(instance.status):
+        adjust_applications_count(instance.job_id, -1)
+
+
+@receiver(post_save, sender=JobApplication)
+def count_application_created(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        metrics.APPLICATIONS_CREATED.inc()
@@ -1,3 +1,129 @@
-from django.test import TestCase
+import threading
 
-# Create your tests here.
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from rest_framework.test import APIClient
+
+from jobs.models import Job, JobCategory
+from users.models import User, JobPosterProfile, JobSeekerProfile
+from .models import JobApplication
+
+
+class ApplicationCounterTestMixin:
+    applicants = 20
+
+    def setUp(self):
+        poster = User.objects.create(
+            username='poster', email='poster@example.com', role='job_poster',
+        )
+        company = JobPosterProfile.objects.create(user=poster, company_name='Stress Co')
+        self.job = Job.objects.create(
+            title='Warehouse associate', description='Loading and unloading.',
+            category=JobCategory.objects.create(name='Logistics'),
+            posted_by=poster, company=company,
+            location='Pune, Maharashtra', city='Pune', state='Maharashtra', status='active',
+        )
+        self.seekers = []
+        for i in range(self.applicants):
+            seeker = User.objects.create(username=f'seeker{i}', email=f'seeker{i}@example.com')
+            JobSeekerProfile.objects.create(user=seeker)
+            self.seekers.append(seeker)
+
+    def apply(self, seeker):
+        client = APIClient()
+        client.force_authenticate(seeker)
+        response = client.post(f'/jobs/{self.job.pk}/apply/', {'cover_letter': 'Available immediately.'})
+        self.assertEqual(response.status_code, 201, response.content)
+
+    def withdraw(self, application):
+        client = APIClient()
+        client.force_authenticate(application.applicant)
+        response = client.post(f'/applications/{application.pk}/withdraw/')
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def applications_count(self):
+        self.job.refresh_from_db(fields=['applications_count'])
+        return self.job.applications_count
+
+
+class ApplicationCounterTest(ApplicationCounterTestMixin, TestCase):
+    applicants = 2
+
+    def test_withdraw_and_reapply(self):
+        self.apply(self.seekers[0])
+        self.apply(self.seekers[1])
+        self.assertEqual(self.applications_count(), 2)
+
+        application = JobApplication.objects.select_related('applicant').get(applicant=self.seekers[0])
+        self.withdraw(application)
+        self.withdraw(application)
+        self.assertEqual(self.applications_count(), 1)
+
+        # Reapplying reopens the withdrawn application instead of adding a second one
+        self.apply(self.seekers[0])
+        self.assertEqual(self.applications_count(), 2)
+        self.assertEqual(JobApplication.objects.filter(job=self.job).count(), 2)
+
+        JobApplication.objects.filter(applicant=self.seekers[1]).delete()
+        self.assertEqual(self.applications_count(), 1)
+
+
+class MyApplicationListTest(ApplicationCounterTestMixin, TestCase):
+    applicants = 2
+
+    def test_lists_own_applications_with_jobs(self):
+        self.apply(self.seekers[0])
+        self.apply(self.seekers[1])
+        client = APIClient()
+        client.force_authenticate(self.seekers[0])
+
+        # One query for the applications and their jobs, one for the skill requirements
+        with self.assertNumQueries(2):
+            response = client.get('/applications/my/')
+        self.assertEqual(response.status_code, 200, response.content)
+        applications = response.json()
+        self.assertEqual(len(applications), 1)
+        self.assertEqual(applications[0]['job']['id'], str(self.job.pk))
+        self.assertEqual(applications[0]['job']['company']['company_name'], 'Stress Co')
+        self.assertEqual(applications[0]['status'], 'pending')
+
+
+# The in-memory SQLite test database can't take writers from other threads
+@skipUnlessDBFeature('test_db_allows_multiple_connections')
+class ApplicationCounterStressTest(ApplicationCounterTestMixin, TransactionTestCase):
+    """Parallel applies, withdrawals and deletes against one job must not lose counter updates."""
+
+    def run_in_parallel(self, action, items):
+        barrier = threading.Barrier(len(items))
+        errors = []
+
+        def worker(item):
+            try:
+                barrier.wait()
+                action(item)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(item,)) for item in items]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_parallel_applies(self):
+        self.run_in_parallel(self.apply, self.seekers)
+        self.assertEqual(JobApplication.objects.filter(job=self.job).count(), self.applicants)
+        self.assertEqual(self.applications_count(), self.applicants)
+
+    def test_parallel_withdrawals_and_deletes(self):
+        self.run_in_parallel(self.apply, self.seekers)
+        applications = list(JobApplication.objects.select_related('applicant').filter(job=self.job))
+        withdrawn, deleted = applications[:5], applications[5:10]
+
+        # Withdrawing the same application twice at once must only count once
+        self.run_in_parallel(self.withdraw, withdrawn + withdrawn)
+        self.run_in_parallel(lambda application: application.delete(), deleted)
+        self.assertEqual(self.applications_count(), self.applicants - 10)
@@ -0,0 +1,10 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('jobs/<uuid:pk>/apply/', views.JobApplyView.as_view(), name='job-apply'),
+    path('jobs/<uuid:pk>/applicants/', views.ApplicantRankingView.as_view(), name='job-applicants'),
+    path('jobs/<uuid:pk>/applicants/compare/', views.ApplicantCompareView.as_view(), name='job-applicants-compare'),
+    path('applications/my/', views.MyApplicationListView.as_view(), name='my-applications'),
+    path('applications/<uuid:pk>/withdraw/', views.ApplicationWithdrawView.as_view(), name='application-withdraw'),
+]
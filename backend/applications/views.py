@@ -1,3 +1,112 @@
-from django.shortcuts import render
+import uuid
 
-# Create your views here.
+from django.db import IntegrityError, transaction
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework import generics, status
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from jobs.models import Job
+from .models import JobApplication
+from .ranking import ORDERINGS, applications_for, rank_applicants, requirement_summary, sort_rankings
+from .serializers import JobApplicationSerializer, MyApplicationSerializer
+
+
+class JobApplyView(generics.CreateAPIView):
+    serializer_class = JobApplicationSerializer
+
+    def create(self, request, pk):
+        profile = getattr(request.user, 'job_seeker_profile', None)
+        if profile is None:
+            raise PermissionDenied('Only job seekers can apply to jobs.')
+        job = get_object_or_404(Job.objects.only('pk', 'application_deadline'), pk=pk, status='active')
+        if job.application_deadline and job.application_deadline < timezone.now():
+            raise ValidationError({'job': 'Applications for this job have closed.'})
+
+        existing = JobApplication.objects.filter(job=job, applicant=request.user).first()
+        if existing is not None and existing.status != 'withdrawn':
+            raise ValidationError({'job': 'You have already applied to this job.'})
+
+        serializer = self.get_serializer(existing, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            with transaction.atomic():
+                # A withdrawn application is reopened rather than duplicated
+                application = serializer.save(
+                    job=job, applicant=request.user, job_seeker_profile=profile, status='pending',
+                )
+        except IntegrityError:
+            raise ValidationError({'job': 'You have already applied to this job.'})
+        return Response(self.get_serializer(application).data, status=status.HTTP_201_CREATED)
+
+
+class MyApplicationListView(generics.ListAPIView):
+    """The signed-in job seeker's applications with their jobs, newest first."""
+    serializer_class = MyApplicationSerializer
+    # The frontend takes the whole list; one seeker's applications are few enough to send at once
+    pagination_class = None
+
+    def get_queryset(self):
+        return (
+            JobApplication.objects.filter(applicant=self.request.user)
+            .select_related('job__category', 'job__posted_by', 'job__company__user')
+            .prefetch_related('job__skill_requirements__skill')
+            .order_by('-applied_at', '-pk')
+        )
+
+
+class ApplicationWithdrawView(APIView):
+    def post(self, request, pk):
+        application = get_object_or_404(JobApplication, pk=pk, applicant=request.user)
+        application.withdraw()
+        return Response(JobApplicationSerializer(application).data)
+
+
+class ApplicantPagination(PageNumberPagination):
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class ApplicantRankingView(APIView):
+    """A job's applicants scored against its skill requirements, for the employer who posted it."""
+
+    def get(self, request, pk):
+        job = get_object_or_404(Job, pk=pk, posted_by=request.user)
+        ordering = request.query_params.get('ordering', '-match_score')
+        if ordering.lstrip('-') not in ORDERINGS:
+            raise ValidationError({'ordering': f"Use one of {', '.join(ORDERINGS)}, optionally prefixed with '-'."})
+
+        applications = applications_for(job)
+        status_filter = request.query_params.get('status')
+        if status_filter:
+            applications = [application for application in applications if application.status == status_filter]
+        requirements, rows = rank_applicants(job, applications)
+
+        paginator = ApplicantPagination()
+        page = paginator.paginate_queryset(sort_rankings(rows, ordering), request, view=self)
+        response = paginator.get_paginated_response(page)
+        response.data['requirements'] = requirement_summary(requirements)
+        return response
+
+
+class ApplicantCompareView(APIView):
+    """Side-by-side breakdown of chosen applicants, in the same few queries for any number of them."""
+    max_candidates = 10
+
+    def get(self, request, pk):
+        job = get_object_or_404(Job, pk=pk, posted_by=request.user)
+        try:
+            ids = [uuid.UUID(value) for value in request.query_params.get('ids', '').split(',') if value]
+        except ValueError:
+            raise ValidationError({'ids': 'Must be comma-separated application ids.'})
+        if not 2 <= len(ids) <= self.max_candidates:
+            raise ValidationError({'ids': f'Compare between 2 and {self.max_candidates} applications.'})
+
+        requirements, rows = rank_applicants(job, applications_for(job, ids))
+        # Keep the order the employer picked them in
+        position = {application_id: i for i, application_id in enumerate(ids)}
+        rows.sort(key=lambda row: position[row['application_id']])
+        return Response({'requirements': requirement_summary(requirements), 'candidates': rows})
@@ -0,0 +1,261 @@
+"""
+In-process database connection pool, shared by all of a process's threads, for the pooled
+backends (config.db.postgresql); saturation is reported through monitoring.metrics.
+"""
+import os
+import threading
+import time
+from collections import deque
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import OperationalError
+from django.db.backends.base.base import NO_DB_ALIAS
+
+from monitoring import metrics
+
+DEFAULTS = {
+    'min_size': 0,
+    'max_size': 10,
+    'timeout': 5.0,
+    'max_lifetime': 3600.0,
+    'max_idle': 600.0,
+    'check_idle': 5.0,
+}
+
+_lock = threading.Lock()
+_pools = {}  # (alias, pid, connection parameters) -> ConnectionPool
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+class ConnectionPool:
+    def __init__(self, alias, min_size, max_size, timeout, max_lifetime, max_idle, check_idle):
+        self.alias = alias
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self.check_idle = check_idle
+        self.opened = 0
+        self.closed = False
+        self._condition = threading.Condition()
+        self._idle = deque()  # (connection, returned at); the right end was used last
+        self._created = {}  # connection -> created at, for every open connection
+        self._connecting = 0  # slots taken by connections being opened
+        self._waiting = 0
+        metrics.DB_POOL_MAX_CONNECTIONS.set(max_size, alias=alias)
+
+    @property
+    def size(self):
+        return len(self._created) + self._connecting
+
+    @property
+    def in_use(self):
+        return self.size - len(self._idle)
+
+    def getconn(self, connect, check):
+        """
+        A connection from the pool, or a new one from `connect()` if there's
+        room. `check(connection)` tells whether a long idle one still works.
+        """
+        started = time.monotonic()
+        deadline = started + self.timeout
+        while True:
+            connection, idle_for = self._take(deadline)
+            if connection is None:
+                try:
+                    connection = connect()
+                except Exception:
+                    with self._condition:
+                        self._connecting -= 1
+                        self._condition.notify()
+                    raise
+                with self._condition:
+                    self._connecting -= 1
+                    self._created[connection] = time.monotonic()
+                    self.opened += 1
+                metrics.DB_POOL_CONNECTIONS_OPENED.inc(alias=self.alias)
+            elif idle_for > self.check_idle and not check(connection):
+                self.discard(connection)
+                continue
+            metrics.DB_POOL_WAIT.observe(time.monotonic() - started, alias=self.alias)
+            self._report()
+            return connection
+
+    def _take(self, deadline):
+        """(idle connection, seconds idle), or (None, 0) with a slot reserved for a new one."""
+        with self._condition:
+            while True:
+                self._retire_idle()
+                if self._idle:
+                    # Most recently used first: it's the likeliest to be warm and alive
+                    connection, returned_at = self._idle.pop()
+                    return connection, time.monotonic() - returned_at
+                if self.size < self.max_size:
+                    # Reserved under the lock, connected outside it
+                    self._connecting += 1
+                    return None, 0
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    metrics.DB_POOL_TIMEOUTS.inc(alias=self.alias)
+                    raise PoolTimeout(
+                        f'No connection to database {self.alias!r} became free within {self.timeout}s '
+                        f'({self.max_size} in use)'
+                    )
+                self._waiting += 1
+                metrics.DB_POOL_WAITING.set(self._waiting, alias=self.alias)
+                try:
+                    self._condition.wait(remaining)
+                finally:
+                    self._waiting -= 1
+                    metrics.DB_POOL_WAITING.set(self._waiting, alias=self.alias)
+
+    def putconn(self, connection):
+        """Give back a connection that's idle (not in a transaction) and usable."""
+        with self._condition:
+            created_at = self._created.get(connection)
+            if not self.closed and created_at is not None and time.monotonic() - created_at < self.max_lifetime:
+                self._idle.append((connection, time.monotonic()))
+                self._condition.notify()
+                connection = None
+        if connection is not None:
+            self.discard(connection)
+        else:
+            self._report()
+
+    def discard(self, connection):
+        """Close a connection instead of returning it, freeing its slot."""
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self._condition:
+            self._created.pop(connection, None)
+            self._condition.notify()
+        self._report()
+
+    def _retire_idle(self):
+        # Oldest returns are at the left; called with the lock held
+        now = time.monotonic()
+        while self._idle and self.size > self.min_size and now - self._idle[0][1] > self.max_idle:
+            connection, _ = self._idle.popleft()
+            self._created.pop(connection, None)
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def _report(self):
+        with self._condition:
+            in_use, idle = self.in_use, len(self._idle)
+        metrics.DB_POOL_CONNECTIONS.set(in_use, alias=self.alias, state='in_use')
+        metrics.DB_POOL_CONNECTIONS.set(idle, alias=self.alias, state='idle')
+
+    def close(self):
+        """Close the idle connections; ones in use are closed when they are given back."""
+        with self._condition:
+            self.closed = True
+            idle, self._idle = self._idle, deque()
+            for connection, _ in idle:
+                self._created.pop(connection, None)
+        for connection, _ in idle:
+            try:
+                connection.close()
+            except Exception:
+                pass
+        self._report()
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    Makes a Django database backend check connections out of the pool and
+    return them on close(). The backend supplies check_connection(), and
+    reset_connection(), which reports whether a returned connection can be
+    reused. Pool options are read from OPTIONS['pool'].
+    """
+    _pool = None  # the pool the open connection came from
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.settings_dict['CONN_MAX_AGE']:
+            raise ImproperlyConfigured(
+                f'Database {self.alias!r} is pooled, so CONN_MAX_AGE must be 0: Django closing the connection '
+                'at the end of a request is what returns it to the pool'
+            )
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pool', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        connect = super().get_new_connection
+        # Test database creation and deletion run on short-lived connections that mustn't linger
+        if self.alias == NO_DB_ALIAS:
+            self._pool = None
+            return connect(conn_params)
+        self._pool = get_pool(self.alias, self.settings_dict['OPTIONS'].get('pool', {}), conn_params)
+        return self._pool.getconn(lambda: connect(conn_params), self.check_connection)
+
+    def _close(self):
+        if self._pool is None:
+            return super()._close()
+        connection = self.connection
+        # A connection closed inside atomic() stays attached to this wrapper until the rollback
+        if self.in_atomic_block or not self.reset_connection(connection):
+            self._pool.discard(connection)
+        else:
+            self._pool.putconn(connection)
+
+    def close_pool(self):
+        """Close every pool in this process connected to this database, under any alias (test mirrors too)."""
+        params = self.get_connection_params()
+        self.close()
+        close_pools(params)
+
+
+def _params_key(params):
+    # The plain values say which server and database, and as whom; objects such as psycopg's
+    # adapter context don't, and have no stable equality
+    return tuple(sorted(
+        (name, value) for name, value in params.items() if isinstance(value, (str, int, float, bool, type(None)))
+    ))
+
+
+def get_pool(alias, options, params):
+    """
+    The current process's pool for database `alias` connecting with
+    `params`; `options` override DEFAULTS.
+    """
+    # Keyed by process as well: connections inherited over a fork must not be shared
+    key = (alias, os.getpid(), _params_key(params))
+    pool = _pools.get(key)
+    if pool is None:
+        with _lock:
+            pool = _pools.get(key)
+            if pool is None:
+                unknown = set(options) - set(DEFAULTS)
+                if unknown:
+                    raise ImproperlyConfigured(f'Unknown pool options for database {alias!r}: {", ".join(sorted(unknown))}')
+                # The alias's settings changed (the test runner switching databases, say): drop the old pool
+                for stale in [other for other in _pools if other[:2] == key[:2]]:
+                    _pools.pop(stale).close()
+                pool = _pools[key] = ConnectionPool(alias, **{**DEFAULTS, **options})
+    return pool
+
+
+def close_pools(params):
+    """Close this process's pools that connect with `params`, whatever their alias."""
+    pid, params_key = os.getpid(), _params_key(params)
+    with _lock:
+        pools = [_pools.pop(key) for key in list(_pools) if key[1:] == (pid, params_key)]
+    for pool in pools:
+        pool.close()
+
+
+def all_pools():
+    pid = os.getpid()
+    return [pool for (_, owner, _), pool in _pools.items() if owner == pid]
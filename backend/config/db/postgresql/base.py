@@ -0,0 +1,43 @@
+"""PostgreSQL with pooled connections (config.db.pool), enabled by DB_POOL; options go in OPTIONS['pool']."""
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from ..pool import PooledDatabaseWrapperMixin
+from .creation import DatabaseCreation
+
+# libpq's PQTRANS_IDLE and PQTRANS_UNKNOWN, as reported by psycopg2 and psycopg alike
+TRANSACTION_IDLE = 0
+TRANSACTION_UNKNOWN = 4
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        # Set by the parent only when it opens a connection, not for one reused from the pool
+        self.isolation_level = IsolationLevel(
+            self.settings_dict['OPTIONS'].get('isolation_level', IsolationLevel.READ_COMMITTED)
+        )
+        return connection
+
+    def check_connection(self, connection):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            return self.reset_connection(connection)
+        except self.Database.Error:
+            return False
+
+    def reset_connection(self, connection):
+        if connection.closed:
+            return False
+        status = connection.info.transaction_status
+        if status == TRANSACTION_UNKNOWN:
+            return False
+        if status != TRANSACTION_IDLE:
+            try:
+                connection.rollback()
+            except self.Database.Error:
+                return False
+        return True
@@ -0,0 +1,13 @@
+from django.db.backends.postgresql import creation
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # DROP DATABASE fails while pooled connections to it are open
+        self.connection.close_pool()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+    def _clone_test_db(self, suffix, verbosity, keepdb=False):
+        # The test database is the clones' template, which mustn't have any sessions either
+        self.connection.close_pool()
+        super()._clone_test_db(suffix, verbosity, keepdb)
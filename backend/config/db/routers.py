@@ -0,0 +1,151 @@
+"""
+Read replicas: views with `read_from_replicas = True` read from one replica per request, unless
+the request or, for READ_YOUR_WRITES_SECONDS, the same user has written.
+"""
+import logging
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from monitoring import metrics
+
+logger = logging.getLogger(__name__)
+
+_UNSET = object()
+_state = ContextVar('db_routing', default=None)
+_down = {}  # replica alias -> monotonic time it may be tried again
+
+
+def pin_key(user_id):
+    return f'db:primary:{user_id}'
+
+
+def token_user_id(request):
+    """The user id in the request's access token, verified by signature alone (no query)."""
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+    try:
+        return authentication.get_validated_token(raw_token).get(api_settings.USER_ID_CLAIM)
+    except InvalidToken:
+        return None
+
+
+def choose_replica():
+    """A reachable replica picked by weight, or None when there is none."""
+    now = time.monotonic()
+    candidates = {
+        alias: weight for alias, weight in settings.DATABASE_REPLICA_WEIGHTS.items()
+        if weight > 0 and _down.get(alias, 0) <= now
+    }
+    while candidates:
+        alias = random.choices(list(candidates), weights=list(candidates.values()))[0]
+        connection = connections[alias]
+        try:
+            # The health check Django would run on the request's first query anyway
+            connection.close_if_health_check_failed()
+            connection.ensure_connection()
+            return alias
+        except DatabaseError:
+            _down[alias] = now + settings.REPLICA_RETRY_SECONDS
+            metrics.DB_REPLICA_FAILOVERS.inc(alias=alias)
+            logger.warning('Replica %s is unreachable; skipping it for %ss', alias, settings.REPLICA_RETRY_SECONDS)
+            del candidates[alias]
+    return None
+
+
+class RoutingState:
+    """What the router knows about the current request."""
+
+    def __init__(self, request):
+        self.request = request
+        self.replica_reads = False
+        self.wrote = False
+        self._replica = _UNSET
+        self._user_id = _UNSET
+
+    @property
+    def user_id(self):
+        if self._user_id is _UNSET:
+            self._user_id = token_user_id(self.request)
+        return self._user_id
+
+    def replica(self):
+        if self._replica is _UNSET:
+            pinned = self.user_id is not None and cache.get(pin_key(self.user_id)) is not None
+            self._replica = None if pinned else choose_replica()
+        return self._replica
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.replica_reads or state.wrote:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return state.replica()
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the primary's data, so objects read from any of them may be related
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICA_WEIGHTS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema by replication
+        return False if db in settings.DATABASE_REPLICA_WEIGHTS else None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Tracks the request for ReplicaRouter: whether its view reads from
+    replicas, whether it wrote, and who made it. It pins a user who wrote to
+    the primary for READ_YOUR_WRITES_SECONDS. Not loaded without replicas.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICA_WEIGHTS:
+            raise MiddlewareNotUsed
+        # The read-your-writes pin must be seen by whichever process serves the user's next request
+        if isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache)):
+            raise ImproperlyConfigured(
+                'Read replicas need a cache shared between processes (CACHE_BACKEND), such as Redis or '
+                'Memcached: with a per-process cache a user who wrote may read stale data from a replica'
+            )
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RoutingState(request)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        if state.wrote and state.user_id is not None:
+            cache.set(pin_key(state.user_id), True, settings.READ_YOUR_WRITES_SECONDS)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = _state.get()
+        if state is not None and getattr(getattr(view_func, 'view_class', None), 'read_from_replicas', False):
+            state.replica_reads = True
@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
 from datetime import timedelta
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -35,11 +35,15 @@ LOCAL_APPS = [
     'users',
     'jobs',
     'applications',
+    'monitoring',
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    # Outermost, so the queries of every other middleware are counted too
+    'monitoring.middleware.SQLInstrumentationMiddleware',
+    'monitoring.middleware.MetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -48,6 +52,10 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Sends the reads of views marked read_from_replicas to replicas, when there are any
+    'config.db.routers.ReplicaRoutingMiddleware',
+    # Innermost, so profiled stacks start at the view
+    'monitoring.middleware.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -71,14 +79,27 @@ TEMPLATES = [
 WSGI_APPLICATION = 'config.wsgi.application'
 
 # Database
+# Pool connections in each process (config.db.pool) instead of keeping one per thread; use it under ASGI
+# or threaded workers, where per-thread persistent connections pile up
+DB_POOL = config('DB_POOL', default=False, cast=bool)
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'config.db.postgresql' if DB_POOL else 'django.db.backends.postgresql',
         'NAME': config('DB_NAME', default='blue_collar_jobs'),
         'USER': config('DB_USER', default='postgres'),
         'PASSWORD': config('DB_PASSWORD', default='password'),
         'HOST': config('DB_HOST', default='localhost'),
         'PORT': config('DB_PORT', default='5432'),
+        # Seconds a thread keeps its connection between requests; pooled connections are returned after each one
+        'CONN_MAX_AGE': 0 if DB_POOL else config('DB_CONN_MAX_AGE', default=60, cast=int),
+        # Run a cheap query before reusing a persistent connection, instead of failing the request on a dead one
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'pool': {
+                'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+                'timeout': config('DB_POOL_TIMEOUT', default=5.0, cast=float),
+            },
+        } if DB_POOL else {},
     }
 }
 
@@ -91,6 +112,32 @@ if DEBUG:
         }
     }
 
+# Read replicas as "host[:port][=weight],...", e.g. "replica-a=3,replica-b:5433=1"; read-only views
+# (config.db.routers) read from them, picked by weight
+DATABASE_REPLICA_WEIGHTS = {}
+# Seconds to wait for a replica to accept a connection before failing over to another one
+REPLICA_CONNECT_TIMEOUT = config('REPLICA_CONNECT_TIMEOUT', default=2, cast=int)
+for index, replica in enumerate(config('DB_REPLICAS', default='', cast=Csv())):
+    address, _, weight = replica.partition('=')
+    host, _, port = address.partition(':')
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': port or DATABASES['default'].get('PORT', ''),
+        'OPTIONS': {
+            **DATABASES['default'].get('OPTIONS', {}),
+            # A libpq option; SQLite in development has no connection step to time out
+            **({'connect_timeout': REPLICA_CONNECT_TIMEOUT} if 'postgresql' in DATABASES['default']['ENGINE'] else {}),
+        },
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICA_WEIGHTS[f'replica_{index}'] = float(weight or 1)
+DATABASE_ROUTERS = ['config.db.routers.ReplicaRouter']
+# Seconds a user who wrote keeps reading from the primary, to cover replication lag
+READ_YOUR_WRITES_SECONDS = config('READ_YOUR_WRITES_SECONDS', default=10, cast=int)
+# Seconds an unreachable replica is left out before it is tried again
+REPLICA_RETRY_SECONDS = config('REPLICA_RETRY_SECONDS', default=30, cast=int)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -139,6 +186,32 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 20,
 }
 
+# Cache (per-process by default; point it at a shared cache such as Redis in production)
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='bluehired'),
+    }
+}
+
+# Job listing total counts are cached per filter set instead of running COUNT(*) on every page
+JOB_COUNT_CACHE_TIMEOUT = config('JOB_COUNT_CACHE_TIMEOUT', default=60, cast=int)
+JOB_FACET_CACHE_TIMEOUT = config('JOB_FACET_CACHE_TIMEOUT', default=60, cast=int)
+# Rendered job/company/category payloads; keys carry a version, so this only bounds memory
+JOB_FRAGMENT_CACHE_TIMEOUT = config('JOB_FRAGMENT_CACHE_TIMEOUT', default=86400, cast=int)
+# Job detail views are spooled to local files and loaded by `manage.py flush_job_views`
+JOB_VIEW_SPOOL_DIR = config('JOB_VIEW_SPOOL_DIR', default=str(BASE_DIR / 'spool' / 'job_views'))
+JOB_VIEW_SPOOL_ROTATE_SECONDS = config('JOB_VIEW_SPOOL_ROTATE_SECONDS', default=10, cast=int)
+# Raw views older than this are purged by `manage.py rollup_job_views` once rolled up
+JOB_VIEW_RETENTION_DAYS = config('JOB_VIEW_RETENTION_DAYS', default=90, cast=int)
+# How often each process's in-memory recommendation index picks up other processes' job changes
+RECOMMENDATION_SYNC_SECONDS = config('RECOMMENDATION_SYNC_SECONDS', default=30, cast=int)
+# Browser cache lifetime for /categories/ and /skills/, which rarely change
+TAXONOMY_CACHE_MAX_AGE = config('TAXONOMY_CACHE_MAX_AGE', default=86400, cast=int)
+
+# Full-text search backend for jobs (dotted path); empty picks one for the database vendor
+JOB_SEARCH_BACKEND = config('JOB_SEARCH_BACKEND', default='')
+
 # JWT Configuration
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
@@ -183,33 +256,87 @@ FILE_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 5242880  # 5MB
 
 # Email Configuration (for production)
-EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'  # For development
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')  # Console for development
 EMAIL_HOST = config('EMAIL_HOST', default='')
 EMAIL_PORT = config('EMAIL_PORT', default=587, cast=int)
 EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
 EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
+DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='BlueHired <alerts@bluehired.local>')
+
+# Job alert digests, sent by `manage.py send_job_alerts`; job links point at the frontend
+FRONTEND_URL = config('FRONTEND_URL', default='http://localhost:3000')
+# Jobs listed in one digest; the rest are summed up as "and N more"
+JOB_ALERT_DIGEST_MAX_JOBS = config('JOB_ALERT_DIGEST_MAX_JOBS', default=20, cast=int)
+
+# Per-request SQL instrumentation (monitoring.middleware): share of requests recorded
+SQL_INSTRUMENTATION_SAMPLE_RATE = config('SQL_INSTRUMENTATION_SAMPLE_RATE', default=0.05, cast=float)
+# A statement shape run this many times in one request is reported as a likely N+1
+SQL_REPEATED_QUERY_THRESHOLD = config('SQL_REPEATED_QUERY_THRESHOLD', default=5, cast=int)
+# Send the sampled numbers to the browser as a Server-Timing header (it names query fingerprints, so off in production)
+SQL_SERVER_TIMING_HEADER = config('SQL_SERVER_TIMING_HEADER', default=DEBUG, cast=bool)
+
+# Sampling profiler (monitoring.middleware): `X-Profile: <token>` profiles one request; empty disables the header
+PROFILING_TOKEN = config('PROFILING_TOKEN', default='')
+# Share of all requests profiled without the header
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=0.0, cast=float)
+PROFILING_INTERVAL_MS = config('PROFILING_INTERVAL_MS', default=5, cast=float)
+# One collapsed-stack file per profiled request; merge them with `manage.py merge_profiles`
+PROFILING_DIR = config('PROFILING_DIR', default=str(BASE_DIR / 'spool' / 'profiles'))
+PROFILING_MAX_FILES = config('PROFILING_MAX_FILES', default=500, cast=int)
+
+# Metrics (monitoring.metrics): each process adds to its own file here, and exited ones are
+# folded into archive.db; clear the directory on deploy
+METRICS_DIR = config('METRICS_DIR', default=str(BASE_DIR / 'spool' / 'metrics'))
+# Bearer token /metrics/ requires; empty leaves it open with DEBUG and disables it otherwise
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+
+# Logging Configuration (monitoring.logs): records are queued and written as JSON lines by a
+# background thread in each process, so a logging call never waits on file I/O
+LOG_DIR = config('LOG_DIR', default=str(BASE_DIR / 'logs'))
+# A new file every LOG_ROTATE_SECONDS, or sooner once one reaches LOG_MAX_BYTES; the newest LOG_BACKUP_COUNT are kept
+LOG_ROTATE_SECONDS = config('LOG_ROTATE_SECONDS', default=3600, cast=int)
+LOG_MAX_BYTES = config('LOG_MAX_BYTES', default=50 * 1024 * 1024, cast=int)
+LOG_BACKUP_COUNT = config('LOG_BACKUP_COUNT', default=48, cast=int)
+# Records waiting to be written; past this they are dropped and counted (log_records_dropped_total)
+LOG_QUEUE_SIZE = config('LOG_QUEUE_SIZE', default=10000, cast=int)
+# Share of INFO and lower records kept per logger, as "logger=rate,..."; warnings and errors are always kept
+LOG_SAMPLE_RATES = dict(
+    item.split('=', 1) for item in config('LOG_SAMPLE_RATES', default='', cast=Csv())
+)
 
-# Logging Configuration
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
-    'handlers': {
-        'file': {
-            'level': 'INFO',
-            'class': 'logging.FileHandler',
-            'filename': BASE_DIR / 'debug.log',
+    'filters': {
+        'sampling': {
+            '()': 'monitoring.logs.SamplingFilter',
+            'rates': LOG_SAMPLE_RATES,
         },
-        'console': {
+    },
+    'handlers': {
+        'queue': {
             'level': 'INFO',
-            'class': 'logging.StreamHandler',
+            '()': 'monitoring.logs.QueuedHandler',
+            'directory': LOG_DIR,
+            'queue_size': LOG_QUEUE_SIZE,
+            'console': True,
+            'rotate_seconds': LOG_ROTATE_SECONDS,
+            'max_bytes': LOG_MAX_BYTES,
+            'backup_count': LOG_BACKUP_COUNT,
+            'filters': ['sampling'],
         },
     },
     'loggers': {
         'django': {
-            'handlers': ['file', 'console'],
+            'handlers': ['queue'],
             'level': 'INFO',
             'propagate': True,
         },
+        'monitoring': {
+            'handlers': ['queue'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
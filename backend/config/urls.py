@@ -15,8 +15,12 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path
+from django.urls import path, include
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('', include('jobs.urls')),
+    path('', include('users.urls')),
+    path('', include('applications.urls')),
+    path('', include('monitoring.urls')),
 ]
@@ -10,7 +10,13 @@ https://docs.djangoproject.com/en/4.2/howto/deployment/wsgi/
 import os
 
 from django.core.wsgi import get_wsgi_application
+from django.core.signals import request_started
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# Warm the recommendation index in the background, instead of on the first recommendation request
+from jobs.recommendations import warm_index  # noqa: E402
+
+request_started.connect(warm_index)
@@ -0,0 +1,242 @@
+"""
+Micro-benchmarks for the hot query paths (`manage.py benchmark_queries`), timed through the
+test client with an empty cache and rolled back after every run.
+"""
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.backends.utils import CursorWrapper
+from django.db.models import Count, Q
+from django.test import Client, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from applications.models import JobApplication
+from users.models import User
+from .filters import CANONICAL_FILTERS
+from .models import Job, JobCategory
+from .percolator import percolate
+from .tracking import close_spool
+
+# Published jobs matched against the alerts in the alert matching case
+PERCOLATE_BATCH = 200
+
+
+class Rollback(Exception):
+    pass
+
+
+@dataclass
+class QueryStats:
+    queries: int = 0
+    rows: int = 0
+
+
+class CountingCursorWrapper(CursorWrapper):
+    """Counts statements executed and rows fetched through it."""
+
+    def __init__(self, cursor, db, stats):
+        super().__init__(cursor, db)
+        self.stats = stats
+
+    def execute(self, sql, params=None):
+        self.stats.queries += 1
+        return super().execute(sql, params)
+
+    def executemany(self, sql, param_list):
+        self.stats.queries += 1
+        return super().executemany(sql, param_list)
+
+    def fetchone(self):
+        row = self.cursor.fetchone()
+        self.stats.rows += row is not None
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self.cursor.fetchmany(size) if size is not None else self.cursor.fetchmany()
+        self.stats.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self.cursor.fetchall()
+        self.stats.rows += len(rows)
+        return rows
+
+    def __iter__(self):
+        for row in self.cursor:
+            self.stats.rows += 1
+            yield row
+
+
+@dataclass
+class Case:
+    name: str
+    run: object
+    expected_status: int = 200
+
+
+@dataclass
+class Result:
+    name: str
+    times: list = field(default_factory=list)
+    queries: int = 0
+    rows: int = 0
+    status: int = None
+
+    def as_dict(self):
+        return {
+            'median_ms': round(statistics.median(self.times) * 1000, 3),
+            'min_ms': round(min(self.times) * 1000, 3),
+            'queries': self.queries,
+            'rows': self.rows,
+            'status': self.status,
+        }
+
+
+def bearer(user):
+    return {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(user)}'}
+
+
+def listing_params(filters, category_id):
+    params = {}
+    for key, value in filters.items():
+        if value == '{category}':
+            value = category_id
+        params[key] = 'true' if value is True else str(value)
+    return params
+
+
+def pick_fixtures():
+    """The jobs and users the cases run as, chosen from the current data."""
+    active = Job.objects.filter(status='active')
+    job = active.order_by('-views_count', 'pk').first()
+    employer_job = active.order_by('-applications_count', 'pk').select_related('posted_by').first()
+    seeker = User.objects.filter(
+        pk__in=JobApplication.objects.values('applicant').annotate(total=Count('pk'))
+        .order_by('-total', 'applicant').values('applicant')[:1]
+    ).first()
+    if job is None or employer_job is None or seeker is None:
+        raise ValueError('Benchmarks need active jobs with applications; generate data first')
+    open_job = (
+        active.filter(Q(application_deadline__isnull=True) | Q(application_deadline__gt=timezone.now()))
+        .exclude(applications__applicant=seeker).order_by('-created_at', 'pk').first()
+    )
+    return {
+        'job': job,
+        'employer_job': employer_job,
+        'seeker': seeker,
+        'open_job': open_job,
+        'category': str(JobCategory.objects.values_list('pk', flat=True).order_by('name').first()),
+        'search': job.title.split()[-1],
+        'published': list(active.order_by('-published_at', 'pk').values_list('pk', flat=True)[:PERCOLATE_BATCH]),
+    }
+
+
+def build_cases(fixtures):
+    client = Client(HTTP_HOST='localhost')
+    job, employer_job, seeker = fixtures['job'], fixtures['employer_job'], fixtures['seeker']
+
+    def get(path, params=None, user=None):
+        headers = bearer(user) if user else {}
+        return lambda: client.get(path, params or {}, **headers).status_code
+
+    def match_alerts():
+        percolate(fixtures['published'])
+        return 200
+
+    cases = []
+    for filters in CANONICAL_FILTERS:
+        params = listing_params(filters, fixtures['category'])
+        label = ','.join(f'{key}={value}' for key, value in filters.items())
+        cases.append(Case(f'job_list[{label}]', get('/jobs/', params)))
+    cases += [
+        Case('job_list[facets]', get('/jobs/', {'facets': 'true'})),
+        Case('job_list[radius]', get('/jobs/', {'location': job.city, 'radius_km': '25', 'ordering': 'distance'})),
+        Case('job_detail', get(f'/jobs/{job.pk}/')),
+        Case('job_search', get('/jobs/search/', {'search': fixtures['search']})),
+        Case('job_search[collapse]', get('/jobs/search/', {'search': fixtures['search'], 'collapse': 'true'})),
+        Case('my_applications', get('/applications/my/', user=seeker)),
+        Case('employer_applicants', get(f'/jobs/{employer_job.pk}/applicants/', user=employer_job.posted_by)),
+        Case('alert_matching', match_alerts),
+    ]
+    if fixtures['open_job'] is not None:
+        apply_path = f"/jobs/{fixtures['open_job'].pk}/apply/"
+        cases.append(Case(
+            'apply',
+            lambda: client.post(apply_path, {'cover_letter': 'Benchmark application'}, **bearer(seeker)).status_code,
+            expected_status=201,
+        ))
+    return cases
+
+
+def measure(case):
+    """Run `case` once in a rolled back transaction; returns (seconds, status, QueryStats)."""
+    stats = QueryStats()
+    cache.clear()
+    # Also replaces the DEBUG cursor, so query logging doesn't skew the timings
+    connection.make_cursor = connection.make_debug_cursor = (
+        lambda cursor: CountingCursorWrapper(cursor, connection, stats)
+    )
+    try:
+        with transaction.atomic():
+            started = time.perf_counter()
+            status = case.run()
+            elapsed = time.perf_counter() - started
+            raise Rollback
+    except Rollback:
+        pass
+    finally:
+        del connection.make_cursor, connection.make_debug_cursor
+    return elapsed, status, stats
+
+
+@contextmanager
+def scratch_view_spool():
+    """
+    Spool job views to a temporary directory: the spool is written outside
+    the rolled back transaction, and flush_job_views would count its views.
+    """
+    with tempfile.TemporaryDirectory() as directory, override_settings(JOB_VIEW_SPOOL_DIR=directory):
+        close_spool()
+        try:
+            yield
+        finally:
+            close_spool()
+
+
+def run_cases(cases, repeat=5, warmup=1):
+    """Yield (case, Result) with the median of `repeat` timed runs after `warmup` untimed ones."""
+    with scratch_view_spool():
+        for case in cases:
+            result = Result(case.name)
+            for i in range(warmup + repeat):
+                elapsed, result.status, stats = measure(case)
+                if i >= warmup:
+                    result.times.append(elapsed)
+            result.queries, result.rows = stats.queries, stats.rows
+            yield case, result
+
+
+def compare(results, baseline, threshold):
+    """
+    Regressions of `results` against a baseline's cases, as messages. Wall
+    time and rows fetched regress past `threshold` (0.25 = 25% more); query
+    counts are deterministic, so any increase counts.
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if current['median_ms'] > previous['median_ms'] * (1 + threshold):
+            regressions.append(f"{name}: {previous['median_ms']} ms -> {current['median_ms']} ms")
+        if current['queries'] > previous['queries']:
+            regressions.append(f"{name}: {previous['queries']} -> {current['queries']} queries")
+        if current['rows'] > previous['rows'] * (1 + threshold):
+            regressions.append(f"{name}: {previous['rows']} -> {current['rows']} rows fetched")
+    return regressions
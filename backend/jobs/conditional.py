@@ -0,0 +1,48 @@
+"""Conditional GET: validators from cheap queries, checked before anything is serialized."""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def collection_state(queryset, field='updated_at'):
+    """(row count, latest `field`) for a queryset in one aggregate query."""
+    state = queryset.order_by().aggregate(count=Count('pk'), latest=Max(field))
+    return state['count'], state['latest']
+
+
+def make_etag(*parts):
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return quote_etag(digest)
+
+
+def not_modified(request, etag, last_modified=None):
+    """The 304 response for a conditional request that matches, otherwise None."""
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+
+def set_validators(response, etag, last_modified=None, **cache_control):
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    if cache_control:
+        patch_cache_control(response, **cache_control)
+    return response
+
+
+class ConditionalListMixin:
+    """
+    List views whose ETag is the aggregate state of the queryset, so a 304
+    costs one COUNT/MAX query and no serialization.
+    """
+    cache_control = {}
+
+    def list(self, request, *args, **kwargs):
+        count, latest = collection_state(self.get_queryset())
+        etag = make_etag(request.get_full_path(), count, latest)
+        response = not_modified(request, etag, latest)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        return set_validators(response, etag, latest, **self.cache_control)
@@ -0,0 +1,139 @@
+"""
+Job alert digests: due alerts are claimed in batches, per user id shard, and their pending
+matches sent over one email connection per batch.
+"""
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.db.models import Q
+from django.template.loader import get_template
+from django.utils import timezone
+
+from monitoring import metrics
+from .models import JobAlert, JobAlertMatch, JobListing
+
+FREQUENCY_INTERVALS = {
+    'immediate': timedelta(0),
+    'daily': timedelta(days=1),
+    'weekly': timedelta(days=7),
+}
+
+# A digest sent at 08:00:05 yesterday is due again at a run starting 08:00 today
+DUE_SLACK = timedelta(hours=1)
+
+UUID_SPACE = 2 ** 128
+
+
+def shard_bounds(shard, shards):
+    """[lower, upper) user id range of one shard; upper is None for the last one."""
+    if not 0 <= shard < shards:
+        raise ValueError(f'shard must be in [0, {shards})')
+    lower = uuid.UUID(int=UUID_SPACE * shard // shards)
+    upper = uuid.UUID(int=UUID_SPACE * (shard + 1) // shards) if shard + 1 < shards else None
+    return lower, upper
+
+
+def due_alerts(frequency, now, shard=0, shards=1):
+    alerts = JobAlert.objects.filter(is_active=True, frequency=frequency)
+    interval = FREQUENCY_INTERVALS[frequency]
+    if interval:
+        alerts = alerts.filter(Q(last_sent__isnull=True) | Q(last_sent__lt=now - interval + DUE_SLACK))
+    else:
+        # Immediate alerts are due whenever they have pending matches, so start from those
+        pending = JobAlertMatch.objects.filter(delivered_at__isnull=True).values('alert_id')
+        alerts = alerts.filter(pk__in=pending)
+    if shards > 1:
+        lower, upper = shard_bounds(shard, shards)
+        alerts = alerts.filter(user_id__gte=lower)
+        if upper is not None:
+            alerts = alerts.filter(user_id__lt=upper)
+    return alerts
+
+
+def pending_matches(alert_ids):
+    """({alert_id: [job_id, ...] newest first}, [match pk, ...]) in one query."""
+    job_ids = {alert_id: [] for alert_id in alert_ids}
+    match_ids = []
+    matches = (
+        JobAlertMatch.objects.filter(alert_id__in=alert_ids, delivered_at__isnull=True)
+        .order_by('-created_at')
+        .values_list('pk', 'alert_id', 'job_id')
+    )
+    for match_id, alert_id, job_id in matches:
+        match_ids.append(match_id)
+        job_ids[alert_id].append(job_id)
+    return job_ids, match_ids
+
+
+def job_entries(job_ids):
+    """{job_id: rendered digest entry} for the listed jobs; rendered once per batch."""
+    template = get_template('jobs/email/alert_digest_job.txt')
+    listings = JobListing.objects.filter(pk__in=job_ids).values(
+        'id', 'title', 'company_name', 'location', 'is_remote', 'salary_min', 'salary_max', 'salary_type',
+    )
+    return {
+        listing['id']: template.render({'job': listing, 'url': f"{settings.FRONTEND_URL}/jobs/{listing['id']}"})
+        for listing in listings
+    }
+
+
+def render_digest(template, alert, entries):
+    shown = entries[:settings.JOB_ALERT_DIGEST_MAX_JOBS]
+    subject = f'{len(entries)} new job{"s" if len(entries) != 1 else ""} for "{alert.title}"'
+    body = template.render({
+        'alert': alert,
+        'user': alert.user,
+        'entries': shown,
+        'more': len(entries) - len(shown),
+        'alerts_url': f'{settings.FRONTEND_URL}/dashboard',
+    })
+    return EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [alert.user.email])
+
+
+def send_batch(frequency, now, shard, shards, batch_size, template, mail_connection):
+    """Claim, send and mark one batch of due alerts; returns (alerts, emails)."""
+    alerts = due_alerts(frequency, now, shard, shards).select_related('user')
+    if connection.features.has_select_for_update_skip_locked:
+        # Overlapping workers skip each other's claimed alerts instead of sending them twice
+        alerts = alerts.select_for_update(skip_locked=True, of=('self',))
+    with transaction.atomic():
+        alerts = list(alerts[:batch_size])
+        if not alerts:
+            return 0, 0
+        job_ids, match_ids = pending_matches([alert.pk for alert in alerts])
+        entries = job_entries({job_id for ids in job_ids.values() for job_id in ids})
+
+        messages = []
+        for alert in alerts:
+            alert_entries = [entries[job_id] for job_id in job_ids[alert.pk] if job_id in entries]
+            if alert_entries and alert.user.is_active and alert.user.email:
+                messages.append(render_digest(template, alert, alert_entries))
+        sent = mail_connection.send_messages(messages) if messages else 0
+        if sent:
+            metrics.ALERT_EMAILS_SENT.inc(sent, frequency=frequency)
+
+        # Every alert in the batch gets the same timestamp, so one UPDATE does
+        JobAlert.objects.filter(pk__in=[alert.pk for alert in alerts]).update(last_sent=now)
+        JobAlertMatch.objects.filter(pk__in=match_ids).update(delivered_at=now)
+    return len(alerts), sent or 0
+
+
+def send_due_alerts(frequency, shard=0, shards=1, batch_size=500):
+    """Send every due digest of `frequency` in this shard; returns (alerts, emails)."""
+    if frequency not in FREQUENCY_INTERVALS:
+        raise ValueError(frequency)
+    now = timezone.now()
+    template = get_template('jobs/email/alert_digest.txt')
+    alert_total = email_total = 0
+    mail_connection = get_connection()
+    while True:
+        # One connection per batch, opened once and reused for all of its messages
+        with mail_connection:
+            alerts, emails = send_batch(frequency, now, shard, shards, batch_size, template, mail_connection)
+        alert_total += alerts
+        email_total += emails
+        if alerts < batch_size:
+            return alert_total, email_total
@@ -0,0 +1,208 @@
+"""
+Near-duplicate job postings, found through shared LSH buckets. Job.duplicate_cluster holds
+the id of the cluster's earliest posting.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from django.db import connection, connections, transaction
+
+from . import minhash
+from .models import Job, JobSignature, JobSignatureBucket
+
+DUPLICATE_SIMILARITY = 0.8
+
+# Cap on postings compared when a job is saved, in case boilerplate fills a bucket
+MAX_CANDIDATES = 1000
+
+
+def job_text(title, description, requirements):
+    return '\n'.join(part for part in (title, description, requirements) if part)
+
+
+@transaction.atomic
+def store_signatures(signatures, replace=True):
+    """
+    Store {job_id: signature bytes or None} with their buckets, replacing
+    existing ones unless `replace` is False (the table was just cleared).
+    """
+    if replace:
+        job_ids = list(signatures)
+        JobSignatureBucket.objects.filter(signature_id__in=job_ids).delete()
+        JobSignature.objects.filter(pk__in=job_ids).delete()
+    stored = {job_id: data for job_id, data in signatures.items() if data is not None}
+    if not stored:
+        return
+    JobSignature.objects.bulk_create([
+        JobSignature(job_id=job_id, signature=data) for job_id, data in stored.items()
+    ])
+    buckets = minhash.band_buckets(np.vstack([minhash.from_bytes(data) for data in stored.values()]))
+    # One bucket row per band and job, written with executemany rather than as model objects
+    signature_field = JobSignatureBucket._meta.get_field('signature')
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO {JobSignatureBucket._meta.db_table} (signature_id, bucket) VALUES (%s, %s)',
+            [
+                (job_id, bucket)
+                for job_id, row in zip(
+                    (signature_field.get_db_prep_save(job_id, connection) for job_id in stored), buckets.tolist(),
+                )
+                for bucket in row
+            ],
+        )
+
+
+def find_duplicates(job_id, signature):
+    """[(job_id, similarity), ...] of other postings at DUPLICATE_SIMILARITY or above, closest first."""
+    buckets = [int(bucket) for bucket in minhash.band_buckets(signature)]
+    candidates = (
+        JobSignatureBucket.objects.filter(bucket__in=buckets)
+        .exclude(signature_id=job_id)
+        .values('signature_id')
+        .distinct()[:MAX_CANDIDATES]
+    )
+    rows = list(JobSignature.objects.filter(pk__in=candidates).values_list('job_id', 'signature'))
+    if not rows:
+        return []
+    similarities = minhash.similarity(signature, [minhash.from_bytes(data) for _, data in rows])
+    matches = [
+        (candidate_id, float(similarity))
+        for (candidate_id, _), similarity in zip(rows, similarities)
+        if similarity >= DUPLICATE_SIMILARITY
+    ]
+    return sorted(matches, key=lambda match: -match[1])
+
+
+def flag_job(job):
+    """Refresh `job`'s signature and file it under the cluster of its closest duplicate."""
+    signature = minhash.signature(job_text(job.title, job.description, job.requirements))
+    store_signatures({job.pk: None if signature is None else minhash.to_bytes(signature)})
+    matches = find_duplicates(job.pk, signature) if signature is not None else []
+
+    if matches:
+        closest_id = matches[0][0]
+        closest_cluster = Job.objects.filter(pk=closest_id).values_list('duplicate_cluster', flat=True).first()
+        if closest_cluster is None:
+            Job.objects.filter(pk=closest_id).update(duplicate_cluster=closest_id)
+        cluster = closest_cluster or closest_id
+    elif job.duplicate_cluster == job.pk:
+        # Still the head of the postings that duplicate it
+        cluster = job.pk
+    else:
+        cluster = None
+
+    if cluster != job.duplicate_cluster:
+        Job.objects.filter(pk=job.pk).update(duplicate_cluster=cluster)
+        job.duplicate_cluster = cluster
+    return matches
+
+
+def bounded_map(pool, fn, chunks, window):
+    """pool.map that keeps at most `window` chunks in flight, so the corpus isn't read up front."""
+    pending = deque()
+    for chunk in chunks:
+        pending.append(pool.submit(fn, chunk))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _corpus_chunks(meta, batch_size):
+    """Yield [(pk, text), ...] in primary key batches, recording (pk, created_at, cluster) in `meta`."""
+    last_pk = None
+    while True:
+        batch_qs = Job.objects.order_by('pk')
+        if last_pk is not None:
+            batch_qs = batch_qs.filter(pk__gt=last_pk)
+        rows = list(batch_qs.values_list(
+            'pk', 'created_at', 'duplicate_cluster', 'title', 'description', 'requirements',
+        )[:batch_size])
+        if not rows:
+            return
+        meta.extend((pk, created_at, cluster) for pk, created_at, cluster, *_ in rows)
+        yield [(pk, job_text(*text)) for pk, _, _, *text in rows]
+        last_pk = rows[-1][0]
+
+
+def cluster_signatures(signatures):
+    """
+    Union-find over an (n, NUM_PERM) signature array; returns each row's root.
+
+    Rows sharing a bucket are found by sorting each band column. Within a run
+    of equal buckets, each row is compared with the run's leaders so far and
+    joins the closest one at DUPLICATE_SIMILARITY or above; otherwise it
+    becomes a leader itself. That keeps large boilerplate runs far from
+    quadratic.
+    """
+    parent = np.arange(len(signatures))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets = minhash.band_buckets(signatures)
+    for band in range(minhash.BANDS):
+        order = np.argsort(buckets[:, band], kind='stable')
+        column = buckets[order, band]
+        starts = np.flatnonzero(np.r_[True, column[1:] != column[:-1]])
+        ends = np.r_[starts[1:], len(column)]
+        for start, end in zip(starts[ends - starts > 1], ends[ends - starts > 1]):
+            leaders = [order[start]]
+            for row in order[start + 1:end]:
+                similarities = minhash.similarity(signatures[row], signatures[leaders])
+                best = int(similarities.argmax())
+                if similarities[best] >= DUPLICATE_SIMILARITY:
+                    a, b = find(row), find(leaders[best])
+                    if a != b:
+                        parent[a] = b
+                else:
+                    leaders.append(row)
+    return np.array([find(i) for i in range(len(signatures))], dtype=np.intp)
+
+
+def rebuild_clusters(workers=None, batch_size=1000):
+    """
+    Recompute every signature in a process pool and regroup the corpus.
+    Returns (jobs signed, duplicate clusters, jobs whose cluster changed).
+    """
+    workers = workers or os.cpu_count() or 1
+    meta = []
+    job_ids = []
+    signatures = []
+    # Every signature is rewritten, so clear them in one go rather than row by row
+    JobSignatureBucket.objects.all().delete()
+    JobSignature.objects.all().delete()
+    # The signature workers fork from this process and must not inherit its open connection
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunks = _corpus_chunks(meta, batch_size)
+        for results in bounded_map(pool, minhash.signatures_for_rows, chunks, 2 * workers):
+            store_signatures(dict(results), replace=False)
+            for job_id, data in results:
+                if data is not None:
+                    job_ids.append(job_id)
+                    signatures.append(minhash.from_bytes(data))
+
+    clusters = {}
+    if signatures:
+        roots = cluster_signatures(np.vstack(signatures))
+        created = {pk: created_at for pk, created_at, _ in meta}
+        members = {}
+        for job_id, root in zip(job_ids, roots):
+            members.setdefault(root, []).append(job_id)
+        for group in members.values():
+            if len(group) > 1:
+                head = min(group, key=lambda pk: (created[pk], pk))
+                clusters.update((pk, head) for pk in group)
+
+    changed = [
+        Job(pk=pk, duplicate_cluster=clusters.get(pk))
+        for pk, _, current in meta if clusters.get(pk) != current
+    ]
+    Job.objects.bulk_update(changed, ['duplicate_cluster'], batch_size=1000)
+    return len(job_ids), len(set(clusters.values())), len(changed)
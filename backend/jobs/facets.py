@@ -0,0 +1,104 @@
+"""Sidebar facet counts from one grouped query; each facet ignores its own filter."""
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import BooleanField, Count, ExpressionWrapper, Q
+
+from .filters import apply_job_filters, job_filters_key
+from .models import Job, JobCategory
+
+FACETS = ('category', 'job_type', 'experience_level', 'is_remote', 'state')
+
+# The filter each facet is driven by
+FACET_FILTERS = {
+    'category': 'category',
+    'job_type': 'job_type',
+    'experience_level': 'experience_level',
+    'is_remote': 'is_remote',
+    'state': 'location',
+}
+
+
+def get_job_facets(queryset, filters):
+    """Facet counts for `filters`, cached by the normalized filter key."""
+    filters = {k: v for k, v in filters.items() if k != 'ordering'}
+    cache_key = f'jobs:facets:{job_filters_key(filters)}'
+    facets = cache.get(cache_key)
+    if facets is None:
+        facets = compute_job_facets(queryset, filters)
+        cache.set(cache_key, facets, getattr(settings, 'JOB_FACET_CACHE_TIMEOUT', 60))
+    return facets
+
+
+def compute_job_facets(queryset, filters):
+    base_filters = {k: v for k, v in filters.items() if k not in FACET_FILTERS.values()}
+    queryset = apply_job_filters(queryset, base_filters).order_by()
+
+    group_by = ['category_id', 'job_type', 'experience_level', 'is_remote', 'state']
+    location = filters.get('location')
+    if location:
+        # Whether a row satisfies the location filter becomes one more grouping column
+        queryset = queryset.annotate(location_match=ExpressionWrapper(
+            Q(city__iexact=location) | Q(state__iexact=location) | Q(pincode=location),
+            output_field=BooleanField(),
+        ))
+        group_by.append('location_match')
+    rows = queryset.values(*group_by).annotate(total=Count('pk'))
+
+    category_id = _resolve_category(filters.get('category'))
+    checks = {
+        'category': lambda row: row['category_id'] == category_id,
+        'job_type': lambda row: row['job_type'] == filters['job_type'],
+        'experience_level': lambda row: row['experience_level'] == filters['experience_level'],
+        'is_remote': lambda row: row['is_remote'] == filters['is_remote'],
+        'location': lambda row: bool(row['location_match']),
+    }
+    active_checks = {name: check for name, check in checks.items() if name in filters}
+
+    counts = {facet: {} for facet in FACETS}
+    for row in rows:
+        failed = [name for name, check in active_checks.items() if not check(row)]
+        if len(failed) > 1:
+            continue
+        for facet in FACETS:
+            # A row counts toward a facet if it passes every filter except that facet's own
+            if failed and failed[0] != FACET_FILTERS[facet]:
+                continue
+            value = row['category_id'] if facet == 'category' else row[facet]
+            counts[facet][value] = counts[facet].get(value, 0) + row['total']
+
+    return _label_facets(counts)
+
+
+def _resolve_category(category):
+    if not category:
+        return None
+    try:
+        return uuid.UUID(category)
+    except ValueError:
+        return JobCategory.objects.filter(name__iexact=category).values_list('pk', flat=True).first()
+
+
+def _label_facets(counts):
+    category_names = dict(
+        JobCategory.objects.filter(pk__in=list(counts['category'])).values_list('pk', 'name')
+    )
+    labels = {
+        'category': lambda value: category_names.get(value, ''),
+        'job_type': dict(Job.JOB_TYPES).get,
+        'experience_level': dict(Job.EXPERIENCE_LEVELS).get,
+        'is_remote': lambda value: 'Remote' if value else 'On-site',
+        'state': lambda value: value,
+    }
+    facets = {}
+    for facet, values in counts.items():
+        facets[facet] = sorted(
+            (
+                {'value': str(value) if facet == 'category' else value,
+                 'label': labels[facet](value), 'count': total}
+                for value, total in values.items()
+            ),
+            key=lambda item: (-item['count'], str(item['label'])),
+        )
+    return facets
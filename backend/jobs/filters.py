@@ -0,0 +1,200 @@
+import hashlib
+import math
+import uuid
+from decimal import Decimal, InvalidOperation
+from urllib.parse import urlencode
+
+from django.db.models import Q
+
+from .geo import bounding_box, covering_cells, distance_expression
+from .models import JobCategory, PincodeLocation
+from .salary import to_minor_units
+from .search import get_search_backend
+
+# Query parameters understood by the job listing (mirrors JobFilters in the frontend)
+FILTER_FIELDS = (
+    'search', 'category', 'location', 'job_type', 'experience_level',
+    'salary_min', 'salary_max', 'is_remote',
+    'radius_km', 'lat', 'lng', 'ordering',
+)
+
+# `ordering` values; 'distance' only applies to radius searches
+ORDERINGS = ('newest', 'salary', 'distance')
+
+MAX_RADIUS_KM = 500
+
+# Monthly salary filters (rupees) are clamped to this, so their paise fit a bigint
+MAX_SALARY = Decimal(10) ** 10
+
+# The filter combinations the job listing is expected to serve from an index
+# (checked by `manage.py explain_job_filters`, timed by `manage.py benchmark_queries`)
+CANONICAL_FILTERS = [
+    {},
+    {'category': '{category}'},
+    {'location': 'Mumbai'},
+    {'location': 'Maharashtra'},
+    {'job_type': 'part_time'},
+    {'experience_level': 'senior'},
+    {'is_remote': True},
+    {'salary_min': Decimal('40000')},
+    {'category': '{category}', 'location': 'Pune'},
+    {'category': '{category}', 'job_type': 'contract'},
+    {'category': '{category}', 'job_type': 'full_time', 'experience_level': 'mid'},
+    {'location': 'Delhi', 'job_type': 'full_time'},
+    {'location': 'Chennai', 'salary_min': Decimal('25000')},
+    {'ordering': 'salary'},
+    {'job_type': 'full_time', 'salary_max': Decimal('20000')},
+]
+
+
+def _parse_bool(value):
+    value = str(value).strip().lower()
+    if value in ('1', 'true', 'yes'):
+        return True
+    if value in ('0', 'false', 'no'):
+        return False
+    return None
+
+
+def _parse_decimal(value):
+    try:
+        value = Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return None
+    return min(max(value, Decimal(0)), MAX_SALARY) if value.is_finite() else None
+
+
+def _parse_float(value):
+    try:
+        value = float(value)
+    except ValueError:
+        return None
+    return value if math.isfinite(value) else None
+
+
+def clean_job_filters(params):
+    """Pick the known filters out of the query params and normalize their values."""
+    filters = {}
+    for field in FILTER_FIELDS:
+        value = params.get(field)
+        if value is None or str(value).strip() == '':
+            continue
+        value = str(value).strip()
+        if field in ('salary_min', 'salary_max'):
+            value = _parse_decimal(value)
+        elif field == 'is_remote':
+            value = _parse_bool(value)
+        elif field in ('radius_km', 'lat', 'lng'):
+            value = _parse_float(value)
+            if field == 'radius_km' and value is not None:
+                value = min(max(value, 0.1), MAX_RADIUS_KM)
+        elif field == 'search':
+            value = ' '.join(value.split())
+        elif field == 'ordering':
+            value = value if value in ORDERINGS else None
+        if value is not None:
+            filters[field] = value
+    return filters
+
+
+def resolve_origin(filters):
+    """
+    Fill in lat/lng for a radius search from `location` (a pincode or city).
+
+    The radius replaces the exact location match, so `location` is dropped once
+    it has been resolved. Returns False when a radius was asked for but no
+    origin could be found.
+    """
+    if 'radius_km' not in filters:
+        filters.pop('lat', None)
+        filters.pop('lng', None)
+        return True
+    if 'lat' in filters and 'lng' in filters:
+        filters.pop('location', None)
+        return True
+    location = filters.get('location')
+    coordinates = location and PincodeLocation.lookup(pincode=location, city=location)
+    if not coordinates:
+        return False
+    filters['lat'], filters['lng'] = coordinates
+    filters.pop('location', None)
+    return True
+
+
+def is_radius_search(filters):
+    return 'radius_km' in filters and 'lat' in filters and 'lng' in filters
+
+
+def cursor_ordering(filters):
+    """(position field, id) pair the listing is keyset-paginated on."""
+    ordering = filters.get('ordering')
+    if is_radius_search(filters) and ordering in (None, 'distance'):
+        return ('distance_km', 'id')
+    if ordering == 'salary':
+        return ('-salary_max_monthly', '-id')
+    return ('-created_at', '-id')
+
+
+def job_filters_key(filters):
+    """Stable cache key fragment for a cleaned filter dict."""
+    encoded = urlencode(sorted((k, str(v)) for k, v in filters.items()))
+    return hashlib.md5(encoded.encode()).hexdigest()
+
+
+def apply_job_filters(queryset, filters):
+    """Filter a Job or JobListing queryset; both expose the same filter columns."""
+    search = filters.get('search')
+    if search:
+        queryset = get_search_backend().filter(queryset, search)
+
+    category = filters.get('category')
+    if category:
+        try:
+            queryset = queryset.filter(category_id=uuid.UUID(category))
+        except ValueError:
+            queryset = queryset.filter(
+                category_id__in=JobCategory.objects.filter(name__iexact=category).values('pk')
+            )
+
+    location = filters.get('location')
+    if location:
+        queryset = queryset.filter(
+            Q(city__iexact=location) |
+            Q(state__iexact=location) |
+            Q(pincode=location)
+        )
+
+    for field in ('job_type', 'experience_level'):
+        if filters.get(field):
+            queryset = queryset.filter(**{field: filters[field]})
+
+    if 'is_remote' in filters:
+        queryset = queryset.filter(is_remote=filters['is_remote'])
+
+    # Salary filters are monthly amounts; a job matches when its normalized range overlaps
+    if 'salary_min' in filters:
+        queryset = queryset.filter(salary_max_monthly__gte=to_minor_units(filters['salary_min']))
+    if 'salary_max' in filters:
+        queryset = queryset.filter(salary_min_monthly__lte=to_minor_units(filters['salary_max']))
+    if filters.get('ordering') == 'salary':
+        # Only jobs that state a comparable salary can be ranked by it
+        queryset = queryset.filter(salary_max_monthly__isnull=False)
+
+    if is_radius_search(filters):
+        queryset = filter_by_radius(queryset, filters['lat'], filters['lng'], filters['radius_km'])
+
+    return queryset
+
+
+def filter_by_radius(queryset, latitude, longitude, radius_km):
+    """Prune by geohash cells and bounding box, then keep rows within `radius_km`."""
+    cells = Q()
+    for cell in covering_cells(latitude, longitude, radius_km):
+        cells |= Q(geohash__startswith=cell)
+    min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_km)
+    return (
+        queryset.filter(cells)
+        .filter(latitude__range=(min_lat, max_lat), longitude__range=(min_lng, max_lng))
+        .annotate(distance_km=distance_expression(latitude, longitude))
+        .filter(distance_km__lte=radius_km)
+    )
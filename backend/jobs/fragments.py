@@ -0,0 +1,66 @@
+"""Rendered JSON payloads cached by object version (frag:<kind>:<pk>:<version>) and spliced into responses."""
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+
+_renderer = JSONRenderer()
+
+
+def render_json(data):
+    return _renderer.render(data)
+
+
+def timestamp_version(value):
+    """Version for rows versioned by an `updated_at` timestamp."""
+    return int(value.timestamp() * 1_000_000) if value else 0
+
+
+def fragment_key(kind, pk, version):
+    return f'frag:{kind}:{pk}:{version}'
+
+
+def get_fragments(kind, versions, render):
+    """
+    {pk: fragment} for `versions`, an iterable of (pk, version) pairs.
+
+    `render` receives the pks that missed the cache and returns {pk: bytes};
+    pks it leaves out (e.g. deleted meanwhile) are missing from the result.
+    """
+    keys = {pk: fragment_key(kind, pk, version) for pk, version in versions}
+    cached = cache.get_many(list(keys.values()))
+    missing = [pk for pk, key in keys.items() if key not in cached]
+    if missing:
+        rendered = {keys[pk]: fragment for pk, fragment in render(missing).items()}
+        cache.set_many(rendered, getattr(settings, 'JOB_FRAGMENT_CACHE_TIMEOUT', 86400))
+        cached.update(rendered)
+    return {pk: cached[key] for pk, key in keys.items() if key in cached}
+
+
+def splice(fragment, **fields):
+    """Add top-level members to a rendered JSON object without decoding it."""
+    if not fields:
+        return fragment
+    extra = render_json(fields)
+    if fragment == b'{}':
+        return extra
+    return fragment[:-1] + b',' + extra[1:]
+
+
+def splice_raw(fragment, key, raw):
+    """Add a top-level member whose value is already-rendered JSON."""
+    member = render_json(key) + b':' + raw
+    if fragment == b'{}':
+        return b'{' + member + b'}'
+    return fragment[:-1] + b',' + member + b'}'
+
+
+def join_array(fragments):
+    return b'[' + b','.join(fragments) + b']'
+
+
+def fragment_response(fragment, status=200, headers=None):
+    response = HttpResponse(fragment, content_type='application/json', status=status)
+    for name, value in (headers or {}).items():
+        response[name] = value
+    return response
@@ -0,0 +1,101 @@
+"""Geohash and distance helpers for radius search: geohash cells, then bounding box, then exact distance."""
+import math
+
+from django.db.models import ExpressionWrapper, F, FloatField, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+GEOHASH_PRECISION = 9
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        if even:
+            rng, value = lng_range, longitude
+        else:
+            rng, value = lat_range, latitude
+        mid = (rng[0] + rng[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def cell_size_degrees(precision):
+    """(lat, lng) size in degrees of a geohash cell at `precision`."""
+    total_bits = 5 * precision
+    lat_bits = total_bits // 2
+    lng_bits = total_bits - lat_bits
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """(min_lat, max_lat, min_lng, max_lng) enclosing the circle."""
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+    dlng = min(radius_km / (KM_PER_DEGREE_LAT * cos_lat), 180.0)
+    return latitude - dlat, latitude + dlat, longitude - dlng, longitude + dlng
+
+
+def covering_cells(latitude, longitude, radius_km):
+    """
+    Geohash prefixes that together cover the bounding box of the circle.
+
+    Picks the finest precision whose cells are at least as large as the box's
+    half-size, so the box spans at most 3x3 cells and sampling its corners,
+    edge midpoints and center hits every one of them.
+    """
+    min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_km)
+    dlat = max_lat - latitude
+    dlng = max_lng - longitude
+    precision = 1
+    for candidate in range(GEOHASH_PRECISION, 0, -1):
+        cell_lat, cell_lng = cell_size_degrees(candidate)
+        if cell_lat >= dlat and cell_lng >= dlng:
+            precision = candidate
+            break
+
+    cells = set()
+    for lat in (min_lat, latitude, max_lat):
+        lat = max(-90.0, min(90.0, lat))
+        for lng in (min_lng, longitude, max_lng):
+            lng = (lng + 180.0) % 360.0 - 180.0
+            cells.add(encode_geohash(lat, lng, precision))
+    return sorted(cells)
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def distance_expression(latitude, longitude, lat_field='latitude', lng_field='longitude'):
+    """Haversine distance in km from a point to the row's coordinates, as an ORM expression."""
+    phi0 = math.radians(latitude)
+    lambda0 = math.radians(longitude)
+    a = (
+        Power(Sin((Radians(F(lat_field)) - Value(phi0)) / 2), 2) +
+        Value(math.cos(phi0)) * Cos(Radians(F(lat_field))) *
+        Power(Sin((Radians(F(lng_field)) - Value(lambda0)) / 2), 2)
+    )
+    return ExpressionWrapper(2 * EARTH_RADIUS_KM * ASin(Sqrt(a)), output_field=FloatField())
@@ -0,0 +1,148 @@
+"""Keeps the JobListing read model in step with jobs and what they embed."""
+import time
+
+from .models import Job, JobListing, JobSkillRequirement
+
+# Job fields copied verbatim onto the listing row
+COPIED_FIELDS = (
+    'title', 'job_type', 'experience_level', 'location', 'city', 'state', 'pincode',
+    'is_remote', 'latitude', 'longitude', 'geohash',
+    'salary_min', 'salary_max', 'salary_type', 'salary_negotiable',
+    'salary_min_monthly', 'salary_max_monthly',
+    'is_featured', 'application_deadline', 'created_at', 'published_at',
+)
+
+# Saving a job with only these fields leaves its card and detail payload unchanged;
+# counters are read live instead of from cached payloads
+COUNTER_FIELDS = {'views_count', 'applications_count'}
+
+# User fields embedded in job payloads
+POSTER_FIELDS = ('first_name', 'last_name', 'email', 'phone_number', 'role', 'is_verified')
+
+UPDATE_FIELDS = [
+    field.name for field in JobListing._meta.concrete_fields if not field.primary_key
+]
+
+
+def new_version():
+    return time.time_ns() // 1000
+
+
+def listing_queryset():
+    return Job.objects.filter(status='active').select_related('category', 'company', 'posted_by')
+
+
+def skills_for_jobs(job_ids):
+    """{job_id: [skill chip, ...]} for the given jobs, in one query."""
+    skills = {job_id: [] for job_id in job_ids}
+    requirements = (
+        JobSkillRequirement.objects.filter(job_id__in=job_ids)
+        .order_by('skill__name')
+        .values_list('job_id', 'skill_id', 'skill__name', 'requirement_level')
+    )
+    for job_id, skill_id, name, requirement_level in requirements:
+        skills[job_id].append({
+            'id': str(skill_id),
+            'name': name,
+            'requirement_level': requirement_level,
+        })
+    return skills
+
+
+def build_listing(job, skills):
+    listing = JobListing(
+        id=job.pk,
+        category_id=job.category_id,
+        category_name=job.category.name,
+        category_icon=job.category.icon,
+        company_id=job.company_id,
+        company_name=job.company.company_name,
+        company_logo=job.company.company_logo.name or None,
+        is_company_verified=job.company.is_company_verified,
+        posted_by_id=job.posted_by_id,
+        posted_by_name=job.posted_by.get_full_name(),
+        skills=skills,
+        version=new_version(),
+    )
+    for field in COPIED_FIELDS:
+        setattr(listing, field, getattr(job, field))
+    return listing
+
+
+def sync_jobs(job_ids):
+    """Upsert the listing rows of active jobs and drop the rest."""
+    job_ids = list(job_ids)
+    if not job_ids:
+        return
+    jobs = list(listing_queryset().filter(pk__in=job_ids))
+    skills = skills_for_jobs([job.pk for job in jobs])
+    JobListing.objects.bulk_create(
+        [build_listing(job, skills[job.pk]) for job in jobs],
+        update_conflicts=True,
+        unique_fields=['id'],
+        update_fields=UPDATE_FIELDS,
+    )
+    active = {job.pk for job in jobs}
+    stale = [job_id for job_id in job_ids if job_id not in active]
+    if stale:
+        JobListing.objects.filter(pk__in=stale).delete()
+
+
+def sync_job(job):
+    if job.status != 'active':
+        JobListing.objects.filter(pk=job.pk).delete()
+        return
+    sync_jobs([job.pk])
+
+
+def sync_skills(job_id):
+    JobListing.objects.filter(pk=job_id).update(
+        skills=skills_for_jobs([job_id])[job_id], version=new_version(),
+    )
+
+
+def sync_skill(skill):
+    job_ids = JobSkillRequirement.objects.filter(skill=skill).values_list('job_id', flat=True)
+    listing_ids = list(JobListing.objects.filter(pk__in=job_ids).values_list('pk', flat=True))
+    skills = skills_for_jobs(listing_ids)
+    for job_id in listing_ids:
+        JobListing.objects.filter(pk=job_id).update(skills=skills[job_id], version=new_version())
+
+
+def sync_category(category):
+    JobListing.objects.filter(category_id=category.pk).update(
+        category_name=category.name, category_icon=category.icon, version=new_version(),
+    )
+
+
+def sync_company(company):
+    JobListing.objects.filter(company_id=company.pk).update(
+        company_name=company.company_name,
+        company_logo=company.company_logo.name or None,
+        is_company_verified=company.is_company_verified,
+        version=new_version(),
+    )
+
+
+def sync_poster(user):
+    JobListing.objects.filter(posted_by_id=user.pk).update(
+        posted_by_name=user.get_full_name(), version=new_version(),
+    )
+
+
+def rebuild(batch_size=2000):
+    """Regenerate every listing row from the jobs table, in primary key batches."""
+    JobListing.objects.all().delete()
+    total = 0
+    last_pk = None
+    while True:
+        batch_qs = listing_queryset().order_by('pk')
+        if last_pk is not None:
+            batch_qs = batch_qs.filter(pk__gt=last_pk)
+        jobs = list(batch_qs[:batch_size])
+        if not jobs:
+            return total
+        skills = skills_for_jobs([job.pk for job in jobs])
+        JobListing.objects.bulk_create([build_listing(job, skills[job.pk]) for job in jobs])
+        total += len(jobs)
+        last_pk = jobs[-1].pk
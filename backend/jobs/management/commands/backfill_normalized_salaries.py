@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+
+from users.models import JobSeekerProfile
+from jobs import listing
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Backfill the normalized monthly salary columns on jobs and job seeker profiles in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Recompute every row, not only rows whose normalized columns are still empty',
+        )
+
+    def handle(self, *args, **options):
+        jobs = Job.objects.exclude(salary_min__isnull=True, salary_max__isnull=True)
+        profiles = JobSeekerProfile.objects.exclude(
+            expected_salary_min__isnull=True, expected_salary_max__isnull=True,
+        )
+        if not options['all']:
+            jobs = jobs.filter(salary_min_monthly__isnull=True, salary_max_monthly__isnull=True)
+            profiles = profiles.filter(
+                expected_salary_min_monthly__isnull=True, expected_salary_max_monthly__isnull=True,
+            )
+
+        self.stdout.write('💰 Normalizing job salaries...')
+        total = self.backfill(
+            jobs.only('pk', 'salary_min', 'salary_max', 'salary_type'),
+            ['salary_min_monthly', 'salary_max_monthly'],
+            options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'✅ Updated {total} jobs'))
+
+        self.stdout.write('💰 Normalizing expected salaries...')
+        total = self.backfill(
+            profiles.only('pk', 'expected_salary_min', 'expected_salary_max'),
+            ['expected_salary_min_monthly', 'expected_salary_max_monthly'],
+            options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'✅ Updated {total} job seeker profiles'))
+
+    def backfill(self, queryset, fields, batch_size):
+        # Walk the table in primary key order so each batch is a short indexed range
+        model = queryset.model
+        total = 0
+        last_pk = None
+        while True:
+            batch_qs = queryset.order_by('pk')
+            if last_pk is not None:
+                batch_qs = batch_qs.filter(pk__gt=last_pk)
+            batch = list(batch_qs[:batch_size])
+            if not batch:
+                return total
+            for obj in batch:
+                obj.update_normalized_salary()
+            total += model.objects.bulk_update(batch, fields)
+            if model is Job:
+                # bulk_update skips the signals that copy the salaries onto the listing rows
+                listing.sync_jobs([obj.pk for obj in batch])
+            last_pk = batch[-1].pk
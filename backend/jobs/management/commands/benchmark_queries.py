@@ -0,0 +1,117 @@
+import io
+import json
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from jobs.benchmarks import build_cases, compare, pick_fixtures, run_cases
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = (
+        'Time the hot query paths (wall time, queries, rows fetched) against a generated dataset; '
+        'with --baseline, fail when a path regresses'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1, help='Dataset size, as for populate_sample_data --scale')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--workers', type=int, default=None, help='Data generator processes (default: one per CPU)')
+        parser.add_argument(
+            '--keepdb', action='store_true',
+            help='Keep the benchmark database and reuse its data next time (drop it to change --scale or --seed)',
+        )
+        parser.add_argument(
+            '--existing-data', action='store_true',
+            help='Run against the configured database as it is instead of a generated one',
+        )
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per case; the median is reported')
+        parser.add_argument('--case', action='append', help='Only cases whose name starts with this (repeatable)')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+        parser.add_argument('--baseline', help='JSON results to compare against; regressions fail the command')
+        parser.add_argument(
+            '--threshold', type=float, default=0.25,
+            help='Tolerated growth of wall time and rows fetched against the baseline (default: 0.25 = 25%%)',
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+
+        old_name = None if options['existing_data'] else self.setup_database(options)
+        try:
+            results = self.run_benchmarks(options)
+        finally:
+            if old_name is not None:
+                connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+            self.stdout.write(f'💾 Results written to {options["output"]}')
+
+        if baseline is not None:
+            regressions = compare(results['cases'], baseline['cases'], options['threshold'])
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(f'  ✗ {regression}'))
+            if regressions:
+                raise CommandError(f'{len(regressions)} regression(s) against {options["baseline"]}')
+            self.stdout.write(self.style.SUCCESS(f'✅ No regressions against {options["baseline"]}'))
+
+    def setup_database(self, options):
+        """Switch to a dedicated database holding generated data; returns the original name."""
+        old_name = connection.settings_dict['NAME']
+        test_settings = connection.settings_dict.setdefault('TEST', {})
+        if connection.vendor == 'sqlite' and not test_settings.get('NAME'):
+            # On disk rather than in memory: the generator closes connections around its process pool
+            test_settings['NAME'] = str(settings.BASE_DIR / 'benchmark.sqlite3')
+        self.stdout.write('🧪 Preparing the benchmark database...')
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False, keepdb=options['keepdb'])
+        if not (options['keepdb'] and Job.objects.exists()):
+            call_command(
+                'populate_sample_data', scale=options['scale'], seed=options['seed'], workers=options['workers'],
+                stdout=self.stdout if options['verbosity'] > 1 else io.StringIO(),
+            )
+        return old_name
+
+    def run_benchmarks(self, options):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        cases = build_cases(pick_fixtures())
+        if options['case']:
+            cases = [case for case in cases if case.name.startswith(tuple(options['case']))]
+
+        self.stdout.write(f'⏱️  Running {len(cases)} cases, {options["repeat"]} timed runs each...')
+        width = max((len(case.name) for case in cases), default=0)
+        results = {}
+        failures = []
+        for case, result in run_cases(cases, options['repeat']):
+            row = results[case.name] = result.as_dict()
+            line = (
+                f"  {case.name:<{width}} {row['median_ms']:>9.2f} ms  {row['queries']:>4} queries  {row['rows']:>7} rows"
+            )
+            if result.status != case.expected_status:
+                failures.append(f'{case.name} returned {result.status}, expected {case.expected_status}')
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(line)
+        if failures:
+            raise CommandError('; '.join(failures))
+
+        return {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'vendor': connection.vendor,
+                'jobs': Job.objects.count(),
+                'scale': None if options['existing_data'] else options['scale'],
+                'seed': None if options['existing_data'] else options['seed'],
+                'repeat': options['repeat'],
+            },
+            'cases': results,
+        }
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from jobs.duplicates import rebuild_clusters
+
+
+class Command(BaseCommand):
+    help = 'Recompute MinHash signatures for every job in a process pool and regroup near-duplicate clusters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: one per CPU)')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        self.stdout.write('🧬 Signing jobs and clustering near-duplicates...')
+        jobs, clusters, changed = rebuild_clusters(options['workers'], options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Signed {jobs} jobs into {clusters} duplicate clusters ({changed} jobs changed cluster)'
+        ))
@@ -0,0 +1,119 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+import random
+
+from users.models import User, JobPosterProfile
+from jobs.filters import CANONICAL_FILTERS, apply_job_filters, cursor_ordering
+from jobs import listing
+from jobs.models import JobCategory, Job, JobListing
+from jobs.pagination import JobCursorPagination
+from jobs.salary import monthly_minor_units
+
+CITIES = [
+    ('Mumbai', 'Maharashtra'), ('Pune', 'Maharashtra'), ('Delhi', 'Delhi'),
+    ('Bangalore', 'Karnataka'), ('Chennai', 'Tamil Nadu'), ('Hyderabad', 'Telangana'),
+    ('Kolkata', 'West Bengal'), ('Ahmedabad', 'Gujarat'), ('Jaipur', 'Rajasthan'),
+    ('Lucknow', 'Uttar Pradesh'), ('Indore', 'Madhya Pradesh'), ('Surat', 'Gujarat'),
+]
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the canonical job listing filter combinations and flag sequential scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, default=200000,
+            help='Synthetic jobs to generate before explaining (rolled back afterwards, 0 to use existing data)',
+        )
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every plan, not only flagged ones')
+
+    def handle(self, *args, **options):
+        flagged = []
+        with transaction.atomic():
+            if options['rows']:
+                self.generate_jobs(options['rows'], random.Random(options['seed']))
+            self.analyze()
+
+            category = JobCategory.objects.values_list('pk', flat=True).first()
+            page_size = JobCursorPagination().page_size
+            for filters in CANONICAL_FILTERS:
+                filters = {k: str(category) if v == '{category}' else v for k, v in filters.items()}
+                queryset = apply_job_filters(JobListing.objects.all(), filters)
+                queryset = queryset.order_by(*cursor_ordering(filters))[:page_size + 1]
+                plan = queryset.explain()
+                label = ', '.join(f'{k}={v}' for k, v in filters.items()) or '(no filters)'
+                if self.is_sequential_scan(plan):
+                    flagged.append(label)
+                    self.stdout.write(self.style.WARNING(f'SEQ SCAN  {label}'))
+                    self.stdout.write(plan)
+                else:
+                    self.stdout.write(self.style.SUCCESS(f'ok        {label}'))
+                    if options['verbose_plans']:
+                        self.stdout.write(plan)
+
+            transaction.set_rollback(True)
+
+        if flagged:
+            raise CommandError(f'{len(flagged)} filter combination(s) fall back to a sequential scan')
+
+    def is_sequential_scan(self, plan):
+        if connection.vendor == 'postgresql':
+            return f'Seq Scan on {JobListing._meta.db_table}' in plan
+        if connection.vendor == 'sqlite':
+            # "SCAN <table>" without "USING ... INDEX" is a full table walk
+            return any(
+                line.strip().startswith(f'SCAN {JobListing._meta.db_table}') and 'INDEX' not in line
+                for line in plan.splitlines()
+            )
+        return False
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def generate_jobs(self, rows, rng):
+        self.stdout.write(f'🧪 Generating {rows} synthetic jobs...')
+        poster = User.objects.create(
+            username='explain-poster', email='explain-poster@example.invalid',
+            role='job_poster',
+        )
+        company = JobPosterProfile.objects.create(user=poster, company_name='Explain Co')
+        categories = list(JobCategory.objects.all())
+        if not categories:
+            categories = JobCategory.objects.bulk_create([
+                JobCategory(name=f'Explain Category {i}') for i in range(8)
+            ])
+
+        job_types = [choice for choice, _ in Job.JOB_TYPES]
+        experience_levels = [choice for choice, _ in Job.EXPERIENCE_LEVELS]
+        statuses = ['active'] * 7 + ['draft', 'closed', 'expired']
+        batch = []
+        for i in range(rows):
+            city, state = rng.choice(CITIES)
+            salary_min = rng.randrange(8000, 60000, 500)
+            salary_max = salary_min + rng.randrange(0, 30000, 500)
+            batch.append(Job(
+                title=f'Synthetic job {i}',
+                description='Synthetic job used for query plan checks.',
+                category=rng.choice(categories),
+                posted_by=poster,
+                company=company,
+                job_type=rng.choice(job_types),
+                experience_level=rng.choice(experience_levels),
+                location=f'{city}, {state}',
+                city=city,
+                state=state,
+                pincode=str(rng.randint(100000, 999999)),
+                is_remote=rng.random() < 0.05,
+                salary_min=salary_min,
+                salary_max=salary_max,
+                salary_min_monthly=monthly_minor_units(salary_min),
+                salary_max_monthly=monthly_minor_units(salary_max),
+                status=rng.choice(statuses),
+            ))
+            if len(batch) >= 5000:
+                Job.objects.bulk_create(batch)
+                batch = []
+        Job.objects.bulk_create(batch)
+        listing.rebuild()
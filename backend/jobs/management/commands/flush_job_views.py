@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.tracking import flush_views
+
+
+class Command(BaseCommand):
+    help = 'Load spooled job views into JobView rows and Job.views_count'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Keep running and flush every INTERVAL seconds (default: flush once and exit)',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            total = flush_views(options['batch_size'])
+            if total or not options['interval']:
+                self.stdout.write(self.style.SUCCESS(f'👀 Flushed {total} job views'))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
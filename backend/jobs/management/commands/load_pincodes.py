@@ -0,0 +1,81 @@
+from django.core.management.base import BaseCommand, CommandError
+from pathlib import Path
+import csv
+
+from jobs import listing
+from jobs.models import PincodeLocation, Job
+
+DEFAULT_FILE = Path(__file__).resolve().parents[2] / 'data' / 'pincodes.csv'
+
+
+class Command(BaseCommand):
+    help = 'Load the pincode-to-coordinate reference table and geocode jobs from it'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--file', default=str(DEFAULT_FILE),
+            help='CSV with pincode,place_name,city,state,latitude,longitude columns (defaults to the bundled file)',
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--skip-jobs', action='store_true',
+            help='Only load the reference table, do not geocode existing jobs',
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['file'])
+        if not path.exists():
+            raise CommandError(f'{path} does not exist')
+
+        self.stdout.write(f'📍 Loading pincodes from {path}...')
+        loaded = 0
+        batch = []
+        with path.open(newline='', encoding='utf-8') as handle:
+            for row in csv.DictReader(handle):
+                batch.append(PincodeLocation(
+                    pincode=row['pincode'].strip(),
+                    place_name=row.get('place_name', '').strip(),
+                    city=row['city'].strip(),
+                    state=row['state'].strip(),
+                    latitude=float(row['latitude']),
+                    longitude=float(row['longitude']),
+                ))
+                if len(batch) >= options['batch_size']:
+                    loaded += self.save_batch(batch)
+                    batch = []
+        loaded += self.save_batch(batch)
+        self.stdout.write(self.style.SUCCESS(f'✅ Loaded {loaded} pincodes'))
+
+        if not options['skip_jobs']:
+            self.geocode_jobs(options['batch_size'])
+
+    def save_batch(self, batch):
+        PincodeLocation.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=['pincode'],
+            update_fields=['place_name', 'city', 'state', 'latitude', 'longitude'],
+        )
+        return len(batch)
+
+    def geocode_jobs(self, batch_size):
+        self.stdout.write('🗺️  Geocoding jobs without coordinates...')
+        jobs = Job.objects.filter(geohash__isnull=True).only('pk', 'pincode', 'city', 'state')
+        updated = []
+        total = 0
+        for job in jobs.iterator(chunk_size=batch_size):
+            job.update_coordinates()
+            if job.geohash:
+                updated.append(job)
+            if len(updated) >= batch_size:
+                total += self.save_coordinates(updated)
+                updated = []
+        if updated:
+            total += self.save_coordinates(updated)
+        self.stdout.write(self.style.SUCCESS(f'✅ Geocoded {total} jobs'))
+
+    def save_coordinates(self, jobs):
+        updated = Job.objects.bulk_update(jobs, ['latitude', 'longitude', 'geohash'])
+        # bulk_update skips the signals that copy the coordinates onto the listing rows
+        listing.sync_jobs([job.pk for job in jobs])
+        return updated
@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.percolator import percolate
+
+
+class Command(BaseCommand):
+    help = 'Match active jobs against job alerts in batches, e.g. after a bulk import that skipped signals'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since', type=datetime.fromisoformat,
+            help='Only jobs published at or after this time (ISO 8601); defaults to every active job',
+        )
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        jobs = Job.objects.filter(status='active')
+        since = options['since']
+        if since:
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+            jobs = jobs.filter(published_at__gte=since)
+        job_ids = list(jobs.order_by('published_at').values_list('pk', flat=True))
+
+        self.stdout.write(f'🔔 Percolating {len(job_ids)} jobs against job alerts...')
+        total = percolate(job_ids, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'✅ Found {total} alert matches'))
@@ -1,21 +1,79 @@
-from django.core.management.base import BaseCommand
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
 from django.utils import timezone
-from datetime import datetime, timedelta
-import random
 
 from users.models import JobSeekerProfile, JobPosterProfile, Skill, JobSeekerSkill
-from jobs.models import JobCategory, Job, JobSkillRequirement
+from jobs import listing, synthetic
+from jobs.duplicates import bounded_map, rebuild_clusters
+from jobs.geo import encode_geohash
+from jobs.models import JobAlert, JobCategory, Job, JobSkillRequirement, JobView, PincodeLocation, UserAgent
+from jobs.rollups import rollup_views
+from jobs.search import get_search_backend
 from applications.models import JobApplication
 
 User = get_user_model()
 
+SAMPLE_PASSWORD = 'password123'
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """
+    Let bulk_create keep generated timestamps instead of stamping now:
+    auto_now/auto_now_add are switched off for the duration.
+    """
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
 class Command(BaseCommand):
-    help = 'Populate the database with sample job listings and job seeker records'
+    help = (
+        'Populate the database with sample job listings and job seeker records; '
+        'with --scale, also generate a synthetic production-sized dataset'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', type=float, default=0,
+            help=(
+                f'Synthetic data to add, in units of {synthetic.UNIT_SEEKERS} job seekers, '
+                f'{synthetic.UNIT_POSTERS} employers and {synthetic.UNIT_JOBS} jobs with their views, '
+                'applications and alerts (default: 0, only the curated sample)'
+            ),
+        )
+        parser.add_argument('--seed', type=int, default=42, help='Random seed; the same seed gives the same data')
+        parser.add_argument('--workers', type=int, default=None, help='Generator processes (default: one per CPU)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per INSERT')
 
     def handle(self, *args, **options):
+        if options['scale'] < 0:
+            raise CommandError('--scale must not be negative')
+        random.seed(options['seed'])
+        self.password = make_password(SAMPLE_PASSWORD)
         self.stdout.write(self.style.SUCCESS('🚀 Starting to populate sample data...'))
         
+        # Jobs are geocoded from the pincode table, so it has to be filled first
+        self.load_pincodes()
+        
         # Create job categories
         self.create_job_categories()
         
@@ -34,8 +92,20 @@ class Command(BaseCommand):
         # Create some applications
         self.create_applications()
         
+        if options['scale']:
+            self.create_synthetic_data(
+                options['scale'], options['seed'], options['workers'] or os.cpu_count() or 1, options['batch_size'],
+            )
+        
+        self.print_summary()
         self.stdout.write(self.style.SUCCESS('✅ Sample data population completed!'))
 
+    def load_pincodes(self):
+        if not PincodeLocation.objects.exists():
+            call_command('load_pincodes', skip_jobs=True, stdout=self.stdout, stderr=self.stderr)
+        if not PincodeLocation.objects.exists():
+            raise CommandError('The pincode table is empty, so jobs could not be geocoded; check load_pincodes')
+    
     def create_job_categories(self):
         self.stdout.write('📂 Creating job categories...')
         
@@ -248,6 +318,7 @@ class Command(BaseCommand):
             }
         ]
         
+        skill_ids = dict(Skill.objects.values_list('name', 'pk'))
         for seeker_data in job_seekers_data:
             # Create user
             user, created = User.objects.get_or_create(
@@ -257,23 +328,16 @@ class Command(BaseCommand):
                     'first_name': seeker_data['first_name'],
                     'last_name': seeker_data['last_name'],
                     'role': 'job_seeker',
+                    'phone_number': seeker_data['phone'],
+                    'password': self.password,
                     'is_active': True,
                     'is_verified': True
                 }
             )
             
             if created:
-                user.set_password('password123')
-                user.save()
-                
                 # Create job seeker profile
-                experience_level = 'entry'
-                if seeker_data['experience_years'] >= 10:
-                    experience_level = 'expert'
-                elif seeker_data['experience_years'] >= 5:
-                    experience_level = 'senior'
-                elif seeker_data['experience_years'] >= 2:
-                    experience_level = 'mid'
+                experience_level = synthetic.experience_level(seeker_data['experience_years'])
                 
                 profile = JobSeekerProfile.objects.create(
                     user=user,
@@ -288,22 +352,16 @@ class Command(BaseCommand):
                     expected_salary_max=random.randint(25000, 60000)
                 )
                 
-                # Set phone number on user
-                user.phone_number = seeker_data['phone']
-                user.save()
-                
                 # Add skills
-                for skill_name in seeker_data['skills']:
-                    try:
-                        skill = Skill.objects.get(name=skill_name)
-                        JobSeekerSkill.objects.create(
-                            job_seeker=profile,
-                            skill=skill,
-                            proficiency_level='intermediate',
-                            years_of_experience=random.randint(1, seeker_data['experience_years'])
-                        )
-                    except Skill.DoesNotExist:
-                        pass
+                JobSeekerSkill.objects.bulk_create([
+                    JobSeekerSkill(
+                        job_seeker=profile,
+                        skill_id=skill_ids[skill_name],
+                        proficiency_level='intermediate',
+                        years_of_experience=random.randint(1, seeker_data['experience_years'])
+                    )
+                    for skill_name in seeker_data['skills'] if skill_name in skill_ids
+                ])
                 
                 self.stdout.write(f'  ✓ Created job seeker: {user.get_full_name()}')
 
@@ -367,15 +425,13 @@ class Command(BaseCommand):
                     'first_name': employer_data['first_name'],
                     'last_name': employer_data['last_name'],
                     'role': 'job_poster',
+                    'password': self.password,
                     'is_active': True,
                     'is_verified': True
                 }
             )
             
             if created:
-                user.set_password('password123')
-                user.save()
-                
                 # Create job poster profile
                 JobPosterProfile.objects.create(
                     user=user,
@@ -530,68 +586,64 @@ class Command(BaseCommand):
             }
         ]
         
+        # Look up posters, categories and skills once instead of per job
+        companies = {
+            profile.user.email: profile
+            for profile in JobPosterProfile.objects.select_related('user').filter(
+                user__email__in={job_data['company_email'] for job_data in jobs_data}
+            )
+        }
+        categories = {category.name: category for category in JobCategory.objects.all()}
+        skill_ids = dict(Skill.objects.values_list('name', 'pk'))
+        
         for job_data in jobs_data:
-            try:
-                # Get the job poster
-                poster_user = User.objects.get(email=job_data['company_email'])
-                poster_profile = JobPosterProfile.objects.get(user=poster_user)
-                
-                # Get the category
-                category = JobCategory.objects.get(name=job_data['category'])
-                
-                # Map experience years to experience level
-                experience_level = 'entry'
-                if job_data['experience_required'] >= 10:
-                    experience_level = 'expert'
-                elif job_data['experience_required'] >= 5:
-                    experience_level = 'senior'
-                elif job_data['experience_required'] >= 2:
-                    experience_level = 'mid'
-                
-                # Create the job
-                job = Job.objects.create(
-                    title=job_data['title'],
-                    category=category,
-                    company=poster_profile,
-                    posted_by=poster_user,
-                    description=job_data['description'],
-                    requirements=job_data['requirements'],
-                    location=job_data['location'],
-                    city=job_data['location'].split(',')[0].strip(),
-                    state=job_data['location'].split(',')[1].strip() if ',' in job_data['location'] else '',
-                    salary_min=job_data['salary_min'],
-                    salary_max=job_data['salary_max'],
-                    salary_type='monthly',
-                    job_type=job_data['job_type'],
-                    experience_level=experience_level,
-                    application_deadline=timezone.now() + timedelta(days=30),
-                    status='active',
-                    is_featured=random.choice([True, False])
-                )
-                
-                # Add required skills
-                for skill_name in job_data['skills']:
-                    try:
-                        skill = Skill.objects.get(name=skill_name)
-                        JobSkillRequirement.objects.create(
-                            job=job,
-                            skill=skill,
-                            requirement_level='required'
-                        )
-                    except Skill.DoesNotExist:
-                        pass
-                
-                self.stdout.write(f'  ✓ Created job: {job.title}')
-                
-            except (User.DoesNotExist, JobPosterProfile.DoesNotExist, JobCategory.DoesNotExist):
+            poster_profile = companies.get(job_data['company_email'])
+            category = categories.get(job_data['category'])
+            if poster_profile is None or category is None:
                 self.stdout.write(f'  ✗ Failed to create job: {job_data["title"]}')
+                continue
+            experience_level = synthetic.experience_level(job_data['experience_required'])
+            
+            # Create the job
+            job = Job.objects.create(
+                title=job_data['title'],
+                category=category,
+                company=poster_profile,
+                posted_by=poster_profile.user,
+                description=job_data['description'],
+                requirements=job_data['requirements'],
+                location=job_data['location'],
+                city=job_data['location'].split(',')[0].strip(),
+                state=job_data['location'].split(',')[1].strip() if ',' in job_data['location'] else '',
+                salary_min=job_data['salary_min'],
+                salary_max=job_data['salary_max'],
+                salary_type='monthly',
+                job_type=job_data['job_type'],
+                experience_level=experience_level,
+                application_deadline=timezone.now() + timedelta(days=30),
+                status='active',
+                is_featured=random.choice([True, False])
+            )
+            
+            # Add required skills; bulk_create skips signals, so sync the listing once
+            JobSkillRequirement.objects.bulk_create([
+                JobSkillRequirement(job=job, skill_id=skill_ids[skill_name], requirement_level='required')
+                for skill_name in job_data['skills'] if skill_name in skill_ids
+            ])
+            listing.sync_skills(job.pk)
+            
+            self.stdout.write(f'  ✓ Created job: {job.title}')
 
     def create_applications(self):
         self.stdout.write('📝 Creating job applications...')
         
         # Get some job seekers and jobs
-        job_seekers = list(JobSeekerProfile.objects.all()[:5])
-        jobs = list(Job.objects.all()[:8])
+        job_seekers = list(JobSeekerProfile.objects.select_related('user')[:5])
+        jobs = list(Job.objects.select_related('company')[:8])
+        existing = set(
+            JobApplication.objects.filter(job__in=jobs, applicant__in=[seeker.user_id for seeker in job_seekers])
+            .values_list('job_id', 'applicant_id')
+        )
         
         applications_created = 0
         
@@ -602,7 +654,7 @@ class Command(BaseCommand):
             
             for job in selected_jobs:
                 # Check if application already exists
-                if not JobApplication.objects.filter(job=job, applicant=job_seeker.user).exists():
+                if (job.pk, job_seeker.user_id) not in existing:
                     application = JobApplication.objects.create(
                         job=job,
                         applicant=job_seeker.user,
@@ -615,6 +667,152 @@ class Command(BaseCommand):
                     
         self.stdout.write(f'  ✓ Created {applications_created} job applications')
 
+    def create_synthetic_data(self, scale, seed, workers, batch_size):
+        seekers, posters, jobs = synthetic.counts(scale)
+        self.stdout.write(
+            f'🏭 Generating {seekers} job seekers, {posters} employers and {jobs} jobs '
+            f'(seed {seed}, {workers} workers)...'
+        )
+        self.batch_size = batch_size
+        # Names in the generated rows are resolved through these, never per row
+        self.category_ids = dict(JobCategory.objects.values_list('name', 'pk'))
+        self.skill_ids = dict(Skill.objects.values_list('name', 'pk'))
+        user_agents = UserAgent.intern(synthetic.USER_AGENTS)
+        self.user_agent_ids = [user_agents[user_agent] for user_agent in synthetic.USER_AGENTS]
+        self.coordinates = {}
+        now = timezone.now()
+        context = {
+            'now': now,
+            'seekers': seekers,
+            'posters': posters,
+            'skills': synthetic.skills_by_category(Skill.objects.values_list('name', 'category')),
+        }
+        totals = {'seekers': seekers, 'posters': posters, 'jobs': jobs}
+        loaders = {'seekers': self.load_seekers, 'posters': self.load_posters, 'jobs': self.load_jobs}
+        
+        # Generator workers never query; closing first keeps them from inheriting live connections
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers) as pool, explicit_timestamps(
+            User, JobSeekerProfile, JobSeekerSkill, JobPosterProfile, JobAlert, Job, JobSkillRequirement, JobApplication,
+        ):
+            # Seekers and employers go in first: job chunks reference them
+            for kind, total in totals.items():
+                tasks = (
+                    (kind, seed, start, min(synthetic.CHUNK_SIZE, total - start), context)
+                    for start in range(0, total, synthetic.CHUNK_SIZE)
+                )
+                for rows in bounded_map(pool, synthetic.generate_chunk, tasks, 2 * workers):
+                    with transaction.atomic():
+                        loaders[kind](rows)
+                self.stdout.write(f'  ✓ Created {total} synthetic {kind}')
+        
+        self.rebuild_derived_data(timezone.localdate(now - timedelta(days=synthetic.JOB_AGE_DAYS)), workers)
+
+    def insert(self, model, objects):
+        # Rerunning with the same seed regenerates the same keys, which are skipped
+        model.objects.bulk_create(objects, batch_size=self.batch_size, ignore_conflicts=True)
+
+    def insert_rows(self, model, field_names, rows):
+        fields = [model._meta.get_field(name) for name in field_names]
+        columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+        sql = (
+            f'INSERT INTO {connection.ops.quote_name(model._meta.db_table)} ({columns}) '
+            f'VALUES ({", ".join(["%s"] * len(fields))}) ON CONFLICT DO NOTHING'
+        )
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), self.batch_size):
+                cursor.executemany(sql, [
+                    [field.get_db_prep_save(value, connection) for field, value in zip(fields, row)]
+                    for row in rows[start:start + self.batch_size]
+                ])
+
+    def locate(self, city, state):
+        """(latitude, longitude, geohash) of a city, looked up once per city."""
+        if (city, state) not in self.coordinates:
+            coordinates = PincodeLocation.lookup(None, city, state)
+            if coordinates is None:
+                self.stdout.write(self.style.WARNING(
+                    f"  ⚠️  No pincode for {city}, {state}: its jobs won't show up in radius searches"
+                ))
+            self.coordinates[city, state] = (
+                (*coordinates, encode_geohash(*coordinates)) if coordinates else (None, None, None)
+            )
+        return self.coordinates[city, state]
+
+    def load_seekers(self, rows):
+        self.insert(User, [
+            User(password=self.password, updated_at=row['created_at'], **row) for row in rows['users']
+        ])
+        profiles = []
+        for row in rows['seeker_profiles']:
+            profile = JobSeekerProfile(updated_at=row['created_at'], **row)
+            profile.update_normalized_salary()
+            profiles.append(profile)
+        self.insert(JobSeekerProfile, profiles)
+        
+        seeker_skills = []
+        for row in rows['seeker_skills']:
+            skill_id = self.skill_ids.get(row.pop('skill'))
+            if skill_id:
+                seeker_skills.append(JobSeekerSkill(skill_id=skill_id, **row))
+        self.insert(JobSeekerSkill, seeker_skills)
+        
+        alerts = []
+        for row in rows['alerts']:
+            category = row.pop('category')
+            alert = JobAlert(category_id=self.category_ids.get(category), updated_at=row['created_at'], **row)
+            alert.update_match_slot()
+            alerts.append(alert)
+        self.insert(JobAlert, alerts)
+
+    def load_posters(self, rows):
+        self.insert(User, [
+            User(password=self.password, updated_at=row['created_at'], **row) for row in rows['users']
+        ])
+        self.insert(JobPosterProfile, [
+            JobPosterProfile(updated_at=row['created_at'], **row) for row in rows['companies']
+        ])
+
+    def load_jobs(self, rows):
+        jobs = []
+        for row in rows['jobs']:
+            del row['poster']
+            job = Job(category_id=self.category_ids[row.pop('category')], updated_at=row['created_at'], **row)
+            # What Job.save would fill in, without a query per job
+            job.latitude, job.longitude, job.geohash = self.locate(job.city, job.state)
+            job.update_normalized_salary()
+            jobs.append(job)
+        self.insert(Job, jobs)
+        
+        requirements = []
+        for row in rows['requirements']:
+            skill_id = self.skill_ids.get(row.pop('skill'))
+            if skill_id:
+                requirements.append(JobSkillRequirement(skill_id=skill_id, **row))
+        self.insert(JobSkillRequirement, requirements)
+        
+        self.insert(JobApplication, [
+            JobApplication(last_updated=row['viewed_at'] or row['applied_at'], **row) for row in rows['applications']
+        ])
+        # Views outnumber every other row by far, so they go in as plain tuples
+        self.insert_rows(JobView, ['id', 'job', 'user', 'ip_address', 'user_agent', 'created_at'], [
+            (view_id, job_id, user_id, ip_address, self.user_agent_ids[user_agent], created_at)
+            for view_id, job_id, user_id, ip_address, user_agent, created_at in rows['views']
+        ])
+
+    def rebuild_derived_data(self, since, workers):
+        """Bulk inserts skip signals, so rebuild what they would have kept up to date."""
+        self.stdout.write('🗂️  Rebuilding listings, search index, view rollups and duplicate clusters...')
+        with transaction.atomic():
+            listings = listing.rebuild()
+        get_search_backend().rebuild()
+        rollups = rollup_views(since)
+        _, clusters, _ = rebuild_clusters(workers)
+        self.stdout.write(
+            f'  ✓ {listings} listings, {rollups} daily view rollups, {clusters} duplicate clusters'
+        )
+        self.stdout.write('  ℹ️  Run percolate_job_alerts to match the new jobs against job alerts')
+
     def print_summary(self):
         self.stdout.write('\n📊 Database Summary:')
         self.stdout.write(f'  • Job Categories: {JobCategory.objects.count()}')
@@ -623,3 +821,5 @@ class Command(BaseCommand):
         self.stdout.write(f'  • Employers: {JobPosterProfile.objects.count()}')
         self.stdout.write(f'  • Job Listings: {Job.objects.count()}')
         self.stdout.write(f'  • Applications: {JobApplication.objects.count()}')
+        self.stdout.write(f'  • Job Views: {JobView.objects.count()}')
+        self.stdout.write(f'  • Job Alerts: {JobAlert.objects.count()}')
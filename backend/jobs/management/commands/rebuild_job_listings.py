@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from jobs import listing
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized job listing table from the jobs table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        self.stdout.write('🗂️  Rebuilding job listings...')
+        with transaction.atomic():
+            total = listing.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'✅ Rebuilt {total} job listings'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from jobs.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the job full-text search index (needed after bulk loads that bypass save signals)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        self.stdout.write(f'🔎 Rebuilding search index with {type(backend).__name__}...')
+        backend.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS('✅ Search index rebuilt'))
@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from applications.models import JobApplication
+from jobs.models import Job
+from jobs.rollups import view_totals
+
+
+class Command(BaseCommand):
+    help = 'Recompute Job.applications_count and Job.views_count from their source tables and repair drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without fixing it')
+
+    def handle(self, *args, **options):
+        self.stdout.write('🔢 Reconciling job counters...')
+        checked = repaired = 0
+        last_pk = None
+        while True:
+            with transaction.atomic():
+                batch_qs = Job.objects.order_by('pk')
+                if last_pk is not None:
+                    batch_qs = batch_qs.filter(pk__gt=last_pk)
+                # Locking the batch makes concurrent applies and view flushes wait, so the
+                # recomputed totals can't miss an increment that lands mid-batch
+                jobs = list(
+                    batch_qs.select_for_update()
+                    .values_list('pk', 'applications_count', 'views_count')[:options['batch_size']]
+                )
+                if not jobs:
+                    break
+                repaired += self.reconcile(jobs, options['dry_run'])
+            checked += len(jobs)
+            last_pk = jobs[-1][0]
+
+        verb = 'Found' if options['dry_run'] else 'Repaired'
+        self.stdout.write(self.style.SUCCESS(f'✅ Checked {checked} jobs. {verb} {repaired} with drifted counters'))
+
+    def reconcile(self, jobs, dry_run):
+        job_ids = [pk for pk, _, _ in jobs]
+        applications = dict(
+            JobApplication.objects.filter(job_id__in=job_ids).exclude(status='withdrawn')
+            .values('job_id').annotate(total=Count('pk')).order_by()
+            .values_list('job_id', 'total')
+        )
+        views = view_totals(job_ids)
+
+        repaired = 0
+        for pk, applications_count, views_count in jobs:
+            expected = (applications.get(pk, 0), views[pk])
+            if expected == (applications_count, views_count):
+                continue
+            repaired += 1
+            self.stdout.write(
+                f'  {pk}: applications {applications_count} -> {expected[0]}, views {views_count} -> {expected[1]}'
+            )
+            if not dry_run:
+                Job.objects.filter(pk=pk).update(applications_count=expected[0], views_count=expected[1])
+        return repaired
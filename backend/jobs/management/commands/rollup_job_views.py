@@ -0,0 +1,31 @@
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jobs.rollups import rollup_views, purge_views
+
+
+class Command(BaseCommand):
+    help = 'Roll raw job views up into daily totals and purge raw views past the retention window'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since', type=date.fromisoformat,
+            help='Recompute rollups from this day (YYYY-MM-DD) instead of the last rolled-up day',
+        )
+        parser.add_argument('--retention-days', type=int, default=settings.JOB_VIEW_RETENTION_DAYS)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--pause', type=float, default=0.0, help='Seconds to sleep between purge batches')
+        parser.add_argument('--no-purge', action='store_true')
+
+    def handle(self, *args, **options):
+        self.stdout.write('📊 Rolling up job views...')
+        total = rollup_views(options['since'])
+        self.stdout.write(self.style.SUCCESS(f'✅ Wrote {total} daily rollups'))
+
+        if options['no_purge']:
+            return
+        self.stdout.write(f"🧹 Purging raw views older than {options['retention_days']} days...")
+        total = purge_views(options['retention_days'], options['batch_size'], options['pause'])
+        self.stdout.write(self.style.SUCCESS(f'✅ Deleted {total} raw views'))
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.digests import FREQUENCY_INTERVALS, send_due_alerts
+
+
+class Command(BaseCommand):
+    help = 'Email job alert digests that are due; run one process per shard to spread the load'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--frequency', action='append', choices=list(FREQUENCY_INTERVALS),
+            help='Only send alerts of this frequency (repeatable; default: all)',
+        )
+        parser.add_argument('--shard', type=int, default=0, help='Shard of the user id space to process')
+        parser.add_argument('--shards', type=int, default=1, help='Total number of shards (workers)')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Keep running and send every INTERVAL seconds (default: send once and exit)',
+        )
+
+    def handle(self, *args, **options):
+        if not 0 <= options['shard'] < options['shards']:
+            raise CommandError('--shard must be between 0 and --shards - 1')
+        frequencies = options['frequency'] or list(FREQUENCY_INTERVALS)
+        while True:
+            for frequency in frequencies:
+                alerts, emails = send_due_alerts(
+                    frequency, options['shard'], options['shards'], options['batch_size'],
+                )
+                if alerts or not options['interval']:
+                    self.stdout.write(self.style.SUCCESS(
+                        f'📬 {frequency}: sent {emails} digests for {alerts} due alerts'
+                    ))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.23 on 2026-10-17 20:43
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='jobs_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['-created_at', '-id'], name='jobs_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['category', '-created_at', '-id'], name='jobs_active_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['job_type', '-created_at', '-id'], name='jobs_active_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['experience_level', '-created_at', '-id'], name='jobs_active_experience_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['category', 'job_type', 'experience_level'], name='jobs_active_cat_type_exp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_remote', True), ('status', 'active')), fields=['-created_at', '-id'], name='jobs_active_remote_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(django.db.models.functions.text.Upper('city'), models.OrderBy(models.F('created_at'), descending=True), condition=models.Q(('status', 'active')), name='jobs_active_city_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(django.db.models.functions.text.Upper('state'), models.OrderBy(models.F('created_at'), descending=True), condition=models.Q(('status', 'active')), name='jobs_active_state_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['pincode'], name='jobs_active_pincode_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['salary_max', 'salary_min'], name='jobs_active_salary_idx'),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 4.2.23 on 2026-10-17 20:45
+
+import uuid
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+POSTGRES_FORWARD = [
+    "CREATE INDEX jobs_search_vector_gin ON jobs USING gin (search_vector)",
+    """
+    UPDATE jobs SET search_vector =
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(requirements, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'C')
+    """,
+]
+POSTGRES_REVERSE = ["DROP INDEX IF EXISTS jobs_search_vector_gin"]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE jobs_fts USING fts5(
+        job_id UNINDEXED, title, requirements, description,
+        tokenize = 'porter unicode61'
+    )
+    """,
+]
+SQLITE_REVERSE = ["DROP TABLE IF EXISTS jobs_fts"]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        for sql in POSTGRES_FORWARD:
+            schema_editor.execute(sql)
+    elif vendor == 'sqlite':
+        for sql in SQLITE_FORWARD:
+            schema_editor.execute(sql)
+        # Same rowid scheme as jobs.search.SQLiteFTS5SearchBackend
+        Job = apps.get_model('jobs', 'Job')
+        rows = [
+            (uuid.UUID(str(pk)).int >> 65, pk.hex, title, requirements or '', description or '')
+            for pk, title, requirements, description in
+            Job.objects.values_list('pk', 'title', 'requirements', 'description')
+        ]
+        with schema_editor.connection.cursor() as cursor:
+            cursor.executemany(
+                'INSERT INTO jobs_fts (rowid, job_id, title, requirements, description) '
+                'VALUES (%s, %s, %s, %s, %s)',
+                rows,
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'postgresql': POSTGRES_REVERSE, 'sqlite': SQLITE_REVERSE}.get(vendor, [])
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_job_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.23 on 2026-10-17 20:47
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_job_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, max_length=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='PincodeLocation',
+            fields=[
+                ('pincode', models.CharField(max_length=10, primary_key=True, serialize=False)),
+                ('place_name', models.CharField(blank=True, max_length=100)),
+                ('city', models.CharField(max_length=50)),
+                ('state', models.CharField(max_length=50)),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+            ],
+            options={
+                'db_table': 'pincode_locations',
+                'indexes': [models.Index(django.db.models.functions.text.Upper('city'), models.F('pincode'), name='pincode_locations_city_idx')],
+            },
+        ),
+    ]
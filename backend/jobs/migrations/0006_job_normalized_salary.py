@@ -0,0 +1,35 @@
+# Generated by Django 4.2.23 on 2026-10-17 20:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_job_geo_location'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_active_salary_idx',
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_max_monthly',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='salary_min_monthly',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['-salary_max_monthly', '-id'], name='jobs_active_salary_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['salary_min_monthly'], name='jobs_active_salary_min_idx'),
+        ),
+    ]
@@ -0,0 +1,106 @@
+# Generated by Django 4.2.23 on 2026-10-17 20:50
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+# A frozen copy of the job fields jobs.listing copies onto the listing row, as of this migration
+COPIED_FIELDS = (
+    'title', 'job_type', 'experience_level', 'location', 'city', 'state', 'pincode',
+    'is_remote', 'latitude', 'longitude', 'geohash',
+    'salary_min', 'salary_max', 'salary_type', 'salary_negotiable',
+    'salary_min_monthly', 'salary_max_monthly',
+    'is_featured', 'application_deadline', 'created_at', 'published_at',
+)
+
+
+def fill_listings(apps, schema_editor):
+    # /jobs/ reads only from the listing table, so it's filled here rather than left to rebuild_job_listings
+    Job = apps.get_model('jobs', 'Job')
+    JobListing = apps.get_model('jobs', 'JobListing')
+    JobSkillRequirement = apps.get_model('jobs', 'JobSkillRequirement')
+    jobs = Job.objects.filter(status='active').select_related('category', 'company', 'posted_by').order_by('pk')
+    last_pk = None
+    while True:
+        batch = list((jobs if last_pk is None else jobs.filter(pk__gt=last_pk))[:2000])
+        if not batch:
+            return
+        skills = {job.pk: [] for job in batch}
+        requirements = (
+            JobSkillRequirement.objects.filter(job_id__in=skills)
+            .order_by('skill__name')
+            .values_list('job_id', 'skill_id', 'skill__name', 'requirement_level')
+        )
+        for job_id, skill_id, name, requirement_level in requirements:
+            skills[job_id].append({'id': str(skill_id), 'name': name, 'requirement_level': requirement_level})
+        listings = []
+        for job in batch:
+            listing = JobListing(
+                id=job.pk,
+                category_id=job.category_id,
+                category_name=job.category.name,
+                category_icon=job.category.icon,
+                company_id=job.company_id,
+                company_name=job.company.company_name,
+                company_logo=job.company.company_logo.name or None,
+                is_company_verified=job.company.is_company_verified,
+                posted_by_id=job.posted_by_id,
+                posted_by_name=f'{job.posted_by.first_name} {job.posted_by.last_name}'.strip(),
+                skills=skills[job.pk],
+            )
+            for field in COPIED_FIELDS:
+                setattr(listing, field, getattr(job, field))
+            listings.append(listing)
+        JobListing.objects.bulk_create(listings)
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_job_normalized_salary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobListing',
+            fields=[
+                ('id', models.UUIDField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=200)),
+                ('category_id', models.UUIDField()),
+                ('category_name', models.CharField(max_length=100)),
+                ('category_icon', models.CharField(blank=True, max_length=50, null=True)),
+                ('company_id', models.UUIDField()),
+                ('company_name', models.CharField(max_length=100)),
+                ('company_logo', models.CharField(blank=True, max_length=100, null=True)),
+                ('is_company_verified', models.BooleanField(default=False)),
+                ('posted_by_id', models.UUIDField()),
+                ('posted_by_name', models.CharField(blank=True, max_length=301)),
+                ('job_type', models.CharField(choices=[('full_time', 'Full Time'), ('part_time', 'Part Time'), ('contract', 'Contract'), ('temporary', 'Temporary'), ('internship', 'Internship')], max_length=20)),
+                ('experience_level', models.CharField(choices=[('entry', 'Entry Level (0-2 years)'), ('mid', 'Mid Level (2-5 years)'), ('senior', 'Senior Level (5-10 years)'), ('expert', 'Expert Level (10+ years)')], max_length=10)),
+                ('location', models.CharField(max_length=200)),
+                ('city', models.CharField(max_length=50)),
+                ('state', models.CharField(max_length=50)),
+                ('pincode', models.CharField(blank=True, max_length=10, null=True)),
+                ('is_remote', models.BooleanField(default=False)),
+                ('latitude', models.FloatField(blank=True, null=True)),
+                ('longitude', models.FloatField(blank=True, null=True)),
+                ('geohash', models.CharField(blank=True, db_index=True, max_length=12, null=True)),
+                ('salary_min', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('salary_max', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('salary_type', models.CharField(choices=[('hourly', 'Per Hour'), ('daily', 'Per Day'), ('weekly', 'Per Week'), ('monthly', 'Per Month'), ('yearly', 'Per Year'), ('project', 'Per Project')], max_length=10)),
+                ('salary_negotiable', models.BooleanField(default=False)),
+                ('salary_min_monthly', models.BigIntegerField(blank=True, null=True)),
+                ('salary_max_monthly', models.BigIntegerField(blank=True, null=True)),
+                ('is_featured', models.BooleanField(default=False)),
+                ('application_deadline', models.DateTimeField(blank=True, null=True)),
+                ('skills', models.JSONField(default=list)),
+                ('created_at', models.DateTimeField()),
+                ('published_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'job_listings',
+                'indexes': [models.Index(fields=['-created_at', '-id'], name='job_listings_created_idx'), models.Index(fields=['category_id', '-created_at', '-id'], name='job_listings_category_idx'), models.Index(fields=['job_type', '-created_at', '-id'], name='job_listings_type_idx'), models.Index(fields=['experience_level', '-created_at', '-id'], name='job_listings_experience_idx'), models.Index(fields=['category_id', 'job_type', 'experience_level'], name='job_listings_cat_type_exp_idx'), models.Index(condition=models.Q(('is_remote', True)), fields=['-created_at', '-id'], name='job_listings_remote_idx'), models.Index(django.db.models.functions.text.Upper('city'), models.OrderBy(models.F('created_at'), descending=True), name='job_listings_city_idx'), models.Index(django.db.models.functions.text.Upper('state'), models.OrderBy(models.F('created_at'), descending=True), name='job_listings_state_idx'), models.Index(fields=['pincode'], name='job_listings_pincode_idx'), models.Index(fields=['-salary_max_monthly', '-id'], name='job_listings_salary_idx'), models.Index(fields=['salary_min_monthly'], name='job_listings_salary_min_idx'), models.Index(fields=['company_id'], name='job_listings_company_idx'), models.Index(fields=['posted_by_id'], name='job_listings_posted_by_idx')],
+            },
+        ),
+        migrations.RunPython(fill_listings, migrations.RunPython.noop),
+    ]
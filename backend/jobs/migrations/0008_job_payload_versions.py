@@ -0,0 +1,23 @@
+# Generated by Django 4.2.23 on 2026-10-17 20:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_job_listing_read_model'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobcategory',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='joblisting',
+            name='version',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.23 on 2026-10-17 20:57
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_job_payload_versions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jobview',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 4.2.23 on 2026-10-17 21:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+import hashlib
+import uuid
+
+
+def intern_user_agents(apps, schema_editor):
+    JobView = apps.get_model('jobs', 'JobView')
+    UserAgent = apps.get_model('jobs', 'UserAgent')
+    texts = JobView.objects.exclude(user_agent_text__isnull=True).exclude(user_agent_text='')
+    agents = []
+    for text in texts.values_list('user_agent_text', flat=True).distinct().iterator():
+        agents.append(UserAgent(digest=hashlib.sha256(text.encode()).hexdigest(), user_agent=text))
+        if len(agents) >= 1000:
+            UserAgent.objects.bulk_create(agents, ignore_conflicts=True)
+            agents = []
+    UserAgent.objects.bulk_create(agents, ignore_conflicts=True)
+
+    # One joined UPDATE over job_views, rather than a scan of it per distinct user agent
+    quote = schema_editor.quote_name
+    views, agents = quote(JobView._meta.db_table), quote(UserAgent._meta.db_table)
+    schema_editor.execute(
+        f"UPDATE {views} SET {quote(JobView._meta.get_field('user_agent').column)} = {agents}.{quote('id')} "
+        f"FROM {agents} WHERE {agents}.{quote('user_agent')} = {views}.{quote('user_agent_text')}"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_job_view_created_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserAgent',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('digest', models.CharField(max_length=64, unique=True)),
+                ('user_agent', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'user_agents',
+            },
+        ),
+        migrations.RenameField(
+            model_name='jobview',
+            old_name='user_agent',
+            new_name='user_agent_text',
+        ),
+        migrations.AddField(
+            model_name='jobview',
+            name='user_agent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, to='jobs.useragent'),
+        ),
+        migrations.RunPython(intern_user_agents, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='jobview',
+            name='user_agent_text',
+        ),
+        migrations.AddIndex(
+            model_name='jobview',
+            index=models.Index(fields=['created_at'], name='job_views_created_idx'),
+        ),
+        migrations.CreateModel(
+            name='JobViewDaily',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('day', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('unique_users', models.PositiveIntegerField(default=0)),
+                ('unique_ips', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_views', to='jobs.job')),
+            ],
+            options={
+                'db_table': 'job_view_daily',
+                'indexes': [models.Index(fields=['day'], name='job_view_daily_day_idx')],
+                'unique_together': {('job', 'day')},
+            },
+        ),
+    ]
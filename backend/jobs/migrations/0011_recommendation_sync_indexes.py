@@ -0,0 +1,21 @@
+# Generated by Django 4.2.23 on 2026-10-17 21:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_job_view_rollups'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['updated_at'], name='jobs_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(fields=['version'], name='job_listings_version_idx'),
+        ),
+    ]
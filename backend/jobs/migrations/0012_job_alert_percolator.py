@@ -0,0 +1,82 @@
+# Generated by Django 4.2.23 on 2026-10-17 21:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import hashlib
+import re
+import uuid
+
+
+# A frozen copy of jobs.percolator.alert_slot as of this migration
+def alert_slot(alert):
+    tokens = {
+        token for token in re.findall(r'\w+', (alert.keywords or '').casefold())
+        if 2 <= len(token) <= 50
+    }
+    location = (alert.location or '').strip().casefold() or None
+    values = (alert.category_id, alert.job_type, alert.experience_level, location)
+    raw = '|'.join(str(value) if value else '*' for value in values)
+    anchor = max(tokens, key=lambda token: (len(token), token)) if tokens else ''
+    return hashlib.md5(raw.encode()).hexdigest(), anchor
+
+
+def file_alerts(apps, schema_editor):
+    JobAlert = apps.get_model('jobs', 'JobAlert')
+    for alert in JobAlert.objects.iterator():
+        alert.match_key, alert.anchor_token = alert_slot(alert)
+        alert.save(update_fields=['match_key', 'anchor_token'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_recommendation_sync_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobAlertMatch',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('delivered_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'job_alert_matches',
+            },
+        ),
+        migrations.AddField(
+            model_name='jobalert',
+            name='anchor_token',
+            field=models.CharField(blank=True, default='', editable=False, max_length=50),
+        ),
+        migrations.AddField(
+            model_name='jobalert',
+            name='match_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=32),
+        ),
+        migrations.AddIndex(
+            model_name='jobalert',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['match_key', 'anchor_token'], name='job_alerts_slot_idx'),
+        ),
+        migrations.RunPython(file_alerts, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='jobalertmatch',
+            name='alert',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matches', to='jobs.jobalert'),
+        ),
+        migrations.AddField(
+            model_name='jobalertmatch',
+            name='job',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alert_matches', to='jobs.job'),
+        ),
+        migrations.AddIndex(
+            model_name='jobalertmatch',
+            index=models.Index(condition=models.Q(('delivered_at__isnull', True)), fields=['alert', 'created_at'], name='job_alert_matches_pending_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='jobalertmatch',
+            unique_together={('alert', 'job')},
+        ),
+    ]
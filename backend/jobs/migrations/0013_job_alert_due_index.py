@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-17 21:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_job_alert_percolator'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobalert',
+            index=models.Index(fields=['is_active', 'frequency', 'last_sent'], name='job_alerts_due_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.23 on 2026-10-17 21:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0013_job_alert_due_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSignature',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='jobs.job')),
+                ('signature', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'job_signatures',
+            },
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='duplicate_cluster',
+            field=models.UUIDField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='JobSignatureBucket',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('bucket', models.BigIntegerField()),
+                ('signature', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='buckets', to='jobs.jobsignature')),
+            ],
+            options={
+                'db_table': 'job_signature_buckets',
+                'indexes': [models.Index(fields=['bucket'], name='job_signature_buckets_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,79 @@
+"""
+MinHash signatures of word 3-gram shingles, and LSH band buckets over them. Only NumPy and
+the standard library, so the signature workers of cluster_duplicate_jobs import it cheaply.
+"""
+import re
+import zlib
+
+import numpy as np
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+SHINGLE_SIZE = 3
+# Jobs at similarity s share a bucket with probability 1 - (1 - s**ROWS)**BANDS:
+# 99.8% at s = 0.8, 0.8% at s = 0.3
+BANDS = 20
+ROWS = 6
+NUM_PERM = BANDS * ROWS
+
+# Largest prime below 2**32: hash values fit in uint32, and a * x + b stays below 2**64
+PRIME = np.uint64(4294967291)
+
+_rng = np.random.default_rng(20240601)
+_A = _rng.integers(1, int(PRIME), size=(NUM_PERM, 1), dtype=np.uint64)
+_B = _rng.integers(0, int(PRIME), size=(NUM_PERM, 1), dtype=np.uint64)
+_BAND_MIX = _rng.integers(1, 2 ** 63, size=(BANDS, ROWS), dtype=np.uint64) | np.uint64(1)
+
+# Multipliers that fold a 3-gram of token hashes into one 32-bit shingle hash
+_MIX = np.array([0x9E3779B1, 0x85EBCA77, 0xC2B2AE3D], dtype=np.uint64)
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+
+def shingles(text):
+    """Unique 32-bit hashes of the word 3-grams of `text` (one shingle if shorter)."""
+    tokens = TOKEN_RE.findall((text or '').casefold())
+    if not tokens:
+        return np.empty(0, dtype=np.uint64)
+    hashes = np.fromiter((zlib.crc32(token.encode()) for token in tokens), dtype=np.uint64, count=len(tokens))
+    if len(hashes) < SHINGLE_SIZE:
+        hashes = np.pad(hashes, (0, SHINGLE_SIZE - len(hashes)))
+    grams = np.lib.stride_tricks.sliding_window_view(hashes, SHINGLE_SIZE)
+    return np.unique((grams * _MIX).sum(axis=1) & _MASK32)
+
+
+def signature(text):
+    """uint32 MinHash signature of `text`, or None when it has no words."""
+    values = shingles(text)
+    if not len(values):
+        return None
+    return ((_A * values + _B) % PRIME).min(axis=1).astype(np.uint32)
+
+
+def band_buckets(signatures):
+    """
+    (n, BANDS) int64 buckets for an (n, NUM_PERM) array of signatures, or
+    (BANDS,) for a single one. Each band is a random linear hash of its rows,
+    with separate multipliers per band, and wraps to fit a BigIntegerField.
+    """
+    signatures = np.asarray(signatures)
+    rows = signatures.astype(np.uint64).reshape(-1, BANDS, ROWS)
+    buckets = (rows * _BAND_MIX).sum(axis=2).view(np.int64)
+    return buckets[0] if signatures.ndim == 1 else buckets
+
+
+def similarity(sig, others):
+    """Estimated Jaccard similarity of `sig` to each row of `others`."""
+    return (np.asarray(others) == sig).mean(axis=-1)
+
+
+def to_bytes(sig):
+    return sig.astype('<u4').tobytes()
+
+
+def from_bytes(data):
+    return np.frombuffer(bytes(data), dtype='<u4')
+
+
+def signatures_for_rows(rows):
+    """[(pk, signature bytes or None), ...] for (pk, text) rows; used by pool workers."""
+    return [(pk, None if (sig := signature(text)) is None else to_bytes(sig)) for pk, text in rows]
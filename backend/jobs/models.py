@@ -1,6 +1,11 @@
 from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.db.models import F, Q
+from django.db.models.functions import Upper
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
 from users.models import User, JobPosterProfile, Skill
+import hashlib
 import uuid
 
 class JobCategory(models.Model):
@@ -10,6 +15,7 @@ class JobCategory(models.Model):
     icon = models.CharField(max_length=50, blank=True, null=True)  # For Material-UI icons
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return self.name
@@ -19,6 +25,40 @@ class JobCategory(models.Model):
         ordering = ['name']
 
 
+class PincodeLocation(models.Model):
+    """Reference coordinates per pincode, loaded with `manage.py load_pincodes`."""
+    pincode = models.CharField(max_length=10, primary_key=True)
+    place_name = models.CharField(max_length=100, blank=True)
+    city = models.CharField(max_length=50)
+    state = models.CharField(max_length=50)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    
+    def __str__(self):
+        return f"{self.pincode} - {self.place_name or self.city}"
+    
+    @classmethod
+    def lookup(cls, pincode=None, city=None, state=None):
+        """Best known (latitude, longitude) for a pincode, falling back to the city."""
+        if pincode:
+            coordinates = cls.objects.filter(pincode=pincode.strip()).values_list('latitude', 'longitude').first()
+            if coordinates:
+                return coordinates
+        if city:
+            candidates = cls.objects.annotate(city_upper=Upper('city')).filter(city_upper=city.strip().upper())
+            if state:
+                candidates = candidates.filter(state__iexact=state.strip())
+            # The lowest pincode of a city is its head post office
+            return candidates.order_by('pincode').values_list('latitude', 'longitude').first()
+        return None
+    
+    class Meta:
+        db_table = 'pincode_locations'
+        indexes = [
+            models.Index(Upper('city'), 'pincode', name='pincode_locations_city_idx'),
+        ]
+
+
 class Job(models.Model):
     JOB_TYPES = (
         ('full_time', 'Full Time'),
@@ -69,12 +109,18 @@ class Job(models.Model):
     state = models.CharField(max_length=50)
     pincode = models.CharField(max_length=10, blank=True, null=True)
     is_remote = models.BooleanField(default=False)
+    latitude = models.FloatField(blank=True, null=True)
+    longitude = models.FloatField(blank=True, null=True)
+    geohash = models.CharField(max_length=12, blank=True, null=True, db_index=True)
     
     # Salary
     salary_min = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
     salary_max = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
     salary_type = models.CharField(max_length=10, choices=SALARY_TYPES, default='monthly')
     salary_negotiable = models.BooleanField(default=False)
+    # Monthly equivalents in paise, kept in sync on save (see jobs.salary)
+    salary_min_monthly = models.BigIntegerField(blank=True, null=True, editable=False)
+    salary_max_monthly = models.BigIntegerField(blank=True, null=True, editable=False)
     
     # Requirements
     requirements = models.TextField(blank=True, null=True)
@@ -95,6 +141,12 @@ class Job(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     published_at = models.DateTimeField(blank=True, null=True)
     
+    # Full-text search (maintained by jobs.search; only populated on PostgreSQL)
+    search_vector = SearchVectorField(blank=True, null=True, editable=False)
+    
+    # Near-duplicate cluster: the id of the cluster's earliest posting (see jobs.duplicates)
+    duplicate_cluster = models.UUIDField(blank=True, null=True, db_index=True, editable=False)
+    
     def __str__(self):
         return f"{self.title} - {self.company.company_name}"
     
@@ -102,11 +154,84 @@ class Job(models.Model):
         if self.status == 'active' and not self.published_at:
             from django.utils import timezone
             self.published_at = timezone.now()
+            # Picked up by the post_save signal that percolates job alerts
+            self._just_published = True
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or set(update_fields) & {'pincode', 'city', 'state'}:
+            self.update_coordinates()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'latitude', 'longitude', 'geohash'}
+        if update_fields is None or set(update_fields) & {'salary_min', 'salary_max', 'salary_type'}:
+            self.update_normalized_salary()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'salary_min_monthly', 'salary_max_monthly'}
         super().save(*args, **kwargs)
     
+    def update_normalized_salary(self):
+        from .salary import monthly_minor_units
+        self.salary_min_monthly = monthly_minor_units(self.salary_min, self.salary_type)
+        self.salary_max_monthly = monthly_minor_units(self.salary_max, self.salary_type)
+    
+    def update_coordinates(self):
+        from .geo import encode_geohash
+        coordinates = PincodeLocation.lookup(self.pincode, self.city, self.state)
+        if coordinates:
+            self.latitude, self.longitude = coordinates
+            self.geohash = encode_geohash(*coordinates)
+        else:
+            self.latitude = self.longitude = self.geohash = None
+    
     class Meta:
         db_table = 'jobs'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-created_at', '-id'], name='jobs_status_created_idx'),
+            models.Index(fields=['updated_at'], name='jobs_updated_idx'),
+            # Partial indexes for the public listing, which only ever shows active jobs
+            # and pages through them by (created_at, id)
+            models.Index(
+                fields=['-created_at', '-id'], name='jobs_active_created_idx',
+                condition=Q(status='active'),
+            ),
+            models.Index(
+                fields=['category', '-created_at', '-id'], name='jobs_active_category_idx',
+                condition=Q(status='active'),
+            ),
+            models.Index(
+                fields=['job_type', '-created_at', '-id'], name='jobs_active_type_idx',
+                condition=Q(status='active'),
+            ),
+            models.Index(
+                fields=['experience_level', '-created_at', '-id'], name='jobs_active_experience_idx',
+                condition=Q(status='active'),
+            ),
+            models.Index(
+                fields=['category', 'job_type', 'experience_level'], name='jobs_active_cat_type_exp_idx',
+                condition=Q(status='active'),
+            ),
+            models.Index(
+                fields=['-created_at', '-id'], name='jobs_active_remote_idx',
+                condition=Q(status='active', is_remote=True),
+            ),
+            # The location filter matches city/state case-insensitively
+            models.Index(
+                Upper('city'), F('created_at').desc(), name='jobs_active_city_idx',
+                condition=Q(status='active'),
+            ),
+            models.Index(
+                Upper('state'), F('created_at').desc(), name='jobs_active_state_idx',
+                condition=Q(status='active'),
+            ),
+            models.Index(fields=['pincode'], name='jobs_active_pincode_idx', condition=Q(status='active')),
+            models.Index(
+                fields=['-salary_max_monthly', '-id'], name='jobs_active_salary_idx',
+                condition=Q(status='active'),
+            ),
+            models.Index(
+                fields=['salary_min_monthly'], name='jobs_active_salary_min_idx',
+                condition=Q(status='active'),
+            ),
+        ]
 
 
 class JobSkillRequirement(models.Model):
@@ -131,6 +256,87 @@ class JobSkillRequirement(models.Model):
         unique_together = ['job', 'skill']
 
 
+class JobListing(models.Model):
+    """
+    Flattened job card for the public listing: one row per active job holding
+    the card fields plus the filter columns, so a listing page is a single
+    indexed scan without joins. Maintained by jobs.listing from model signals;
+    `manage.py rebuild_job_listings` regenerates it from scratch.
+    """
+    id = models.UUIDField(primary_key=True)  # Same as Job.id
+    title = models.CharField(max_length=200)
+    
+    # Category
+    category_id = models.UUIDField()
+    category_name = models.CharField(max_length=100)
+    category_icon = models.CharField(max_length=50, blank=True, null=True)
+    
+    # Company and poster
+    company_id = models.UUIDField()
+    company_name = models.CharField(max_length=100)
+    company_logo = models.CharField(max_length=100, blank=True, null=True)
+    is_company_verified = models.BooleanField(default=False)
+    posted_by_id = models.UUIDField()
+    posted_by_name = models.CharField(max_length=301, blank=True)
+    
+    # Job details and filter columns (same names as on Job, so jobs.filters applies to both)
+    job_type = models.CharField(max_length=20, choices=Job.JOB_TYPES)
+    experience_level = models.CharField(max_length=10, choices=Job.EXPERIENCE_LEVELS)
+    location = models.CharField(max_length=200)
+    city = models.CharField(max_length=50)
+    state = models.CharField(max_length=50)
+    pincode = models.CharField(max_length=10, blank=True, null=True)
+    is_remote = models.BooleanField(default=False)
+    latitude = models.FloatField(blank=True, null=True)
+    longitude = models.FloatField(blank=True, null=True)
+    geohash = models.CharField(max_length=12, blank=True, null=True, db_index=True)
+    salary_min = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    salary_max = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    salary_type = models.CharField(max_length=10, choices=Job.SALARY_TYPES)
+    salary_negotiable = models.BooleanField(default=False)
+    salary_min_monthly = models.BigIntegerField(blank=True, null=True)
+    salary_max_monthly = models.BigIntegerField(blank=True, null=True)
+    is_featured = models.BooleanField(default=False)
+    application_deadline = models.DateTimeField(blank=True, null=True)
+    
+    # [{"id", "name", "requirement_level"}, ...]
+    skills = models.JSONField(default=list)
+    
+    created_at = models.DateTimeField()
+    published_at = models.DateTimeField(blank=True, null=True)
+    
+    # Set to the current time in microseconds whenever the job or anything it embeds
+    # changes; cached payload fragments are keyed by it (see jobs.fragments)
+    version = models.BigIntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.title} - {self.company_name}"
+    
+    class Meta:
+        db_table = 'job_listings'
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='job_listings_created_idx'),
+            models.Index(fields=['category_id', '-created_at', '-id'], name='job_listings_category_idx'),
+            models.Index(fields=['job_type', '-created_at', '-id'], name='job_listings_type_idx'),
+            models.Index(fields=['experience_level', '-created_at', '-id'], name='job_listings_experience_idx'),
+            models.Index(
+                fields=['category_id', 'job_type', 'experience_level'], name='job_listings_cat_type_exp_idx',
+            ),
+            models.Index(
+                fields=['-created_at', '-id'], name='job_listings_remote_idx', condition=Q(is_remote=True),
+            ),
+            models.Index(Upper('city'), F('created_at').desc(), name='job_listings_city_idx'),
+            models.Index(Upper('state'), F('created_at').desc(), name='job_listings_state_idx'),
+            models.Index(fields=['pincode'], name='job_listings_pincode_idx'),
+            models.Index(fields=['-salary_max_monthly', '-id'], name='job_listings_salary_idx'),
+            models.Index(fields=['salary_min_monthly'], name='job_listings_salary_min_idx'),
+            models.Index(fields=['company_id'], name='job_listings_company_idx'),
+            models.Index(fields=['posted_by_id'], name='job_listings_posted_by_idx'),
+            # Lets in-memory indexes such as the recommender catch up on recent changes
+            models.Index(fields=['version'], name='job_listings_version_idx'),
+        ]
+
+
 class JobBookmark(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='bookmarked_jobs')
@@ -145,19 +351,99 @@ class JobBookmark(models.Model):
         unique_together = ['user', 'job']
 
 
+class UserAgent(models.Model):
+    """Interned user agent strings, so each view row stores a key instead of the text."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    digest = models.CharField(max_length=64, unique=True)
+    user_agent = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return self.user_agent[:80]
+    
+    @staticmethod
+    def digest_for(user_agent):
+        return hashlib.sha256(user_agent.encode()).hexdigest()
+    
+    @classmethod
+    def intern(cls, user_agents):
+        """{user agent: UserAgent pk} for the given strings, creating missing rows."""
+        digests = {cls.digest_for(user_agent): user_agent for user_agent in set(user_agents) if user_agent}
+        if not digests:
+            return {}
+        known = dict(cls.objects.filter(digest__in=list(digests)).values_list('digest', 'pk'))
+        missing = [cls(digest=digest, user_agent=digests[digest]) for digest in digests if digest not in known]
+        if missing:
+            cls.objects.bulk_create(missing, ignore_conflicts=True)
+            known = dict(cls.objects.filter(digest__in=list(digests)).values_list('digest', 'pk'))
+        return {user_agent: known[digest] for digest, user_agent in digests.items()}
+    
+    class Meta:
+        db_table = 'user_agents'
+
+
 class JobView(models.Model):
+    """Raw views, kept for JOB_VIEW_RETENTION_DAYS and rolled up into JobViewDaily."""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='job_views')
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
     ip_address = models.GenericIPAddressField()
-    user_agent = models.TextField(blank=True, null=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    user_agent = models.ForeignKey(UserAgent, on_delete=models.PROTECT, null=True, blank=True)
+    # Not auto_now_add: spooled views are inserted later with the time they happened
+    created_at = models.DateTimeField(default=timezone.now)
     
     def __str__(self):
         return f"View for {self.job.title}"
     
     class Meta:
         db_table = 'job_views'
+        indexes = [
+            models.Index(fields=['created_at'], name='job_views_created_idx'),
+        ]
+
+
+class JobViewDaily(models.Model):
+    """Per-job, per-day view totals; what employer analytics read."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='daily_views')
+    day = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    unique_users = models.PositiveIntegerField(default=0)
+    unique_ips = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.job_id} on {self.day}: {self.views} views"
+    
+    class Meta:
+        db_table = 'job_view_daily'
+        unique_together = ['job', 'day']
+        indexes = [
+            models.Index(fields=['day'], name='job_view_daily_day_idx'),
+        ]
+
+
+class JobSignature(models.Model):
+    """MinHash signature of a job's text; its LSH buckets are JobSignatureBucket rows."""
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name='signature')
+    signature = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'job_signatures'
+
+
+class JobSignatureBucket(models.Model):
+    # Twenty rows per job and never addressed by id, so a compact integer key
+    id = models.BigAutoField(primary_key=True)
+    signature = models.ForeignKey(JobSignature, on_delete=models.CASCADE, related_name='buckets')
+    bucket = models.BigIntegerField()
+    
+    class Meta:
+        db_table = 'job_signature_buckets'
+        indexes = [
+            models.Index(fields=['bucket'], name='job_signature_buckets_idx'),
+        ]
 
 
 class JobAlert(models.Model):
@@ -167,6 +453,9 @@ class JobAlert(models.Model):
         ('weekly', 'Weekly'),
     )
     
+    # Saving any of these moves the alert to another percolator slot
+    CRITERIA_FIELDS = ('keywords', 'location', 'category', 'job_type', 'experience_level')
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='job_alerts')
     title = models.CharField(max_length=100)
@@ -179,14 +468,55 @@ class JobAlert(models.Model):
     frequency = models.CharField(max_length=10, choices=ALERT_FREQUENCIES, default='daily')
     is_active = models.BooleanField(default=True)
     last_sent = models.DateTimeField(null=True, blank=True)
+    # Percolator slot (see jobs.percolator), derived from the criteria on save
+    match_key = models.CharField(max_length=32, blank=True, default='', editable=False)
+    anchor_token = models.CharField(max_length=50, blank=True, default='', editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.user.email} - {self.title}"
     
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or set(update_fields) & set(self.CRITERIA_FIELDS):
+            self.update_match_slot()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'match_key', 'anchor_token'}
+        super().save(*args, **kwargs)
+    
+    def update_match_slot(self):
+        from .percolator import alert_slot
+        self.match_key, self.anchor_token = alert_slot(self)
+    
     class Meta:
         db_table = 'job_alerts'
+        indexes = [
+            models.Index(
+                fields=['match_key', 'anchor_token'], name='job_alerts_slot_idx',
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(fields=['is_active', 'frequency', 'last_sent'], name='job_alerts_due_idx'),
+        ]
+
+
+class JobAlertMatch(models.Model):
+    """A published job that satisfied an alert, waiting to be delivered."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    alert = models.ForeignKey(JobAlert, on_delete=models.CASCADE, related_name='matches')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='alert_matches')
+    created_at = models.DateTimeField(default=timezone.now)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'job_alert_matches'
+        unique_together = ['alert', 'job']
+        indexes = [
+            models.Index(
+                fields=['alert', 'created_at'], name='job_alert_matches_pending_idx',
+                condition=models.Q(delivered_at__isnull=True),
+            ),
+        ]
 
 
 class JobReport(models.Model):
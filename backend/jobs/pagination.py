@@ -0,0 +1,156 @@
+import binascii
+import uuid
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class JobCursorPagination(BasePagination):
+    """
+    Keyset pagination over (created_at, id), or over whatever
+    (position field, id) pair the view sets as `cursor_ordering`.
+
+    Each page is a single indexed range scan, so deep pages cost the same as the
+    first one. The cursor is an opaque token holding the position of the last
+    (or, for `previous`, the first) row on the page. The total count is read
+    from the cache; it is only computed on a miss for the first page, deeper
+    pages return `null` instead of running COUNT(*).
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self):
+        self.page_size = api_settings.PAGE_SIZE or 20
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.position_field, self.descending = self.get_position_field(view)
+        position = self.decode_cursor(request)
+        self.count = self.get_count(queryset, view, first_page=position is None)
+
+        reverse = position is not None and position[0]
+        if reverse:
+            queryset = queryset.order_by(*self.build_ordering(not self.descending))
+        else:
+            queryset = queryset.order_by(*self.build_ordering(self.descending))
+        if position is not None:
+            _, value, pk = position
+            lookup = 'lt' if self.descending != reverse else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{self.position_field}__{lookup}': value}) |
+                Q(**{self.position_field: value, f'id__{lookup}': pk})
+            )
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.page = results
+        return results
+
+    def get_position_field(self, view):
+        ordering = getattr(view, 'cursor_ordering', None) or self.ordering
+        return ordering[0].lstrip('-'), ordering[0].startswith('-')
+
+    def build_ordering(self, descending):
+        prefix = '-' if descending else ''
+        return (f'{prefix}{self.position_field}', f'{prefix}id')
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_count(self, queryset, view, first_page):
+        filters_key = getattr(view, 'filters_key', None)
+        if filters_key is None:
+            return None
+        cache_key = f'jobs:count:{filters_key}'
+        count = cache.get(cache_key)
+        if count is None and first_page:
+            count = queryset.count()
+            cache.set(cache_key, count, getattr(settings, 'JOB_COUNT_CACHE_TIMEOUT', 60))
+        return count
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            decoded = urlsafe_b64decode(encoded.encode('ascii')).decode('ascii')
+            reverse, kind, value, pk = decoded.split('|')
+            value = {'d': parse_datetime, 'i': int, 'f': float}[kind](value)
+            pk = uuid.UUID(pk)
+        except (KeyError, TypeError, ValueError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if value is None:
+            raise NotFound(self.invalid_cursor_message)
+        return reverse == '1', value, pk
+
+    def encode_cursor(self, job, reverse):
+        value = getattr(job, self.position_field)
+        if isinstance(value, datetime):
+            kind, value = 'd', value.isoformat()
+        elif isinstance(value, int):
+            kind = 'i'
+        else:
+            kind, value = 'f', repr(float(value))
+        raw = f'{int(reverse)}|{kind}|{value}|{job.pk.hex}'
+        token = urlsafe_b64encode(raw.encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_envelope(self):
+        return {
+            'count': self.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+        }
+
+    def get_paginated_response(self, data):
+        return Response({**self.get_paginated_envelope(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'count': {'type': 'integer', 'nullable': True},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,148 @@
+"""
+Reverse-index ("percolator") matching of published jobs against JobAlerts: each alert
+is filed under one (match_key, anchor_token) slot, and a job looks up only the slots it fills.
+"""
+import hashlib
+import itertools
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Job, JobAlert, JobAlertMatch
+from .salary import MINOR_UNITS, to_minor_units
+from .search import SEARCH_FIELDS, TOKEN_RE
+
+WILDCARD = '*'
+
+MIN_TOKEN_LENGTH = 2
+
+# Must fit JobAlert.anchor_token
+MAX_TOKEN_LENGTH = 50
+
+# Job columns percolation needs
+JOB_FIELDS = (
+    'id', 'category_id', 'job_type', 'experience_level', 'city', 'state', 'pincode',
+    'salary_max_monthly', *SEARCH_FIELDS,
+)
+
+
+def tokenize(text):
+    return {
+        token for token in TOKEN_RE.findall((text or '').casefold())
+        if MIN_TOKEN_LENGTH <= len(token) <= MAX_TOKEN_LENGTH
+    }
+
+
+def normalize_location(value):
+    value = (value or '').strip().casefold()
+    return value or None
+
+
+def slot_key(category_id, job_type, experience_level, location):
+    values = (category_id, job_type, experience_level, location)
+    raw = '|'.join(str(value) if value else WILDCARD for value in values)
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def anchor_for(tokens):
+    return max(tokens, key=lambda token: (len(token), token)) if tokens else ''
+
+
+def alert_slot(alert):
+    """(match_key, anchor_token) an alert is filed under."""
+    key = slot_key(
+        alert.category_id, alert.job_type, alert.experience_level, normalize_location(alert.location),
+    )
+    return key, anchor_for(tokenize(alert.keywords))
+
+
+def job_keys(job):
+    """Every slot key an alert matching `job` can be filed under."""
+    locations = {normalize_location(job.city), normalize_location(job.state), normalize_location(job.pincode)}
+    return {
+        slot_key(*values)
+        for values in itertools.product(
+            (job.category_id, None), (job.job_type, None), (job.experience_level, None),
+            locations | {None},
+        )
+    }
+
+
+def job_tokens(job):
+    tokens = set()
+    for field in SEARCH_FIELDS:
+        tokens |= tokenize(getattr(job, field))
+    return tokens
+
+
+def verify(keywords, salary_min, job, tokens):
+    """Check the criteria the slot lookup doesn't cover."""
+    if keywords and not tokenize(keywords) <= tokens:
+        return False
+    if salary_min is not None:
+        # Same rule as the salary_min listing filter: the job must be able to pay it
+        if job.salary_max_monthly is None or job.salary_max_monthly < to_minor_units(salary_min):
+            return False
+    return True
+
+
+def candidate_alerts(keys, tokens, salary_max_monthly=None):
+    """
+    (id, keywords, salary_min, match_key, anchor_token) rows of the alerts filed
+    under `keys` and anchored on one of `tokens`; alerts asking for more than
+    `salary_max_monthly` (paise) are left out up front.
+    """
+    salary = Q(salary_min__isnull=True)
+    if salary_max_monthly is not None:
+        salary |= Q(salary_min__lte=Decimal(salary_max_monthly) / MINOR_UNITS)
+    return (
+        JobAlert.objects.filter(salary, is_active=True, match_key__in=keys, anchor_token__in=[''] + sorted(tokens))
+        .values_list('id', 'keywords', 'salary_min', 'match_key', 'anchor_token')
+    )
+
+
+def match_jobs(jobs):
+    """[(alert_id, job), ...] for `jobs`, looked up with one alert query."""
+    if not jobs:
+        return []
+    jobs_by_key = {}
+    tokens_by_job = {}
+    for job in jobs:
+        tokens_by_job[job.pk] = job_tokens(job)
+        for key in job_keys(job):
+            jobs_by_key.setdefault(key, []).append(job)
+    all_tokens = set().union(*tokens_by_job.values())
+    salaries = [job.salary_max_monthly for job in jobs if job.salary_max_monthly is not None]
+
+    matches = []
+    candidates = candidate_alerts(list(jobs_by_key), all_tokens, max(salaries, default=None))
+    for alert_id, keywords, salary_min, key, anchor in candidates:
+        for job in jobs_by_key[key]:
+            tokens = tokens_by_job[job.pk]
+            if anchor and anchor not in tokens:
+                continue
+            if verify(keywords, salary_min, job, tokens):
+                matches.append((alert_id, job))
+    return matches
+
+
+def percolate(job_ids, batch_size=200):
+    """Record the alert matches of active jobs, in batches; returns how many matched."""
+    job_ids = list(job_ids)
+    matched = 0
+    for start in range(0, len(job_ids), batch_size):
+        jobs = list(
+            Job.objects.filter(pk__in=job_ids[start:start + batch_size], status='active')
+            .only(*JOB_FIELDS)
+        )
+        matches = [JobAlertMatch(alert_id=alert_id, job=job) for alert_id, job in match_jobs(jobs)]
+        # Re-percolating a job (e.g. a repeated import) leaves existing matches alone
+        JobAlertMatch.objects.bulk_create(matches, ignore_conflicts=True)
+        matched += len(matches)
+    return matched
+
+
+def job_published(job_id):
+    """Percolate a newly published job once its transaction commits."""
+    transaction.on_commit(lambda: percolate([job_id]))
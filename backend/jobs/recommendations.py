@@ -0,0 +1,409 @@
+"""Skill-match job recommendations scored over an in-memory sparse index, kept in sync from JobListing."""
+import logging
+import threading
+import time
+from collections import namedtuple
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+from scipy import sparse
+
+from users.models import JobSeekerSkill
+from .models import Job, JobListing, JobSkillRequirement, PincodeLocation
+
+# How much each part contributes to the final score
+SCORE_WEIGHTS = {'skills': 0.5, 'experience': 0.15, 'salary': 0.15, 'location': 0.2}
+
+REQUIREMENT_WEIGHTS = {'required': 1.0, 'preferred': 0.6, 'nice_to_have': 0.3}
+PROFICIENCY_FACTORS = {'beginner': 0.4, 'intermediate': 0.7, 'advanced': 0.9, 'expert': 1.0}
+# Credit kept for a matched skill when the seeker has fewer years than the job asks for
+YEARS_SHORT_FACTOR = 0.5
+
+EXPERIENCE_RANKS = {'entry': 0, 'mid': 1, 'senior': 2, 'expert': 3}
+# Fit by (job rank - seeker rank), from -3 (overqualified) to +3 (underqualified)
+EXPERIENCE_FIT = np.array([0.3, 0.6, 1.0, 1.0, 0.5, 0.1, 0.0])
+
+# Distance at which location fit drops to 1/e
+LOCATION_SCALE_KM = 25.0
+EARTH_RADIUS_KM = 6371.0
+SAME_CITY_FIT, SAME_STATE_FIT, ELSEWHERE_FIT = 1.0, 0.6, 0.2
+# Used when the job or the seeker doesn't say
+NEUTRAL_FIT = 0.5
+
+COMPACT_THRESHOLD = 5000
+LOAD_BATCH_SIZE = 5000
+# Re-read changes this far back on each sync, for transactions that committed late
+SYNC_OVERLAP = timedelta(seconds=60)
+
+logger = logging.getLogger(__name__)
+
+JobVector = namedtuple('JobVector', 'id exp_rank salary_max lat lng remote city state skills')
+SeekerVector = namedtuple('SeekerVector', 'cols proficiency years exp_rank salary_min lat lng city state')
+
+
+class Segment:
+    """An immutable block of job rows and their sparse skill requirements."""
+
+    def __init__(self, ids, attrs, entry_row, entry_col, weight, min_years, n_cols):
+        self.ids = ids
+        self.attrs = attrs
+        self.entry_row, self.entry_col = entry_row, entry_col
+        self.weight, self.min_years = weight, min_years
+        self.n_cols = n_cols
+        self.total_weight = np.bincount(entry_row, weights=weight, minlength=len(ids))
+        # Entry numbers (offset by one, so none is a zero) rather than values, so one
+        # matrix serves both the weight and the minimum years of each requirement
+        self.matrix = sparse.csc_matrix(
+            (np.arange(1, len(entry_row) + 1, dtype=np.float64), (entry_row, entry_col)),
+            shape=(len(ids), n_cols),
+        )
+        self.alive = np.ones(len(ids), dtype=bool)
+        self.dead = 0
+
+        # Per-job terms that don't depend on the seeker, precomputed in float32
+        n = len(ids)
+        self.skill_scale = np.divide(
+            1.0, self.total_weight, out=np.zeros(n), where=self.total_weight > 0,
+        ).astype(np.float32)
+        self.has_skills = self.total_weight > 0
+        self.exp_rank = attrs['exp_rank'].astype(np.intp)
+        self.salary_known = ~np.isnan(attrs['salary_max'])
+        self.salary_max = np.nan_to_num(attrs['salary_max']).astype(np.float32)
+        self.located = ~np.isnan(attrs['lat'])
+        self.lat_rad = np.radians(np.nan_to_num(attrs['lat'])).astype(np.float32)
+        self.lng_rad = np.radians(np.nan_to_num(attrs['lng'])).astype(np.float32)
+        self.cos_lat = np.cos(self.lat_rad)
+
+    def kill(self, row):
+        if self.alive[row]:
+            self.alive[row] = False
+            self.dead += 1
+
+    @classmethod
+    def from_vectors(cls, vectors, n_cols):
+        entries = [(row, col, weight, years) for row, vector in enumerate(vectors) for col, weight, years in vector.skills]
+        entry_row, entry_col, weight, min_years = (np.array(column) for column in zip(*entries)) if entries else (
+            np.array([], dtype=np.int64), np.array([], dtype=np.int64), np.array([]), np.array([]),
+        )
+        attrs = {
+            'exp_rank': np.array([vector.exp_rank for vector in vectors], dtype=np.int8),
+            'salary_max': np.array([vector.salary_max for vector in vectors], dtype=np.float64),
+            'lat': np.array([vector.lat for vector in vectors], dtype=np.float64),
+            'lng': np.array([vector.lng for vector in vectors], dtype=np.float64),
+            'remote': np.array([vector.remote for vector in vectors], dtype=bool),
+            'city': np.array([vector.city for vector in vectors], dtype=np.int32),
+            'state': np.array([vector.state for vector in vectors], dtype=np.int32),
+        }
+        ids = np.array([vector.id for vector in vectors], dtype=object)
+        return cls(ids, attrs, entry_row.astype(np.int64), entry_col.astype(np.int64),
+                   weight.astype(np.float64), min_years.astype(np.float64), n_cols)
+
+    @classmethod
+    def merge(cls, base, pending, n_cols):
+        """The live rows of `base` followed by those of `pending`."""
+        parts = [segment.live() for segment in (base, pending)]
+        offset = len(parts[0][0])
+        return cls(
+            np.concatenate([parts[0][0], parts[1][0]]),
+            {name: np.concatenate([parts[0][1][name], parts[1][1][name]]) for name in base.attrs},
+            np.concatenate([parts[0][2], parts[1][2] + offset]),
+            np.concatenate([parts[0][3], parts[1][3]]),
+            np.concatenate([parts[0][4], parts[1][4]]),
+            np.concatenate([parts[0][5], parts[1][5]]),
+            n_cols,
+        )
+
+    def live(self):
+        new_row = np.cumsum(self.alive) - 1
+        keep = self.alive[self.entry_row]
+        return (
+            self.ids[self.alive],
+            {name: values[self.alive] for name, values in self.attrs.items()},
+            new_row[self.entry_row[keep]], self.entry_col[keep], self.weight[keep], self.min_years[keep],
+        )
+
+    def score(self, seeker):
+        """Scores for every row in one vectorized pass; tombstoned rows get -inf."""
+        total = self.skill_fit(seeker)
+        total *= SCORE_WEIGHTS['skills']
+        total += self.experience_fit(seeker)
+        total += self.salary_fit(seeker)
+        total += self.location_fit(seeker)
+        if self.dead:
+            total[~self.alive] = -np.inf
+        return total
+
+    def skill_fit(self, seeker):
+        n = len(self.ids)
+        matched = np.zeros(n, dtype=np.float32)
+        in_range = seeker.cols < self.n_cols
+        cols = seeker.cols[in_range]
+        if cols.size and self.entry_row.size:
+            sub = self.matrix[:, cols]
+            entry = sub.data.astype(np.intp) - 1
+            seeker_col = np.repeat(np.arange(cols.size), np.diff(sub.indptr))
+            years_ok = seeker.years[in_range][seeker_col] >= self.min_years[entry]
+            credit = self.weight[entry] * seeker.proficiency[in_range][seeker_col]
+            credit *= np.where(years_ok, 1.0, YEARS_SHORT_FACTOR)
+            # Only the jobs that share a skill with the seeker are touched
+            np.add.at(matched, sub.indices, credit.astype(np.float32))
+        matched *= self.skill_scale
+        # Jobs that list no skills neither gain nor lose on skills
+        matched[~self.has_skills] = NEUTRAL_FIT
+        return matched
+
+    def experience_fit(self, seeker):
+        # Only four job levels exist, so weight a four-entry table and gather from it
+        table = SCORE_WEIGHTS['experience'] * EXPERIENCE_FIT[np.arange(4) - seeker.exp_rank + 3]
+        return table.astype(np.float32)[self.exp_rank]
+
+    def salary_fit(self, seeker):
+        weight = SCORE_WEIGHTS['salary']
+        if not seeker.salary_min:
+            return np.float32(weight * NEUTRAL_FIT)
+        fit = np.minimum(self.salary_max * np.float32(1.0 / seeker.salary_min), np.float32(1.0))
+        fit *= fit
+        fit[~self.salary_known] = NEUTRAL_FIT
+        fit *= weight
+        return fit
+
+    def location_fit(self, seeker):
+        weight = SCORE_WEIGHTS['location']
+        n = len(self.ids)
+        if seeker.lat is None and seeker.city < 0 and seeker.state < 0:
+            fit = np.full(n, NEUTRAL_FIT, dtype=np.float32)
+        else:
+            fit = np.full(n, ELSEWHERE_FIT, dtype=np.float32)
+            # Unknown places (negative codes) never count as a match
+            if seeker.state >= 0:
+                fit[self.attrs['state'] == seeker.state] = SAME_STATE_FIT
+            if seeker.city >= 0:
+                fit[self.attrs['city'] == seeker.city] = SAME_CITY_FIT
+            if seeker.lat is not None:
+                decay = self.distance_km(seeker)
+                decay *= np.float32(-1.0 / LOCATION_SCALE_KM)
+                np.exp(decay, out=decay)
+                np.copyto(fit, decay, where=self.located)
+        fit[self.attrs['remote']] = 1.0
+        fit *= weight
+        return fit
+
+    def distance_km(self, seeker):
+        # Equirectangular approximation in float32, computed in place: within a fraction
+        # of a percent of haversine at the distances that still score, and much cheaper
+        lat, lng = np.float32(np.radians(seeker.lat)), np.float32(np.radians(seeker.lng))
+        dx = self.lng_rad - lng
+        dx *= self.cos_lat
+        dx *= dx
+        dy = self.lat_rad - lat
+        dy *= dy
+        dx += dy
+        np.sqrt(dx, out=dx)
+        dx *= np.float32(EARTH_RADIUS_KM)
+        return dx
+
+
+class RecommendationIndex:
+    """
+    Listed jobs as a base segment plus a small pending one. A changed job is
+    tombstoned in the base and reloaded into pending; the two are merged past
+    COMPACT_THRESHOLD. Changes from other processes arrive through sync().
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sync_lock = threading.Lock()
+        self.skill_cols = {}
+        self.places = {}
+        self.base = self.pending = None
+        self.pending_vectors = {}
+        self.rows = {}
+        self.synced_version = 0
+        self.synced_at = None
+        self.checked_at = 0.0
+
+    def place_code(self, name, create=True):
+        if not name:
+            return -1
+        key = name.strip().upper()
+        if create:
+            return self.places.setdefault(key, len(self.places))
+        return self.places.get(key, -2)
+
+    def skill_col(self, skill_id):
+        return self.skill_cols.setdefault(skill_id, len(self.skill_cols))
+
+    def build(self):
+        started = timezone.now()
+        vectors = list(self.load_vectors())
+        with self.lock:
+            self.base = Segment.from_vectors(vectors, len(self.skill_cols))
+            self.rows = {vector.id: row for row, vector in enumerate(vectors)}
+            self.pending_vectors = {}
+            self.pending = Segment.from_vectors([], len(self.skill_cols))
+            self.synced_version = JobListing.objects.aggregate(version=Max('version'))['version'] or 0
+            self.synced_at = started
+            self.checked_at = time.monotonic()
+
+    def load_vectors(self, job_ids=None):
+        listings = JobListing.objects.order_by('pk').values_list(
+            'pk', 'experience_level', 'salary_max_monthly', 'latitude', 'longitude', 'is_remote', 'city', 'state',
+        )
+        if job_ids is not None:
+            listings = listings.filter(pk__in=job_ids)
+        last_pk = None
+        while True:
+            batch_qs = listings if last_pk is None else listings.filter(pk__gt=last_pk)
+            batch = list(batch_qs[:LOAD_BATCH_SIZE])
+            if not batch:
+                return
+            skills = {row[0]: [] for row in batch}
+            requirements = JobSkillRequirement.objects.filter(job_id__in=list(skills)).values_list(
+                'job_id', 'skill_id', 'requirement_level', 'min_experience_years',
+            )
+            for job_id, skill_id, level, years in requirements:
+                skills[job_id].append((self.skill_col(skill_id), REQUIREMENT_WEIGHTS.get(level, 1.0), years))
+            for pk, level, salary_max, lat, lng, remote, city, state in batch:
+                yield JobVector(
+                    pk, EXPERIENCE_RANKS.get(level, 0),
+                    np.nan if salary_max is None else float(salary_max),
+                    np.nan if lat is None else lat, np.nan if lng is None else lng,
+                    remote, self.place_code(city), self.place_code(state), skills[pk],
+                )
+            last_pk = batch[-1][0]
+
+    def refresh(self, job_ids):
+        """Reload the given jobs; ones that are no longer listed are dropped."""
+        job_ids = set(job_ids)
+        vectors = {vector.id: vector for vector in self.load_vectors(list(job_ids))}
+        with self.lock:
+            for job_id in job_ids:
+                row = self.rows.get(job_id)
+                if row is not None:
+                    self.base.kill(row)
+                if job_id in vectors:
+                    self.pending_vectors[job_id] = vectors[job_id]
+                else:
+                    self.pending_vectors.pop(job_id, None)
+            n_cols = len(self.skill_cols)
+            self.pending = Segment.from_vectors(list(self.pending_vectors.values()), n_cols)
+            if len(self.pending_vectors) > COMPACT_THRESHOLD:
+                self.base = Segment.merge(self.base, self.pending, n_cols)
+                self.rows = {job_id: row for row, job_id in enumerate(self.base.ids)}
+                self.pending_vectors = {}
+                self.pending = Segment.from_vectors([], n_cols)
+
+    def sync(self):
+        """Pick up jobs changed by other processes since the last sync."""
+        started = timezone.now()
+        overlap_us = int(SYNC_OVERLAP.total_seconds() * 1_000_000)
+        changed = JobListing.objects.filter(version__gt=self.synced_version - overlap_us)
+        versions = dict(changed.values_list('pk', 'version'))
+        closed = Job.objects.filter(updated_at__gte=self.synced_at - SYNC_OVERLAP).exclude(status='active')
+        job_ids = set(versions) | set(closed.values_list('pk', flat=True))
+        if job_ids:
+            self.refresh(job_ids)
+        self.drop_deleted()
+        self.synced_version = max([self.synced_version, *versions.values()])
+        self.synced_at = started
+        self.checked_at = time.monotonic()
+
+    def drop_deleted(self):
+        # Deleted jobs leave no version or status behind, only a listing count that disagrees
+        with self.lock:
+            indexed = set(self.base.ids[self.base.alive]) | set(self.pending_vectors)
+        if len(indexed) == JobListing.objects.count():
+            return
+        deleted = indexed - set(JobListing.objects.values_list('pk', flat=True))
+        if deleted:
+            self.refresh(deleted)
+
+    def ensure_fresh(self):
+        if self.base is not None and time.monotonic() - self.checked_at < settings.RECOMMENDATION_SYNC_SECONDS:
+            return
+        # One thread builds or syncs; the others wait for it rather than repeat the work
+        with self.sync_lock:
+            if self.base is None:
+                self.build()
+            elif time.monotonic() - self.checked_at >= settings.RECOMMENDATION_SYNC_SECONDS:
+                self.sync()
+
+    def seeker_vector(self, profile):
+        skills = JobSeekerSkill.objects.filter(job_seeker=profile).values_list(
+            'skill_id', 'proficiency_level', 'years_of_experience',
+        )
+        skills = [skill for skill in skills if skill[0] in self.skill_cols]
+        origin = PincodeLocation.lookup(profile.pincode, profile.city, profile.state)
+        return SeekerVector(
+            cols=np.array([self.skill_cols[skill_id] for skill_id, _, _ in skills], dtype=np.int64),
+            proficiency=np.array([PROFICIENCY_FACTORS.get(level, 0.4) for _, level, _ in skills]),
+            years=np.array([years for _, _, years in skills], dtype=np.float64),
+            exp_rank=EXPERIENCE_RANKS.get(profile.experience_level, 0),
+            salary_min=profile.expected_salary_min_monthly,
+            lat=origin[0] if origin else None,
+            lng=origin[1] if origin else None,
+            city=self.place_code(profile.city, create=False),
+            state=self.place_code(profile.state, create=False),
+        )
+
+    def recommend(self, profile, limit):
+        """[(job_id, score), ...] for the `limit` best matching jobs, best first."""
+        self.ensure_fresh()
+        seeker = self.seeker_vector(profile)
+        with self.lock:
+            segments = (self.base, self.pending)
+        ids = np.concatenate([segment.ids for segment in segments])
+        scores = np.concatenate([segment.score(seeker) for segment in segments])
+        limit = min(limit, int(np.isfinite(scores).sum()))
+        if limit <= 0:
+            return []
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(ids[i], float(scores[i])) for i in top]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = RecommendationIndex()
+    return _index
+
+
+def recommend_jobs(profile, limit=20):
+    return get_index().recommend(profile, limit)
+
+
+def warm_index(**kwargs):
+    """
+    request_started receiver, connected by the WSGI and ASGI entry points:
+    builds each server process's index in the background, once.
+    """
+    request_started.disconnect(warm_index)
+    threading.Thread(target=_warm, name='recommendation-index', daemon=True).start()
+
+
+def _warm():
+    try:
+        get_index().ensure_fresh()
+    except Exception:
+        logger.exception('Building the recommendation index failed')
+    finally:
+        connections.close_all()
+
+
+def job_changed(job_id):
+    """Apply a job change to this process's index, if it has one, after commit."""
+    if _index is None or _index.base is None:
+        return
+    transaction.on_commit(lambda: _index.refresh([job_id]))
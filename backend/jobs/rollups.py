@@ -0,0 +1,109 @@
+"""Daily job view rollups, and purging of raw views the rollups already cover."""
+import time
+from datetime import datetime, timedelta
+
+from django.db.models import Count, Exists, Max, Min, OuterRef, Sum
+from django.utils import timezone
+
+from .models import JobView, JobViewDaily, UserAgent
+
+# Days before the last rolled-up day that are recomputed on every run
+ROLLUP_GRACE_DAYS = 1
+
+
+def day_start(day):
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+def rollup_start():
+    last = JobViewDaily.objects.aggregate(day=Max('day'))['day']
+    if last is not None:
+        return last - timedelta(days=ROLLUP_GRACE_DAYS)
+    first = JobView.objects.aggregate(created_at=Min('created_at'))['created_at']
+    return timezone.localdate(first) if first else None
+
+
+def rollup_views(since=None):
+    """Rebuild the daily rollups from `since` (a date) through today; returns rows written."""
+    since = since or rollup_start()
+    if since is None:
+        return 0
+    written = 0
+    day, today = since, timezone.localdate()
+    while day <= today:
+        rows = (
+            JobView.objects.filter(created_at__gte=day_start(day), created_at__lt=day_start(day + timedelta(days=1)))
+            .values('job_id')
+            .annotate(
+                views=Count('pk'),
+                unique_users=Count('user_id', distinct=True),
+                unique_ips=Count('ip_address', distinct=True),
+            )
+            .order_by()
+        )
+        rollups = [JobViewDaily(day=day, **row) for row in rows]
+        JobViewDaily.objects.bulk_create(
+            rollups,
+            update_conflicts=True,
+            unique_fields=['job', 'day'],
+            update_fields=['views', 'unique_users', 'unique_ips', 'updated_at'],
+        )
+        written += len(rollups)
+        day += timedelta(days=1)
+    return written
+
+
+def view_totals(job_ids):
+    """
+    {job_id: lifetime views} from the rollups up to the grace window plus the
+    raw rows after it, which purging never touches.
+    """
+    totals = dict.fromkeys(job_ids, 0)
+    raw = JobView.objects.filter(job_id__in=job_ids)
+    last = JobViewDaily.objects.aggregate(day=Max('day'))['day']
+    if last is not None:
+        boundary = last - timedelta(days=ROLLUP_GRACE_DAYS)
+        rolled = (
+            JobViewDaily.objects.filter(job_id__in=job_ids, day__lt=boundary)
+            .values('job_id').annotate(total=Sum('views')).order_by()
+        )
+        for row in rolled:
+            totals[row['job_id']] += row['total']
+        raw = raw.filter(created_at__gte=day_start(boundary))
+    for row in raw.values('job_id').annotate(total=Count('pk')).order_by():
+        totals[row['job_id']] += row['total']
+    return totals
+
+
+def purge_cutoff(retention_days):
+    last = JobViewDaily.objects.aggregate(day=Max('day'))['day']
+    if last is None:
+        return None
+    cutoff = timezone.localdate() - timedelta(days=retention_days)
+    # Raw rows of days the rollup may still recompute have to stay
+    return day_start(min(cutoff, last - timedelta(days=ROLLUP_GRACE_DAYS)))
+
+
+def purge_views(retention_days, batch_size=1000, pause=0.0):
+    """Delete raw views older than the retention window; returns rows deleted."""
+    cutoff = purge_cutoff(retention_days)
+    if cutoff is None:
+        return 0
+    deleted = _delete_in_batches(JobView.objects.filter(created_at__lt=cutoff), batch_size, pause)
+    # User agents no remaining view points at
+    orphans = UserAgent.objects.filter(~Exists(JobView.objects.filter(user_agent=OuterRef('pk'))))
+    _delete_in_batches(orphans, batch_size, pause)
+    return deleted
+
+
+def _delete_in_batches(queryset, batch_size, pause):
+    # Short autocommitted deletes by primary key keep locks brief
+    deleted = 0
+    model = queryset.model
+    while True:
+        pks = list(queryset.values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return deleted
+        deleted += model.objects.filter(pk__in=pks).delete()[0]
+        if pause:
+            time.sleep(pause)
@@ -0,0 +1,30 @@
+"""Salaries normalized to monthly paise, which salary filters and sorting compare."""
+from decimal import Decimal, ROUND_HALF_UP
+
+WORKING_HOURS_PER_DAY = 8
+WORKING_DAYS_PER_MONTH = 26
+
+MONTHLY_FACTORS = {
+    'hourly': Decimal(WORKING_HOURS_PER_DAY * WORKING_DAYS_PER_MONTH),
+    'daily': Decimal(WORKING_DAYS_PER_MONTH),
+    'weekly': Decimal(52) / Decimal(12),
+    'monthly': Decimal(1),
+    'yearly': Decimal(1) / Decimal(12),
+    # 'project' pay has no period, so it is left out of salary comparisons
+}
+
+MINOR_UNITS = 100
+
+
+def monthly_minor_units(amount, salary_type='monthly'):
+    """Monthly equivalent of `amount` in paise, or None when it can't be normalized."""
+    factor = MONTHLY_FACTORS.get(salary_type)
+    if amount is None or factor is None:
+        return None
+    value = Decimal(str(amount)) * factor * MINOR_UNITS
+    return int(value.quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+
+def to_minor_units(amount):
+    """Convert a monthly amount in rupees (e.g. a filter value) to paise."""
+    return int((Decimal(str(amount)) * MINOR_UNITS).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
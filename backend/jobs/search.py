@@ -0,0 +1,234 @@
+"""Full-text search backends for jobs, selected by JOB_SEARCH_BACKEND or the default database."""
+import re
+import uuid
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+# Fields that feed the search index, in weight order
+SEARCH_FIELDS = ('title', 'requirements', 'description')
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class BaseSearchBackend:
+    highlight_start = '<mark>'
+    highlight_stop = '</mark>'
+
+    def filter(self, queryset, query):
+        """Restrict a Job or JobListing queryset to matches without ranking them."""
+        raise NotImplementedError
+
+    def search(self, queryset, query, limit):
+        """
+        Return up to `limit` matching jobs ordered by relevance, each with
+        `search_rank` (higher is better) and `search_snippet` set.
+        """
+        raise NotImplementedError
+
+    def index_job(self, job):
+        pass
+
+    def remove_job(self, job_id):
+        pass
+
+    def rebuild(self, batch_size=2000):
+        pass
+
+
+class SimpleSearchBackend(BaseSearchBackend):
+    """Unindexed fallback that matches with icontains and ranks by field hits."""
+
+    def filter(self, queryset, query):
+        return queryset.filter(
+            Q(title__icontains=query) |
+            Q(description__icontains=query) |
+            Q(requirements__icontains=query)
+        )
+
+    def search(self, queryset, query, limit):
+        jobs = list(self.filter(queryset, query)[:limit])
+        needle = query.lower()
+        for job in jobs:
+            job.search_rank = float(sum(
+                needle in (getattr(job, field) or '').lower() for field in SEARCH_FIELDS
+            ))
+            job.search_snippet = self.snippet(job.description, query)
+        jobs.sort(key=lambda job: -job.search_rank)
+        return jobs
+
+    def snippet(self, text, query, width=80):
+        start = (text or '').lower().find(query.lower())
+        if start < 0:
+            return (text or '')[:width * 2]
+        end = start + len(query)
+        return ''.join([
+            text[max(0, start - width):start],
+            self.highlight_start, text[start:end], self.highlight_stop,
+            text[end:end + width],
+        ])
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """Weighted tsvector in `jobs.search_vector`, served by a GIN index."""
+    config = 'english'
+    weights = {'title': 'A', 'requirements': 'B', 'description': 'C'}
+
+    def vector(self):
+        vector = None
+        for field in SEARCH_FIELDS:
+            part = SearchVector(field, weight=self.weights[field], config=self.config)
+            vector = part if vector is None else vector + part
+        return vector
+
+    def to_query(self, query):
+        return SearchQuery(query, search_type='websearch', config=self.config)
+
+    def filter(self, queryset, query):
+        from .models import Job
+        if queryset.model is Job:
+            return queryset.filter(search_vector=self.to_query(query))
+        # Read models such as JobListing share the job's primary key
+        return queryset.filter(pk__in=Job.objects.filter(search_vector=self.to_query(query)).values('pk'))
+
+    def search(self, queryset, query, limit):
+        query = self.to_query(query)
+        return list(
+            queryset.filter(search_vector=query)
+            .annotate(
+                search_rank=SearchRank(F('search_vector'), query),
+                search_snippet=SearchHeadline(
+                    'description', query, config=self.config,
+                    start_sel=self.highlight_start, stop_sel=self.highlight_stop,
+                    max_words=35, min_words=15,
+                ),
+            )
+            .order_by('-search_rank', '-created_at')[:limit]
+        )
+
+    def index_job(self, job):
+        type(job).objects.filter(pk=job.pk).update(search_vector=self.vector())
+
+    def rebuild(self, batch_size=2000):
+        from .models import Job
+        pks = Job.objects.order_by('pk').values_list('pk', flat=True)
+        batch = []
+        for pk in pks.iterator(chunk_size=batch_size):
+            batch.append(pk)
+            if len(batch) >= batch_size:
+                Job.objects.filter(pk__in=batch).update(search_vector=self.vector())
+                batch = []
+        if batch:
+            Job.objects.filter(pk__in=batch).update(search_vector=self.vector())
+
+
+class SQLiteFTS5SearchBackend(BaseSearchBackend):
+    """
+    FTS5 shadow table `jobs_fts` keyed by a rowid derived from the job UUID,
+    so updates and deletes are rowid lookups rather than table scans.
+    """
+    table = 'jobs_fts'
+    # bm25 weights per column: job_id (unindexed), title, requirements, description
+    bm25_weights = (0.0, 10.0, 5.0, 1.0)
+
+    @staticmethod
+    def rowid(job_id):
+        return uuid.UUID(str(job_id)).int >> 65
+
+    def match_expression(self, query):
+        tokens = TOKEN_RE.findall(query)
+        if not tokens:
+            return None
+        # Quote every token so user input can't inject FTS5 syntax; prefix-match the last one
+        return ' '.join(f'"{token}"' for token in tokens) + '*'
+
+    def filter(self, queryset, query):
+        expression = self.match_expression(query)
+        if expression is None:
+            return queryset
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT job_id FROM {self.table} WHERE {self.table} MATCH %s', [expression]
+        ))
+
+    def search(self, queryset, query, limit):
+        expression = self.match_expression(query)
+        if expression is None:
+            return []
+        subquery, subquery_params = queryset.order_by().values('pk').query.sql_with_params()
+        weights = ', '.join(str(weight) for weight in self.bm25_weights)
+        sql = (
+            f'SELECT job_id, bm25({self.table}, {weights}) AS rank, '
+            f'snippet({self.table}, -1, %s, %s, %s, 16) '
+            f'FROM {self.table} WHERE {self.table} MATCH %s AND job_id IN ({subquery}) '
+            f'ORDER BY rank LIMIT %s'
+        )
+        params = [self.highlight_start, self.highlight_stop, '…', expression, *subquery_params, limit]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        jobs = queryset.in_bulk([uuid.UUID(job_id) for job_id, _, _ in rows])
+        results = []
+        for job_id, rank, snippet in rows:
+            job = jobs.get(uuid.UUID(job_id))
+            if job is None:
+                continue
+            # bm25() is lower-is-better; flip it so ranks compare like PostgreSQL's
+            job.search_rank = -rank
+            job.search_snippet = snippet
+            results.append(job)
+        return results
+
+    def index_job(self, job):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [self.rowid(job.pk)])
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, job_id, title, requirements, description) '
+                f'VALUES (%s, %s, %s, %s, %s)',
+                [self.rowid(job.pk), job.pk.hex, job.title, job.requirements or '', job.description or ''],
+            )
+
+    def remove_job(self, job_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [self.rowid(job_id)])
+
+    def rebuild(self, batch_size=2000):
+        from .models import Job
+        rows = Job.objects.values_list('pk', *SEARCH_FIELDS).iterator(chunk_size=batch_size)
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            batch = []
+            for pk, title, requirements, description in rows:
+                batch.append((self.rowid(pk), pk.hex, title, requirements or '', description or ''))
+                if len(batch) >= batch_size:
+                    self._insert(cursor, batch)
+                    batch = []
+            if batch:
+                self._insert(cursor, batch)
+            cursor.execute(f"INSERT INTO {self.table} ({self.table}) VALUES ('optimize')")
+
+    def _insert(self, cursor, rows):
+        cursor.executemany(
+            f'INSERT INTO {self.table} (rowid, job_id, title, requirements, description) '
+            f'VALUES (%s, %s, %s, %s, %s)',
+            rows,
+        )
+
+
+VENDOR_BACKENDS = {
+    'postgresql': PostgresSearchBackend,
+    'sqlite': SQLiteFTS5SearchBackend,
+}
+
+
+@lru_cache(maxsize=None)
+def get_search_backend():
+    path = getattr(settings, 'JOB_SEARCH_BACKEND', '')
+    if path:
+        return import_string(path)()
+    return VENDOR_BACKENDS.get(connection.vendor, SimpleSearchBackend)()
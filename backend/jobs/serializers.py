@@ -0,0 +1,97 @@
+from django.core.files.storage import default_storage
+from rest_framework import serializers
+from users.serializers import UserSerializer, JobPosterProfileSerializer, SkillSerializer
+from .models import JobCategory, Job, JobSkillRequirement, JobListing
+
+
+class JobCategorySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = JobCategory
+        fields = ['id', 'name', 'description', 'icon', 'is_active']
+        read_only_fields = fields
+
+
+class JobSkillRequirementSerializer(serializers.ModelSerializer):
+    skill = SkillSerializer(read_only=True)
+
+    class Meta:
+        model = JobSkillRequirement
+        fields = ['id', 'skill', 'requirement_level', 'min_experience_years']
+        read_only_fields = fields
+
+
+class JobSerializer(serializers.ModelSerializer):
+    category = JobCategorySerializer(read_only=True)
+    posted_by = UserSerializer(read_only=True)
+    company = JobPosterProfileSerializer(read_only=True)
+    skill_requirements = JobSkillRequirementSerializer(many=True, read_only=True)
+    distance_km = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'title', 'description', 'category', 'posted_by', 'company',
+            'job_type', 'experience_level',
+            'location', 'city', 'state', 'pincode', 'is_remote',
+            'salary_min', 'salary_max', 'salary_type', 'salary_negotiable',
+            'requirements', 'benefits',
+            'application_deadline', 'max_applications',
+            'status', 'is_featured', 'views_count', 'applications_count',
+            'created_at', 'updated_at', 'published_at',
+            'latitude', 'longitude',
+            'skill_requirements', 'distance_km',
+        ]
+        read_only_fields = fields
+
+    def get_distance_km(self, obj):
+        # Only set on radius searches
+        distance = getattr(obj, 'distance_km', None)
+        return round(distance, 2) if distance is not None else None
+
+
+class JobSearchResultSerializer(JobSerializer):
+    search_rank = serializers.FloatField(read_only=True)
+    search_snippet = serializers.CharField(read_only=True)
+    # Only set when results are collapsed
+    collapsed_duplicates = serializers.IntegerField(read_only=True, required=False)
+
+    class Meta(JobSerializer.Meta):
+        fields = JobSerializer.Meta.fields + [
+            'search_rank', 'search_snippet', 'duplicate_cluster', 'collapsed_duplicates',
+        ]
+        read_only_fields = fields
+
+
+class JobCardSerializer(serializers.ModelSerializer):
+    """Job card for the listing, built from the flattened JobListing row alone."""
+    category = serializers.SerializerMethodField()
+    company = serializers.SerializerMethodField()
+    posted_by = serializers.SerializerMethodField()
+
+    class Meta:
+        model = JobListing
+        fields = [
+            'id', 'title', 'category', 'company', 'posted_by',
+            'job_type', 'experience_level',
+            'location', 'city', 'state', 'pincode', 'is_remote', 'latitude', 'longitude',
+            'salary_min', 'salary_max', 'salary_type', 'salary_negotiable',
+            'is_featured', 'application_deadline', 'created_at', 'published_at',
+            'skills',
+        ]
+        read_only_fields = fields
+
+    def get_category(self, obj):
+        return {'id': str(obj.category_id), 'name': obj.category_name, 'icon': obj.category_icon}
+
+    def get_company(self, obj):
+        # Kept host-relative so the rendered card can be cached and shared
+        logo = default_storage.url(obj.company_logo) if obj.company_logo else None
+        return {
+            'id': str(obj.company_id),
+            'company_name': obj.company_name,
+            'company_logo': logo,
+            'is_company_verified': obj.is_company_verified,
+        }
+
+    def get_posted_by(self, obj):
+        return {'id': str(obj.posted_by_id), 'name': obj.posted_by_name}
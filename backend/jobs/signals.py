@@ -0,0 +1,91 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from monitoring import metrics
+from users.models import User, JobPosterProfile, Skill
+from . import duplicates, listing, percolator, recommendations
+from .models import Job, JobCategory, JobSkillRequirement, JobListing
+from .search import SEARCH_FIELDS, get_search_backend
+
+
+def _touches(update_fields, fields):
+    return update_fields is None or bool(set(update_fields) & set(fields))
+
+
+@receiver(post_save, sender=Job)
+def index_job_for_search(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    # Counter bumps and status changes don't touch the indexed text
+    if not _touches(update_fields, SEARCH_FIELDS):
+        return
+    get_search_backend().index_job(instance)
+
+
+@receiver(post_save, sender=Job)
+def flag_duplicate_job(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or not _touches(update_fields, SEARCH_FIELDS):
+        return
+    duplicates.flag_job(instance)
+
+
+@receiver(post_delete, sender=Job)
+def remove_job_from_search(sender, instance, **kwargs):
+    get_search_backend().remove_job(instance.pk)
+
+
+@receiver(post_save, sender=Job)
+def sync_job_listing(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and set(update_fields) <= listing.COUNTER_FIELDS):
+        return
+    listing.sync_job(instance)
+    recommendations.job_changed(instance.pk)
+
+
+@receiver(post_save, sender=Job)
+def percolate_job_alerts(sender, instance, raw=False, **kwargs):
+    if not raw and instance.__dict__.pop('_just_published', False):
+        metrics.JOBS_PUBLISHED.inc()
+        percolator.job_published(instance.pk)
+
+
+@receiver(post_delete, sender=Job)
+def delete_job_listing(sender, instance, **kwargs):
+    JobListing.objects.filter(pk=instance.pk).delete()
+    recommendations.job_changed(instance.pk)
+
+
+@receiver(post_save, sender=JobSkillRequirement)
+@receiver(post_delete, sender=JobSkillRequirement)
+def sync_job_listing_skills(sender, instance, raw=False, **kwargs):
+    if not raw:
+        listing.sync_skills(instance.job_id)
+        recommendations.job_changed(instance.job_id)
+
+
+@receiver(post_save, sender=Skill)
+def sync_skill_listings(sender, instance, raw=False, created=False, **kwargs):
+    if not raw and not created:
+        listing.sync_skill(instance)
+
+
+@receiver(post_save, sender=JobCategory)
+def sync_category_listings(sender, instance, raw=False, created=False, **kwargs):
+    if not raw and not created:
+        listing.sync_category(instance)
+
+
+@receiver(post_save, sender=JobPosterProfile)
+def sync_company_listings(sender, instance, raw=False, created=False, **kwargs):
+    if not raw and not created:
+        listing.sync_company(instance)
+
+
+@receiver(post_save, sender=User)
+def sync_poster_listings(sender, instance, raw=False, created=False, update_fields=None, **kwargs):
+    if raw or created or not _touches(update_fields, listing.POSTER_FIELDS):
+        return
+    listing.sync_poster(instance)
+    # The company payload embeds its owner, so move its version on as well
+    JobPosterProfile.objects.filter(user=instance).update(updated_at=timezone.now())
@@ -0,0 +1,403 @@
+"""
+Synthetic data for performance testing (populate_sample_data --scale). Chunks are seeded from
+(seed, kind, start), so the output depends only on the seed and scale, never on worker scheduling.
+"""
+import hashlib
+import random
+import uuid
+from datetime import timedelta
+
+CHUNK_SIZE = 1000
+
+UNIT_SEEKERS = 1000
+UNIT_POSTERS = 20
+UNIT_JOBS = 500
+
+# Pareto shape and scale for views per job: mean 1.6 / 0.6 * 15 = 40
+VIEWS_SHAPE = 1.6
+VIEWS_SCALE = 15
+MAX_VIEWS_PER_JOB = 5000
+# Share of views that turn into an application
+APPLY_RATE = (0.03, 0.12)
+LOGGED_IN_VIEW_RATE = 0.4
+ALERT_RATE = 0.3
+REPOST_RATE = 0.05
+JOB_AGE_DAYS = 180
+SEEKER_AGE_DAYS = 730
+
+# (city, state, weight)
+CITIES = [
+    ('Mumbai', 'Maharashtra', 20), ('Delhi', 'Delhi', 19), ('Bangalore', 'Karnataka', 13),
+    ('Hyderabad', 'Telangana', 10), ('Ahmedabad', 'Gujarat', 8), ('Chennai', 'Tamil Nadu', 9),
+    ('Kolkata', 'West Bengal', 9), ('Pune', 'Maharashtra', 7), ('Surat', 'Gujarat', 6),
+    ('Jaipur', 'Rajasthan', 4), ('Lucknow', 'Uttar Pradesh', 4), ('Kanpur', 'Uttar Pradesh', 3),
+    ('Nagpur', 'Maharashtra', 3), ('Indore', 'Madhya Pradesh', 3), ('Bhopal', 'Madhya Pradesh', 2),
+    ('Patna', 'Bihar', 2), ('Vadodara', 'Gujarat', 2), ('Ludhiana', 'Punjab', 2),
+    ('Coimbatore', 'Tamil Nadu', 2), ('Kochi', 'Kerala', 2), ('Visakhapatnam', 'Andhra Pradesh', 2),
+    ('Guwahati', 'Assam', 1), ('Bhubaneswar', 'Odisha', 1), ('Chandigarh', 'Chandigarh', 1),
+]
+CITY_WEIGHTS = [weight for _, _, weight in CITIES]
+
+FIRST_NAMES = [
+    'Aarav', 'Aditi', 'Amit', 'Anita', 'Arjun', 'Deepa', 'Divya', 'Ganesh', 'Geeta', 'Harish',
+    'Imran', 'Kavita', 'Kiran', 'Lakshmi', 'Mahesh', 'Meena', 'Mohan', 'Neha', 'Pooja', 'Priya',
+    'Rahul', 'Rajesh', 'Ramesh', 'Ravi', 'Rekha', 'Sanjay', 'Shalini', 'Sunil', 'Suresh', 'Vijay',
+]
+LAST_NAMES = [
+    'Ahmed', 'Bose', 'Das', 'Gupta', 'Iyer', 'Joshi', 'Khan', 'Kumar', 'Mehta', 'Nair', 'Patel',
+    'Pillai', 'Rao', 'Reddy', 'Shah', 'Sharma', 'Singh', 'Verma', 'Yadav', 'Zaidi',
+]
+
+# Category: (weight, skill categories, titles, duty sentences)
+CATEGORIES = {
+    'Construction': (18, ('construction',), [
+        'Construction Worker', 'Mason', 'Carpenter', 'Plumber', 'Electrician', 'Welder',
+        'Painter', 'Site Helper', 'Excavator Operator',
+    ], [
+        'Work on residential and commercial building sites under the site supervisor.',
+        'Read drawings and prepare materials before each shift.',
+        'Follow site safety rules and wear protective equipment at all times.',
+        'Keep tools and equipment in good working order.',
+        'Support masons, carpenters and electricians on the daily work plan.',
+    ]),
+    'Manufacturing': (16, ('manufacturing',), [
+        'Production Line Operator', 'Machine Operator', 'Quality Inspector', 'Packer',
+        'Assembly Technician', 'Forklift Operator', 'Store Keeper',
+    ], [
+        'Operate production machines and meet the daily output targets.',
+        'Check finished products against the quality checklist.',
+        'Pack and label goods for dispatch.',
+        'Report breakdowns and help with routine machine maintenance.',
+        'Keep the work area clean and follow shift handover procedures.',
+    ]),
+    'Transportation': (15, ('transportation',), [
+        'Delivery Driver', 'Truck Driver', 'Delivery Executive', 'Cab Driver',
+        'Loader', 'Fleet Supervisor',
+    ], [
+        'Deliver packages to customers on the assigned route.',
+        'Check the vehicle before every trip and log fuel and mileage.',
+        'Collect payments and proof of delivery from customers.',
+        'Load and unload goods safely at the warehouse.',
+        'Plan routes to finish deliveries on time.',
+    ]),
+    'Hospitality': (14, ('hospitality',), [
+        'Kitchen Helper', 'Cook', 'Waiter', 'Housekeeping Staff', 'Steward', 'Front Desk Assistant',
+    ], [
+        'Prepare ingredients and keep the kitchen clean.',
+        'Serve guests politely and take orders accurately.',
+        'Clean and set up rooms to the hotel standard.',
+        'Follow food safety and hygiene rules.',
+        'Help during peak hours and events.',
+    ]),
+    'Maintenance': (10, ('maintenance', 'construction'), [
+        'Maintenance Technician', 'HVAC Technician', 'Janitor', 'Gardener', 'Facility Helper',
+    ], [
+        'Carry out preventive maintenance on building equipment.',
+        'Repair faults reported by residents and tenants.',
+        'Keep common areas clean and presentable.',
+        'Maintain gardens and outdoor areas.',
+        'Record completed work in the maintenance log.',
+    ]),
+    'Security': (12, ('security',), [
+        'Security Guard', 'Security Supervisor', 'CCTV Operator', 'Bouncer', 'Gatekeeper',
+    ], [
+        'Guard the premises and patrol at regular intervals.',
+        'Check visitors and vehicles at the gate and keep the register.',
+        'Monitor CCTV cameras and report unusual activity.',
+        'Respond to emergencies and help with evacuations.',
+        'Work rotating day and night shifts.',
+    ]),
+    'Retail': (10, ('hospitality', 'manufacturing'), [
+        'Sales Associate', 'Cashier', 'Store Helper', 'Stock Assistant', 'Billing Executive',
+    ], [
+        'Help customers find products and answer their questions.',
+        'Handle billing and cash at the counter.',
+        'Restock shelves and keep the store tidy.',
+        'Count stock and record deliveries.',
+        'Meet monthly sales targets with the store team.',
+    ]),
+    'Healthcare Support': (5, ('hospitality',), [
+        'Ward Boy', 'Patient Care Assistant', 'Hospital Attendant', 'Lab Helper', 'Caretaker',
+    ], [
+        'Assist nurses with patient care and movement.',
+        'Keep wards and equipment clean and sanitized.',
+        'Escort patients to tests and appointments.',
+        'Deliver samples, medicines and supplies within the hospital.',
+        'Follow infection control procedures.',
+    ]),
+}
+CATEGORY_NAMES = list(CATEGORIES)
+CATEGORY_WEIGHTS = [CATEGORIES[name][0] for name in CATEGORY_NAMES]
+
+TITLE_PREFIXES = ['', '', '', 'Senior ', 'Junior ', 'Trainee ', 'Experienced ']
+TITLE_SUFFIXES = ['', '', '', ' - Night Shift', ' - Immediate Joining', ' - Day Shift']
+COMPANY_WORDS = [
+    'Apex', 'Bharat', 'Crest', 'Delta', 'Everest', 'Galaxy', 'Ganga', 'Indus', 'Lotus', 'Metro',
+    'Navy', 'Orbit', 'Prime', 'Sagar', 'Shakti', 'Star', 'Sun', 'Trident', 'Unity', 'Vijay',
+]
+COMPANY_SUFFIXES = ['Services', 'Industries', 'Logistics', 'Builders', 'Enterprises', 'Facilities', 'Group']
+BENEFITS = [
+    'PF and ESI', 'Free meals', 'Accommodation provided', 'Overtime pay', 'Transport allowance',
+    'Uniform provided', 'Weekly off', 'Performance bonus', 'Medical insurance',
+]
+GENERAL_SKILLS = [
+    'Physical Fitness', 'Team Work', 'Time Management', 'Communication', 'Problem Solving', 'Safety Compliance',
+]
+USER_AGENTS = [
+    'Mozilla/5.0 (Linux; Android 13; SM-A145F) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Mobile Safari/537.36',
+    'Mozilla/5.0 (Linux; Android 12; Redmi Note 11) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0 Mobile Safari/537.36',
+    'Mozilla/5.0 (Linux; Android 11; vivo 1906) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0 Mobile Safari/537.36',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Mobile/15E148 Safari/604.1',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36',
+]
+USER_AGENT_WEIGHTS = [35, 30, 15, 8, 12]
+
+EXPERIENCE_LEVELS = ['entry', 'mid', 'senior', 'expert']
+EXPERIENCE_WEIGHTS = [45, 35, 15, 5]
+# Median monthly pay in rupees per experience level
+LEVEL_PAY = {'entry': 14000, 'mid': 20000, 'senior': 28000, 'expert': 38000}
+JOB_TYPES = ['full_time', 'part_time', 'contract', 'temporary', 'internship']
+JOB_TYPE_WEIGHTS = [70, 12, 10, 5, 3]
+# Salary type: (weight, monthly pay divisor)
+SALARY_TYPES = {'monthly': (80, 1), 'daily': (12, 26), 'hourly': (5, 208), 'yearly': (3, 1 / 12)}
+JOB_STATUSES = ['active', 'closed', 'expired', 'paused', 'draft']
+JOB_STATUS_WEIGHTS = [75, 9, 8, 3, 5]
+APPLICATION_STATUSES = [
+    'pending', 'under_review', 'shortlisted', 'interview_scheduled', 'interviewed', 'selected', 'rejected', 'withdrawn',
+]
+APPLICATION_STATUS_WEIGHTS = [40, 20, 10, 5, 4, 3, 13, 5]
+ALERT_FREQUENCIES = ['immediate', 'daily', 'weekly']
+ALERT_FREQUENCY_WEIGHTS = [10, 60, 30]
+
+
+def counts(scale):
+    """(seekers, posters, jobs) for a scale factor."""
+    return tuple(max(1, round(unit * scale)) for unit in (UNIT_SEEKERS, UNIT_POSTERS, UNIT_JOBS))
+
+
+def entity_id(seed, kind, index):
+    """Stable UUID of the `index`-th entity of `kind` in the dataset for `seed`."""
+    digest = hashlib.md5(f'{seed}:{kind}:{index}'.encode()).digest()
+    return uuid.UUID(bytes=digest, version=4)
+
+
+def experience_level(years):
+    if years >= 10:
+        return 'expert'
+    if years >= 5:
+        return 'senior'
+    if years >= 2:
+        return 'mid'
+    return 'entry'
+
+
+def skills_by_category(skills):
+    """{category name: [skill name, ...]} from (name, skill category) pairs."""
+    grouped = {}
+    for name, (_, skill_categories, _, _) in CATEGORIES.items():
+        grouped[name] = [skill for skill, category in skills if category in skill_categories]
+    return grouped
+
+
+def _uuid(rng):
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _ago(rng, now, days, skew=1.0):
+    """A time up to `days` before `now`; skew > 1 favours recent times."""
+    return now - timedelta(seconds=rng.random() ** skew * days * 86400)
+
+
+def _between(rng, start, end):
+    return start + (end - start) * rng.random()
+
+
+def _pay(rng, level):
+    """(min, max) monthly pay in whole rupees around the level's median."""
+    low = round(LEVEL_PAY[level] * rng.lognormvariate(0, 0.25), -2)
+    return low, round(low * rng.uniform(1.1, 1.6), -2)
+
+
+def _city(rng):
+    return rng.choices(CITIES, weights=CITY_WEIGHTS)[0][:2]
+
+
+def _phone(rng):
+    return f'+91-{rng.randint(6000000000, 9999999999)}'
+
+
+def _seekers(rng, seed, start, count, context):
+    now = context['now']
+    users, profiles, seeker_skills, alerts = [], [], [], []
+    for index in range(start, start + count):
+        user_id = entity_id(seed, 'seeker', index)
+        profile_id = entity_id(seed, 'seeker-profile', index)
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        city, state = _city(rng)
+        years = min(30, int(rng.expovariate(1 / 4)))
+        level = experience_level(years)
+        category = rng.choices(CATEGORY_NAMES, weights=CATEGORY_WEIGHTS)[0]
+        created_at = _ago(rng, now, SEEKER_AGE_DAYS)
+        email = f'{first}.{last}.{seed}.{index}@example.com'.lower()
+
+        users.append({
+            'id': user_id, 'email': email, 'username': email, 'first_name': first, 'last_name': last,
+            'role': 'job_seeker', 'phone_number': _phone(rng), 'is_verified': rng.random() < 0.6,
+            'date_joined': created_at, 'created_at': created_at,
+        })
+        pay_min, pay_max = _pay(rng, level)
+        profiles.append({
+            'id': profile_id, 'user_id': user_id, 'experience_level': level,
+            'bio': f'{first} has {years} years of experience in {category.lower()} work.',
+            'location': f'{city}, {state}', 'city': city, 'state': state,
+            'pincode': str(rng.randint(110001, 855117)), 'availability': rng.random() < 0.85,
+            'expected_salary_min': pay_min, 'expected_salary_max': pay_max, 'created_at': created_at,
+        })
+
+        pool = context['skills'][category] + GENERAL_SKILLS
+        for skill in rng.sample(pool, min(len(pool), rng.randint(2, 6))):
+            seeker_skills.append({
+                'id': _uuid(rng), 'job_seeker_id': profile_id, 'skill': skill,
+                'proficiency_level': rng.choice(['beginner', 'intermediate', 'advanced', 'expert']),
+                'years_of_experience': rng.randint(0, max(1, years)), 'created_at': created_at,
+            })
+
+        if rng.random() < ALERT_RATE:
+            for _ in range(rng.randint(1, 2)):
+                title = rng.choice(CATEGORIES[category][2])
+                alerts.append({
+                    'id': _uuid(rng), 'user_id': user_id, 'title': f'{title} jobs',
+                    'keywords': title.split()[-1].lower() if rng.random() < 0.8 else None,
+                    'location': city if rng.random() < 0.7 else None,
+                    'category': category if rng.random() < 0.6 else None,
+                    'job_type': rng.choice(JOB_TYPES) if rng.random() < 0.2 else None,
+                    'experience_level': level if rng.random() < 0.2 else None,
+                    'salary_min': pay_min if rng.random() < 0.25 else None,
+                    'frequency': rng.choices(ALERT_FREQUENCIES, weights=ALERT_FREQUENCY_WEIGHTS)[0],
+                    'is_active': rng.random() < 0.9, 'created_at': _between(rng, created_at, now),
+                })
+    return {'users': users, 'seeker_profiles': profiles, 'seeker_skills': seeker_skills, 'alerts': alerts}
+
+
+def _posters(rng, seed, start, count, context):
+    now = context['now']
+    users, companies = [], []
+    for index in range(start, start + count):
+        user_id = entity_id(seed, 'poster', index)
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        city, state = _city(rng)
+        category = rng.choices(CATEGORY_NAMES, weights=CATEGORY_WEIGHTS)[0]
+        company = f'{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)} {index}'
+        created_at = _ago(rng, now, SEEKER_AGE_DAYS)
+        email = f'careers.{seed}.{index}@example.com'
+
+        users.append({
+            'id': user_id, 'email': email, 'username': email, 'first_name': first, 'last_name': last,
+            'role': 'job_poster', 'phone_number': _phone(rng), 'is_verified': True,
+            'date_joined': created_at, 'created_at': created_at,
+        })
+        companies.append({
+            'id': entity_id(seed, 'company', index), 'user_id': user_id, 'company_name': company,
+            'company_description': f'{company} hires for {category.lower()} roles across India.',
+            'company_size': rng.choices(['startup', 'small', 'medium', 'large', 'enterprise'], [15, 35, 30, 15, 5])[0],
+            'industry': category, 'address': f'Head Office, {city}', 'city': city, 'state': state,
+            'pincode': str(rng.randint(110001, 855117)), 'contact_person': f'{first} {last}',
+            'contact_phone': _phone(rng), 'is_company_verified': rng.random() < 0.7, 'created_at': created_at,
+        })
+    return {'users': users, 'companies': companies}
+
+
+def _job_text(rng, category, level):
+    _, _, titles, duties = CATEGORIES[category]
+    title = f'{rng.choice(TITLE_PREFIXES)}{rng.choice(titles)}{rng.choice(TITLE_SUFFIXES)}'
+    description = ' '.join(rng.sample(duties, rng.randint(3, len(duties))))
+    if level != 'entry':
+        description += f' Candidates with {level} level experience preferred.'
+    return title, description
+
+
+def _jobs(rng, seed, start, count, context):
+    now = context['now']
+    seekers, posters = context['seekers'], context['posters']
+    jobs, requirements, applications, views = [], [], [], []
+    for index in range(start, start + count):
+        job_id = entity_id(seed, 'job', index)
+        # Squaring a uniform draw skews postings towards the first employers
+        poster = int(posters * rng.random() ** 2)
+        category = rng.choices(CATEGORY_NAMES, weights=CATEGORY_WEIGHTS)[0]
+        level = rng.choices(EXPERIENCE_LEVELS, weights=EXPERIENCE_WEIGHTS)[0]
+        salary_type = rng.choices(list(SALARY_TYPES), weights=[weight for weight, _ in SALARY_TYPES.values()])[0]
+        status = rng.choices(JOB_STATUSES, weights=JOB_STATUS_WEIGHTS)[0]
+        created_at = _ago(rng, now, JOB_AGE_DAYS, skew=1.5)
+        city, state = _city(rng)
+
+        if jobs and rng.random() < REPOST_RATE:
+            # The same posting again from the same employer
+            original = rng.choice(jobs)
+            poster, category = original['poster'], original['category']
+            title, description = original['title'], original['description']
+        else:
+            title, description = _job_text(rng, category, level)
+
+        pay_min, pay_max = _pay(rng, level)
+        divisor = SALARY_TYPES[salary_type][1]
+        pool = context['skills'][category] + GENERAL_SKILLS
+        skills = rng.sample(pool, min(len(pool), rng.randint(2, 5)))
+
+        job = {
+            'id': job_id, 'poster': poster, 'category': category, 'title': title, 'description': description,
+            'posted_by_id': entity_id(seed, 'poster', poster), 'company_id': entity_id(seed, 'company', poster),
+            'job_type': rng.choices(JOB_TYPES, weights=JOB_TYPE_WEIGHTS)[0], 'experience_level': level,
+            'location': f'{city}, {state}', 'city': city, 'state': state, 'is_remote': rng.random() < 0.03,
+            'salary_min': round(pay_min / divisor, 2), 'salary_max': round(pay_max / divisor, 2),
+            'salary_type': salary_type, 'salary_negotiable': rng.random() < 0.3,
+            'requirements': ', '.join(skills), 'benefits': ', '.join(rng.sample(BENEFITS, rng.randint(1, 4))),
+            'application_deadline': created_at + timedelta(days=rng.choice([15, 30, 45, 60])),
+            'status': status, 'is_featured': rng.random() < 0.05, 'created_at': created_at,
+            'published_at': created_at if status != 'draft' else None,
+        }
+        jobs.append(job)
+        for skill in skills:
+            requirements.append({
+                'id': _uuid(rng), 'job_id': job_id, 'skill': skill,
+                'requirement_level': rng.choices(['required', 'preferred', 'nice_to_have'], [60, 30, 10])[0],
+                'min_experience_years': rng.randint(0, 3), 'created_at': created_at,
+            })
+
+        if status == 'draft':
+            job['views_count'] = job['applications_count'] = 0
+            continue
+        view_count = min(MAX_VIEWS_PER_JOB, int(rng.paretovariate(VIEWS_SHAPE) * VIEWS_SCALE))
+        for _ in range(view_count):
+            viewer = entity_id(seed, 'seeker', rng.randrange(seekers)) if rng.random() < LOGGED_IN_VIEW_RATE else None
+            views.append((
+                _uuid(rng), job_id, viewer, f'{rng.randint(1, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}',
+                rng.choices(range(len(USER_AGENTS)), weights=USER_AGENT_WEIGHTS)[0], _between(rng, created_at, now),
+            ))
+        applicants = rng.sample(range(seekers), min(seekers, round(view_count * rng.uniform(*APPLY_RATE))))
+        active = 0
+        for applicant in applicants:
+            applied_at = _between(rng, created_at, now)
+            application_status = rng.choices(APPLICATION_STATUSES, weights=APPLICATION_STATUS_WEIGHTS)[0]
+            active += application_status != 'withdrawn'
+            viewed = application_status not in ('pending', 'withdrawn')
+            applications.append({
+                'id': _uuid(rng), 'job_id': job_id, 'applicant_id': entity_id(seed, 'seeker', applicant),
+                'job_seeker_profile_id': entity_id(seed, 'seeker-profile', applicant),
+                'cover_letter': f'I would like to apply for the {title} position.' if rng.random() < 0.5 else None,
+                'status': application_status, 'applied_at': applied_at, 'viewed_by_employer': viewed,
+                'viewed_at': _between(rng, applied_at, now) if viewed else None,
+            })
+        job['views_count'] = view_count
+        job['applications_count'] = active
+    return {'jobs': jobs, 'requirements': requirements, 'applications': applications, 'views': views}
+
+
+GENERATORS = {'seekers': _seekers, 'posters': _posters, 'jobs': _jobs}
+
+
+def generate_chunk(task):
+    """Rows for one (kind, seed, start, count, context) chunk, as plain values that pickle cheaply from pool workers."""
+    kind, seed, start, count, context = task
+    rng = random.Random(f'{seed}:{kind}:{start}')
+    return GENERATORS[kind](rng, seed, start, count, context)
@@ -1,3 +1,610 @@
-from django.test import TestCase
+import json
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from users.models import User, JobPosterProfile, JobSeekerProfile, JobSeekerSkill, Skill
+from . import recommendations, tracking
+from .fragments import render_json, splice, splice_raw
+from .models import (
+    Job, JobAlert, JobAlertMatch, JobCategory, JobListing, JobSkillRequirement, JobView, JobViewDaily, UserAgent,
+)
+from .rollups import day_start, view_totals
+from .serializers import JobSerializer
+from .views import job_list_queryset
+
+
+class JobTestMixin:
+    def setUp(self):
+        # Counts and payload fragments are cached across requests
+        cache.clear()
+        self.poster = User.objects.create(
+            username='poster', email='poster@example.com', role='job_poster',
+        )
+        self.company = JobPosterProfile.objects.create(user=self.poster, company_name='Acme Builders')
+        self.category = JobCategory.objects.create(name='Construction')
+        self.client = APIClient()
+        # Job detail requests spool views; keep them out of the real spool directory
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.spool_dir = Path(directory.name)
+        spool_settings = override_settings(JOB_VIEW_SPOOL_DIR=directory.name)
+        spool_settings.enable()
+        self.addCleanup(spool_settings.disable)
+        # The process keeps its spool file open across requests
+        tracking.close_spool()
+        self.addCleanup(tracking.close_spool)
+
+    def create_job(self, **fields):
+        return Job.objects.create(**{
+            'title': 'Site supervisor',
+            'description': 'Supervise the site crew.',
+            'category': self.category,
+            'posted_by': self.poster,
+            'company': self.company,
+            'location': 'Pune, Maharashtra',
+            'city': 'Pune',
+            'state': 'Maharashtra',
+            'status': 'active',
+            **fields,
+        })
+
+    def get(self, path, **params):
+        response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+
+class JobListTest(JobTestMixin, TestCase):
+    def test_cursor_walks_every_job_once_in_order(self):
+        for i in range(7):
+            self.create_job(title=f'Mason {i}')
+        expected = [str(pk) for pk in JobListing.objects.order_by('-created_at', '-id').values_list('pk', flat=True)]
+
+        page = self.get('/jobs/', page_size=3)
+        self.assertEqual(page['count'], 7)
+        self.assertIsNone(page['previous'])
+        seen = [job['id'] for job in page['results']]
+        while page['next']:
+            page = self.get(page['next'])
+            # The first page's count is reused, not computed again
+            self.assertEqual(page['count'], 7)
+            seen += [job['id'] for job in page['results']]
+        self.assertEqual(seen, expected)
+
+        # Going back from the last page returns the page before it
+        previous = self.get(page['previous'])
+        self.assertEqual([job['id'] for job in previous['results']], expected[3:6])
+
+        # Without a cached count, only the first page runs COUNT(*)
+        cache.clear()
+        self.assertIsNone(self.get(page['previous'])['count'])
+
+    def test_invalid_cursor(self):
+        self.create_job()
+        self.assertEqual(self.client.get('/jobs/', {'cursor': 'not-a-cursor'}).status_code, 404)
+
+    def test_only_active_jobs_are_listed(self):
+        active = self.create_job()
+        self.create_job(status='draft')
+        self.create_job(status='closed')
+        self.assertEqual([job['id'] for job in self.get('/jobs/')['results']], [str(active.pk)])
+
+    def test_salary_filter_ignores_non_finite_values(self):
+        job = self.create_job(salary_min=Decimal('30000'), salary_max=Decimal('40000'))
+        for value in ('NaN', 'Infinity', '-Infinity', 'sNaN', 'abc'):
+            with self.subTest(value=value):
+                self.assertEqual([row['id'] for row in self.get('/jobs/', salary_min=value)['results']], [str(job.pk)])
+                self.get('/jobs/search/', search='supervisor', salary_min=value)
+
+    def test_salary_filter_clamps_huge_values(self):
+        self.create_job(salary_min=Decimal('30000'), salary_max=Decimal('40000'))
+        self.assertEqual(self.get('/jobs/', salary_min='1e400')['results'], [])
+        self.assertEqual(len(self.get('/jobs/', salary_max='1e400')['results']), 1)
+        self.get('/jobs/search/', search='supervisor', salary_min='1e400')
+
+    def test_salary_filter_compares_monthly_equivalents(self):
+        hourly = self.create_job(salary_min=Decimal('200'), salary_max=Decimal('250'), salary_type='hourly')
+        self.create_job(salary_min=Decimal('15000'), salary_max=Decimal('18000'))
+        # 250/hour is 52,000 a month
+        results = self.get('/jobs/', salary_min='50000')['results']
+        self.assertEqual([job['id'] for job in results], [str(hourly.pk)])
+
+
+class JobBackfillTest(JobTestMixin, TestCase):
+    def test_load_pincodes_geocodes_listings(self):
+        job = self.create_job()
+        self.assertIsNone(JobListing.objects.get(pk=job.pk).latitude)
+        version = JobListing.objects.get(pk=job.pk).version
+
+        call_command('load_pincodes', stdout=StringIO())
+        listing = JobListing.objects.get(pk=job.pk)
+        self.assertIsNotNone(listing.latitude)
+        self.assertGreater(listing.version, version)
+        results = self.get('/jobs/', location='Pune', radius_km='20')['results']
+        self.assertEqual([row['id'] for row in results], [str(job.pk)])
+
+    def test_backfill_normalized_salaries_updates_listings(self):
+        job = self.create_job(salary_min=Decimal('30000'), salary_max=Decimal('40000'))
+        # As the rows stood before the normalized columns were filled
+        Job.objects.filter(pk=job.pk).update(salary_min_monthly=None, salary_max_monthly=None)
+        JobListing.objects.filter(pk=job.pk).update(salary_min_monthly=None, salary_max_monthly=None)
+        self.assertEqual(self.get('/jobs/', salary_min='25000')['results'], [])
+
+        call_command('backfill_normalized_salaries', stdout=StringIO())
+        cache.clear()
+        results = self.get('/jobs/', salary_min='25000')['results']
+        self.assertEqual([row['id'] for row in results], [str(job.pk)])
+
+
+class JobFacetTest(JobTestMixin, TestCase):
+    def facet(self, facets, name):
+        return {item['value']: item['count'] for item in facets[name]}
+
+    def test_each_facet_ignores_its_own_filter(self):
+        self.create_job(job_type='full_time')
+        self.create_job(job_type='full_time', experience_level='senior')
+        self.create_job(job_type='contract')
+        self.create_job(job_type='full_time', location='Mumbai, Maharashtra', city='Mumbai')
+        self.create_job(job_type='full_time', location='Delhi', city='Delhi', state='Delhi', is_remote=True)
+        self.create_job(job_type='full_time', status='closed')
+
+        page = self.get('/jobs/', job_type='full_time', location='Pune', facets='true')
+        self.assertEqual(len(page['results']), 2)
+        facets = page['facets']
+        # Alternatives to the selected job type, still within Pune
+        self.assertEqual(self.facet(facets, 'job_type'), {'full_time': 2, 'contract': 1})
+        # Alternatives to Pune, still full time
+        self.assertEqual(self.facet(facets, 'state'), {'Maharashtra': 3, 'Delhi': 1})
+        # Unselected facets count the results themselves
+        self.assertEqual(self.facet(facets, 'experience_level'), {'entry': 1, 'senior': 1})
+        self.assertEqual(self.facet(facets, 'category'), {str(self.category.pk): 2})
+        self.assertEqual(facets['category'][0]['label'], 'Construction')
+        self.assertEqual(self.facet(facets, 'is_remote'), {False: 2})
+
+    def test_without_filters(self):
+        self.create_job(is_remote=True)
+        self.create_job()
+        facets = self.get('/jobs/', facets='1')['facets']
+        self.assertEqual(self.facet(facets, 'is_remote'), {True: 1, False: 1})
+        self.assertEqual([item['label'] for item in facets['is_remote']], ['On-site', 'Remote'])
+        self.assertNotIn('facets', self.get('/jobs/'))
+
+
+class JobFragmentTest(JobTestMixin, TestCase):
+    def serialized(self, job):
+        return json.loads(render_json(JobSerializer(job_list_queryset().get(pk=job.pk)).data))
+
+    def test_detail_matches_the_serializer(self):
+        job = self.create_job(salary_min=Decimal('20000'), salary_max=Decimal('25000'))
+        # Rendered once, then served from the cache
+        for _ in range(2):
+            self.assertEqual(self.get(f'/jobs/{job.pk}/'), self.serialized(job))
+
+    def test_changes_reach_cached_payloads(self):
+        job = self.create_job()
+        self.get(f'/jobs/{job.pk}/')
+        self.get('/jobs/')
+
+        self.company.company_name = 'Acme Infra'
+        self.company.save()
+        self.category.name = 'Civil works'
+        self.category.save()
+        job.title = 'Senior site supervisor'
+        job.save()
+
+        detail = self.get(f'/jobs/{job.pk}/')
+        self.assertEqual(detail, self.serialized(job))
+        self.assertEqual(detail['company']['company_name'], 'Acme Infra')
+        self.assertEqual(detail['category']['name'], 'Civil works')
+        card = self.get('/jobs/')['results'][0]
+        self.assertEqual(card['title'], 'Senior site supervisor')
+        self.assertEqual(card['company']['company_name'], 'Acme Infra')
+        self.assertEqual(card['category']['name'], 'Civil works')
+
+    def test_counters_are_read_live(self):
+        job = self.create_job()
+        self.get(f'/jobs/{job.pk}/')
+        Job.objects.filter(pk=job.pk).update(views_count=41, applications_count=3)
+        detail = self.get(f'/jobs/{job.pk}/')
+        self.assertEqual((detail['views_count'], detail['applications_count']), (41, 3))
+
+    def test_splicing(self):
+        self.assertEqual(json.loads(splice(b'{"a":1}', b=[2], c=None)), {'a': 1, 'b': [2], 'c': None})
+        self.assertEqual(json.loads(splice(b'{}', b=2)), {'b': 2})
+        self.assertEqual(splice(b'{"a":1}'), b'{"a":1}')
+        self.assertEqual(json.loads(splice_raw(b'{"a":1}', 'b', b'{"c":"}"}')), {'a': 1, 'b': {'c': '}'}})
+        self.assertEqual(json.loads(splice_raw(b'{}', 'b', b'[]')), {'b': []})
+
+
+class JobViewSpoolTest(JobTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.job = self.create_job()
+
+    def view(self, job, user=None):
+        self.client.force_authenticate(user)
+        response = self.client.get(f'/jobs/{job.pk}/', HTTP_USER_AGENT='Mozilla/5.0', REMOTE_ADDR='10.0.0.7')
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def flush(self):
+        tracking.close_spool()
+        # Run as if the spool files' bucket had rolled over
+        with mock.patch.object(tracking, 'current_bucket', return_value=tracking.current_bucket() + 2):
+            call_command('flush_job_views', stdout=StringIO())
+
+    def views_count(self):
+        self.job.refresh_from_db(fields=['views_count'])
+        return self.job.views_count
+
+    def test_views_are_counted_on_flush(self):
+        seeker = User.objects.create(username='seeker', email='seeker@example.com')
+        JobSeekerProfile.objects.create(user=seeker)
+        self.view(self.job)
+        self.view(self.job)
+        self.view(self.job, seeker)
+        # Viewing never writes to the database
+        self.assertEqual(self.views_count(), 0)
+        self.assertFalse(JobView.objects.exists())
+
+        self.flush()
+        self.assertEqual(self.views_count(), 3)
+        views = JobView.objects.filter(job=self.job)
+        self.assertEqual(views.count(), 3)
+        self.assertEqual(views.filter(user=seeker).count(), 1)
+        self.assertEqual(set(views.values_list('ip_address', flat=True)), {'10.0.0.7'})
+        self.assertEqual(list(UserAgent.objects.values_list('user_agent', flat=True)), ['Mozilla/5.0'])
+        self.assertEqual(list(self.spool_dir.iterdir()), [])
+
+        self.flush()
+        self.assertEqual(self.views_count(), 3)
+
+    def test_reflushing_a_claimed_file_counts_it_once(self):
+        self.view(self.job)
+        self.view(self.job)
+        tracking.close_spool()
+        [path] = self.spool_dir.iterdir()
+        events = path.read_text()
+
+        self.flush()
+        # A flush that crashed after loading the file left it claimed, with a torn last line
+        path.with_suffix('.flushing').write_text(events + '{"id": "3f')
+        self.view(self.job)
+        self.flush()
+        self.assertEqual(self.views_count(), 3)
+        self.assertEqual(JobView.objects.count(), 3)
+        self.assertEqual(list(self.spool_dir.iterdir()), [])
+
+    def test_views_of_deleted_jobs_are_dropped(self):
+        deleted = self.create_job(title='Electrician')
+        self.view(deleted)
+        self.view(self.job)
+        deleted.delete()
+        self.flush()
+        self.assertEqual(self.views_count(), 1)
+        self.assertEqual(list(JobView.objects.values_list('job_id', flat=True)), [self.job.pk])
+
+
+class JobViewRollupTest(JobTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.job = self.create_job()
+        self.today = timezone.localdate()
+
+    def add_views(self, days_ago, count, user=None, ip='10.0.0.1', user_agent=None):
+        created_at = day_start(self.today - timedelta(days=days_ago)) + timedelta(hours=9)
+        agent = UserAgent.intern([user_agent]).get(user_agent) if user_agent else None
+        JobView.objects.bulk_create([
+            JobView(job=self.job, user=user, ip_address=ip, user_agent_id=agent, created_at=created_at)
+            for _ in range(count)
+        ])
+
+    def rollup(self, *args):
+        call_command('rollup_job_views', *args, stdout=StringIO())
+
+    def analytics(self, user, **params):
+        self.client.force_authenticate(user)
+        return self.client.get(f'/jobs/{self.job.pk}/analytics/', params)
+
+    def test_daily_totals(self):
+        self.add_views(10, 3, user=self.poster, user_agent='old-browser')
+        self.add_views(10, 2, ip='10.0.0.2')
+        self.add_views(0, 4)
+        self.rollup('--no-purge')
+
+        ten_days_ago = JobViewDaily.objects.get(job=self.job, day=self.today - timedelta(days=10))
+        self.assertEqual((ten_days_ago.views, ten_days_ago.unique_users, ten_days_ago.unique_ips), (5, 1, 2))
+        response = self.analytics(self.poster, days=30)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total_views'], 9)
+        self.assertEqual([row['views'] for row in response.json()['daily']], [5, 4])
+        self.assertEqual(self.analytics(self.poster, days=5).json()['total_views'], 4)
+
+        # Late views of a day in the grace window are picked up on the next run
+        self.add_views(0, 1)
+        self.rollup('--no-purge')
+        self.assertEqual(self.analytics(self.poster).json()['total_views'], 10)
+
+    def test_only_the_poster_sees_analytics(self):
+        other = User.objects.create(username='other', email='other@example.com', role='job_poster')
+        self.assertEqual(self.analytics(other).status_code, 404)
+
+    def test_purge_keeps_totals(self):
+        self.add_views(30, 3, user_agent='old-browser')
+        self.add_views(2, 2, user_agent='new-browser')
+        self.add_views(0, 1)
+        self.rollup('--no-purge')
+        before = view_totals([self.job.pk])
+
+        self.rollup('--retention-days', '7')
+        self.assertEqual(JobView.objects.count(), 3)
+        # The rollups still hold the purged days, and unused user agents go with their views
+        self.assertEqual(view_totals([self.job.pk]), before)
+        self.assertEqual(before, {self.job.pk: 6})
+        self.assertEqual(list(UserAgent.objects.values_list('user_agent', flat=True)), ['new-browser'])
+
+
+@override_settings(RECOMMENDATION_SYNC_SECONDS=0)
+class RecommendationTest(JobTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        # The index is per process; start each test without one
+        recommendations._index = None
+        self.addCleanup(setattr, recommendations, '_index', None)
+        self.seeker = User.objects.create(username='seeker', email='seeker@example.com')
+        profile = JobSeekerProfile.objects.create(user=self.seeker, city='Pune', state='Maharashtra')
+        self.masonry = Skill.objects.create(name='Masonry')
+        JobSeekerSkill.objects.create(
+            job_seeker=profile, skill=self.masonry, proficiency_level='expert', years_of_experience=5,
+        )
+
+    def create_job(self, skill=None, **fields):
+        job = super().create_job(**fields)
+        if skill is not None:
+            JobSkillRequirement.objects.create(job=job, skill=skill)
+        return job
+
+    def recommended(self, **params):
+        self.client.force_authenticate(self.seeker)
+        return [job['id'] for job in self.get('/jobs/recommended/', **params)]
+
+    def test_matching_skills_rank_first(self):
+        welding = Skill.objects.create(name='Welding')
+        other = self.create_job(welding, title='Welder')
+        match = self.create_job(self.masonry, title='Mason')
+        self.assertEqual(self.recommended(), [str(match.pk), str(other.pk)])
+
+    def test_changes_from_other_processes_are_synced(self):
+        welding = Skill.objects.create(name='Welding')
+        deleted = self.create_job(self.masonry, title='Bricklayer')
+        closed = self.create_job(self.masonry, title='Plasterer')
+        kept = self.create_job(self.masonry, title='Mason')
+        # Half a skill match, so these rank below the three above
+        fallback = [self.create_job(self.masonry, title=f'Fabricator {i}') for i in range(2)]
+        for job in fallback:
+            JobSkillRequirement.objects.create(job=job, skill=welding)
+        self.assertEqual(set(self.recommended(limit=3)), {str(deleted.pk), str(closed.pk), str(kept.pk)})
+
+        # Within a test transaction the on-commit update of this process's index never runs,
+        # so the index only learns about these changes through sync
+        deleted.delete()
+        closed.status = 'closed'
+        closed.save()
+        added = self.create_job(self.masonry, title='Tiler')
+        recommended = self.recommended(limit=3)
+        self.assertEqual(set(recommended[:2]), {str(added.pk), str(kept.pk)})
+        # The page is still full
+        self.assertIn(recommended[2], {str(job.pk) for job in fallback})
+
+
+class JobAlertPercolatorTest(JobTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.seeker = User.objects.create(username='seeker', email='seeker@example.com')
+
+    def alert(self, **fields):
+        return JobAlert.objects.create(user=self.seeker, title='My alert', **fields)
+
+    def publish(self, **fields):
+        # Percolation runs once the publishing transaction commits
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.create_job(**fields)
+
+    def matched(self, job):
+        return set(JobAlertMatch.objects.filter(job=job).values_list('alert_id', flat=True))
+
+    def test_criteria(self):
+        anything = self.alert()
+        wanted = self.alert(
+            keywords='Electrician wiring', location='pune', category=self.category,
+            job_type='full_time', experience_level='mid',
+        )
+        by_state = self.alert(keywords='electrician', location='Maharashtra')
+        by_pincode = self.alert(location='411001')
+        self.alert(keywords='electrician plumbing')
+        self.alert(location='Mumbai')
+        self.alert(job_type='contract')
+        self.alert(category=JobCategory.objects.create(name='Retail'))
+        self.alert(keywords='electrician', is_active=False)
+
+        job = self.publish(
+            title='Electrician', description='House WIRING and repairs.', pincode='411001',
+            job_type='full_time', experience_level='mid',
+        )
+        self.assertEqual(self.matched(job), {anything.pk, wanted.pk, by_state.pk, by_pincode.pk})
+
+    def test_minimum_salary(self):
+        modest = self.alert(salary_min=Decimal('20000'))
+        ambitious = self.alert(salary_min=Decimal('60000'))
+        self.alert(salary_min=Decimal('1000'), keywords='plumber')
+        # 180/day is 4,680 a month
+        self.assertEqual(self.matched(self.publish(salary_max=Decimal('180'), salary_type='daily')), set())
+        self.assertEqual(self.matched(self.publish(salary_max=Decimal('25000'))), {modest.pk})
+        self.assertEqual(self.matched(self.publish(salary_max=Decimal('60000'))), {modest.pk, ambitious.pk})
+        self.assertEqual(self.matched(self.publish()), set())
+
+    def test_every_keyword_must_occur(self):
+        # Filed under its longest keyword, but the others are checked too
+        alert = self.alert(keywords='senior electrician')
+        self.assertEqual(alert.anchor_token, 'electrician')
+        self.assertEqual(self.matched(self.publish(title='Electrician')), set())
+        self.assertEqual(self.matched(self.publish(title='Electrician', requirements='Senior role')), {alert.pk})
+
+    def test_editing_an_alert_refiles_it(self):
+        alert = self.alert(keywords='plumber')
+        alert.keywords = 'electrician'
+        alert.location = 'Pune'
+        alert.save(update_fields=['keywords', 'location'])
+        self.assertEqual(self.matched(self.publish(title='Electrician')), {alert.pk})
+
+    def test_jobs_match_once_when_published(self):
+        alert = self.alert()
+        with self.captureOnCommitCallbacks(execute=True):
+            job = self.create_job(status='draft')
+        self.assertEqual(self.matched(job), set())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            job.status = 'active'
+            job.save()
+        self.assertEqual(self.matched(job), {alert.pk})
+
+        # Later saves and a full re-run leave the match alone
+        with self.captureOnCommitCallbacks(execute=True):
+            job.title = 'Head site supervisor'
+            job.save()
+        call_command('percolate_job_alerts', stdout=StringIO())
+        self.assertEqual(JobAlertMatch.objects.filter(job=job).count(), 1)
+
+
+class JobAlertDigestTest(JobTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.now = timezone.now()
+        self.jobs = [self.create_job(title=f'Carpenter {i}') for i in range(3)]
+
+    def alert(self, email='seeker@example.com', matches=(), **fields):
+        user = User.objects.filter(email=email).first() or User.objects.create(username=email, email=email)
+        alert = JobAlert.objects.create(user=user, title='Carpentry', **fields)
+        JobAlertMatch.objects.bulk_create(JobAlertMatch(alert=alert, job=job) for job in matches)
+        return alert
+
+    def send(self, *args):
+        mail.outbox = []
+        call_command('send_job_alerts', *args, stdout=StringIO())
+        return {message.to[0]: message for message in mail.outbox}
+
+    def test_daily_digest(self):
+        alert = self.alert(matches=self.jobs[:2])
+        idle = self.alert(email='idle@example.com')
+        self.alert(email='weekly@example.com', frequency='weekly', matches=self.jobs)
+        self.jobs[0].status = 'closed'
+        self.jobs[0].save()
+
+        sent = self.send('--frequency', 'daily')
+        self.assertEqual(list(sent), ['seeker@example.com'])
+        # The closed job is left out
+        self.assertEqual(sent['seeker@example.com'].subject, '1 new job for "Carpentry"')
+        self.assertIn(f'/jobs/{self.jobs[1].pk}', sent['seeker@example.com'].body)
+        self.assertNotIn(f'/jobs/{self.jobs[0].pk}', sent['seeker@example.com'].body)
+        self.assertFalse(JobAlertMatch.objects.filter(alert=alert, delivered_at__isnull=True).exists())
+        # Alerts with nothing to send also wait for their next interval
+        idle.refresh_from_db()
+        self.assertIsNotNone(idle.last_sent)
+
+        JobAlertMatch.objects.create(alert=alert, job=self.jobs[2])
+        self.assertEqual(self.send('--frequency', 'daily'), {})
+        JobAlert.objects.update(last_sent=self.now - timedelta(days=1))
+        self.assertEqual(sent.keys(), self.send('--frequency', 'daily').keys())
+
+    def test_due_by_frequency(self):
+        self.alert(email='new@example.com', frequency='weekly', matches=self.jobs)
+        self.alert(email='recent@example.com', frequency='weekly', matches=self.jobs,
+                   last_sent=self.now - timedelta(days=3))
+        self.alert(email='due@example.com', frequency='weekly', matches=self.jobs,
+                   last_sent=self.now - timedelta(days=7))
+        self.alert(email='now@example.com', frequency='immediate', matches=self.jobs[:1])
+        self.alert(email='later@example.com', frequency='immediate')
+        self.alert(email='off@example.com', frequency='weekly', matches=self.jobs, is_active=False)
+        inactive = self.alert(email='gone@example.com', frequency='weekly', matches=self.jobs)
+        User.objects.filter(pk=inactive.user_id).update(is_active=False)
+
+        self.assertEqual(set(self.send()), {'new@example.com', 'due@example.com', 'now@example.com'})
+        self.assertEqual(self.send(), {})
+
+    def test_shards_split_the_alerts(self):
+        emails = [f'seeker{i}@example.com' for i in range(12)]
+        for email in emails:
+            self.alert(email=email, matches=self.jobs)
+        sent = []
+        for shard in range(3):
+            sent += list(self.send('--shards', '3', '--shard', str(shard), '--batch-size', '2'))
+        self.assertEqual(sorted(sent), sorted(emails))
+
+        with self.assertRaises(CommandError):
+            self.send('--shards', '3', '--shard', '3')
+
+
+class DuplicateJobTest(JobTestMixin, TestCase):
+    description = (
+        'We are hiring an experienced carpenter to build and install custom kitchen cabinets, '
+        'wardrobes and shelving for residential projects across the city. You will read drawings, '
+        'measure sites, cut and join hardwood and plywood, fit hinges and fittings, and finish '
+        'surfaces to a high standard. Own tools preferred; transport to sites is provided daily.'
+    )
+
+    def refresh(self, *jobs):
+        for job in jobs:
+            job.refresh_from_db(fields=['duplicate_cluster'])
+
+    def test_reposts_join_the_earliest_postings_cluster(self):
+        original = self.create_job(title='Carpenter', description=self.description)
+        repost = self.create_job(title='Carpenter', description=self.description.replace('daily', 'every day'))
+        again = self.create_job(title='Carpenter needed', description=self.description)
+        other = self.create_job(title='Electrician', description='Wire new flats and fix faults in old ones.')
+        self.refresh(original, repost, again, other)
+        self.assertEqual(
+            [original.duplicate_cluster, repost.duplicate_cluster, again.duplicate_cluster],
+            [original.pk] * 3,
+        )
+        self.assertIsNone(other.duplicate_cluster)
+
+        # Rewriting a repost takes it out of the cluster; the head stays the head
+        repost.description = 'Flooring work: lay and polish wooden floors in new apartments.'
+        repost.save()
+        self.refresh(original, repost)
+        self.assertIsNone(repost.duplicate_cluster)
+        self.assertEqual(original.duplicate_cluster, original.pk)
+
+    def test_search_collapses_duplicates(self):
+        original = self.create_job(title='Carpenter', description=self.description)
+        repost = self.create_job(title='Carpenter', description=self.description)
+        other = self.create_job(title='Carpenter', description='Repair doors and windows in an office block.')
+
+        results = self.get('/jobs/search/', search='carpenter', collapse='true')
+        collapsed = {job['id']: job['collapsed_duplicates'] for job in results}
+        self.assertEqual(len(collapsed), 2)
+        self.assertEqual(collapsed.pop(str(other.pk)), 0)
+        # The copies rank alike, so either one can stand for the cluster
+        [(kept, count)] = collapsed.items()
+        self.assertIn(kept, {str(original.pk), str(repost.pk)})
+        self.assertEqual(count, 1)
+        self.assertEqual(len(self.get('/jobs/search/', search='carpenter')), 3)
+
+    def test_rebuild_matches_incremental_clusters(self):
+        jobs = [self.create_job(title='Carpenter', description=self.description) for _ in range(3)]
+        jobs.append(self.create_job(title='Electrician', description='Wire new flats and fix faults in old ones.'))
+        # As after a bulk import that skipped signals
+        Job.objects.update(duplicate_cluster=None)
+        call_command('cluster_duplicate_jobs', '--workers', '2', '--batch-size', '2', stdout=StringIO())
+        self.refresh(*jobs)
+        self.assertEqual([job.duplicate_cluster for job in jobs], [jobs[0].pk] * 3 + [None])
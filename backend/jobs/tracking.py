@@ -0,0 +1,154 @@
+"""Write-behind job view tracking: views are spooled to per-process files and loaded, idempotently, by flush_job_views."""
+import json
+import os
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from users.models import User
+from .models import Job, JobView, UserAgent
+
+# Stored when the client address is unknown, since JobView.ip_address is required
+UNKNOWN_IP = '0.0.0.0'
+
+_lock = threading.Lock()
+_spool = None  # (bucket, pid, file) of the spool file this process appends to
+
+
+def spool_dir():
+    return Path(settings.JOB_VIEW_SPOOL_DIR)
+
+
+def current_bucket():
+    return int(time.time() // settings.JOB_VIEW_SPOOL_ROTATE_SECONDS)
+
+
+def record_view(job_id, user_id=None, ip_address=None, user_agent=None):
+    event = json.dumps({
+        'id': uuid.uuid4().hex,
+        'job': str(job_id),
+        'user': str(user_id) if user_id else None,
+        'ip': ip_address or UNKNOWN_IP,
+        'ua': user_agent or None,
+        'at': timezone.now().isoformat(),
+    })
+    with _lock:
+        _spool_file().write(event + '\n')
+
+
+def close_spool():
+    """Close this process's spool file; the next view opens one under the current settings."""
+    global _spool
+    with _lock:
+        if _spool is not None and _spool[1] == os.getpid():
+            _spool[2].close()
+        _spool = None
+
+
+def _spool_file():
+    global _spool
+    bucket, pid = current_bucket(), os.getpid()
+    # Reopen when the bucket rolls over, or in a freshly forked worker
+    if _spool is None or _spool[:2] != (bucket, pid):
+        if _spool is not None and _spool[1] == pid:
+            _spool[2].close()
+        directory = spool_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f'views-{bucket}-{pid}.jsonl'
+        _spool = (bucket, pid, open(path, 'a', buffering=1, encoding='utf-8'))
+    return _spool[2]
+
+
+def closed_spool_files():
+    """Spool files no process writes to any more, including ones a crashed flush left claimed."""
+    # One bucket of grace covers writers that picked their file just before a rollover
+    closed_before = current_bucket() - 1
+    files = []
+    for path in spool_dir().glob('views-*'):
+        bucket = int(path.name.split('-')[1])
+        if path.suffix == '.flushing' or bucket < closed_before:
+            files.append(path)
+    return sorted(files)
+
+
+def flush_views(batch_size=1000):
+    """Flush every closed spool file; returns the number of views counted."""
+    total = 0
+    for path in closed_spool_files():
+        claimed = path.with_suffix('.flushing')
+        if path != claimed:
+            try:
+                # Claim the file so concurrent flushes don't read it too
+                path.rename(claimed)
+            except FileNotFoundError:
+                continue
+        total += flush_file(claimed, batch_size)
+        claimed.unlink()
+    return total
+
+
+def read_events(path):
+    with open(path, encoding='utf-8') as spool:
+        for line in spool:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # A torn last line from a worker killed mid-write
+                continue
+
+
+def flush_file(path, batch_size):
+    counted = 0
+    batch = []
+    for event in read_events(path):
+        batch.append(event)
+        if len(batch) >= batch_size:
+            counted += flush_events(batch)
+            batch = []
+    if batch:
+        counted += flush_events(batch)
+    return counted
+
+
+def flush_events(events):
+    events = {uuid.UUID(event['id']): event for event in events}
+    job_ids = {uuid.UUID(event['job']) for event in events.values()}
+    user_ids = {uuid.UUID(event['user']) for event in events.values() if event['user']}
+    with transaction.atomic():
+        # Events already loaded by an interrupted flush, and views of since-deleted jobs, are dropped
+        seen = set(JobView.objects.filter(pk__in=list(events)).values_list('pk', flat=True))
+        live_jobs = set(Job.objects.filter(pk__in=job_ids).values_list('pk', flat=True))
+        live_users = set(User.objects.filter(pk__in=user_ids).values_list('pk', flat=True))
+        user_agents = UserAgent.intern(event['ua'] for event in events.values())
+        views = [
+            JobView(
+                id=pk,
+                job_id=uuid.UUID(event['job']),
+                user_id=_live_user(event['user'], live_users),
+                ip_address=event['ip'],
+                user_agent_id=user_agents.get(event['ua']),
+                created_at=parse_datetime(event['at']),
+            )
+            for pk, event in events.items()
+            if pk not in seen and uuid.UUID(event['job']) in live_jobs
+        ]
+        JobView.objects.bulk_create(views)
+
+        increments = Counter(view.job_id for view in views)
+        # Fixed order keeps concurrent flushes from deadlocking on job rows
+        for job_id in sorted(increments):
+            Job.objects.filter(pk=job_id).update(views_count=F('views_count') + increments[job_id])
+    return len(views)
+
+
+def _live_user(user_id, live_users):
+    user_id = uuid.UUID(user_id) if user_id else None
+    return user_id if user_id in live_users else None
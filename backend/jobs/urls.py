@@ -0,0 +1,11 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('jobs/', views.JobListView.as_view(), name='job-list'),
+    path('jobs/recommended/', views.RecommendedJobListView.as_view(), name='job-recommended'),
+    path('jobs/search/', views.JobSearchView.as_view(), name='job-search'),
+    path('jobs/<uuid:pk>/', views.JobDetailView.as_view(), name='job-detail'),
+    path('jobs/<uuid:pk>/analytics/', views.JobAnalyticsView.as_view(), name='job-analytics'),
+    path('categories/', views.JobCategoryListView.as_view(), name='category-list'),
+]
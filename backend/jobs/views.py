@@ -1,3 +1,262 @@
-from django.shortcuts import render
+from datetime import timedelta
 
-# Create your views here.
+from django.conf import settings
+from django.db.models import OuterRef, Subquery
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework import generics, permissions
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from users.models import JobPosterProfile
+from users.serializers import JobPosterProfileSerializer
+from .conditional import ConditionalListMixin, make_etag, not_modified, set_validators
+from .facets import get_job_facets
+from .filters import (
+    clean_job_filters, job_filters_key, apply_job_filters, resolve_origin, cursor_ordering,
+)
+from .fragments import (
+    get_fragments, render_json, splice, splice_raw, join_array, fragment_response, timestamp_version,
+)
+from .models import Job, JobCategory, JobListing, JobViewDaily
+from .pagination import JobCursorPagination
+from .recommendations import recommend_jobs
+from .search import get_search_backend
+from .serializers import JobSerializer, JobSearchResultSerializer, JobCardSerializer, JobCategorySerializer
+from .tracking import record_view
+
+
+def job_list_queryset():
+    return (
+        Job.objects.filter(status='active')
+        .select_related('category', 'posted_by', 'company__user')
+        .prefetch_related('skill_requirements__skill')
+    )
+
+
+def get_job_filters(request):
+    filters = clean_job_filters(request.query_params)
+    if 'radius_km' in filters and not filters.get('location') and 'lat' not in filters:
+        # "Jobs near me": fall back to the job seeker's own pincode or city
+        profile = getattr(request.user, 'job_seeker_profile', None) if request.user.is_authenticated else None
+        if profile is not None:
+            filters['location'] = profile.pincode or profile.city
+    if not resolve_origin(filters):
+        raise ValidationError({'radius_km': 'Provide lat/lng or a known pincode or city as location.'})
+    return filters
+
+
+def collapse_duplicates(jobs):
+    """Keep the first job of each duplicate cluster, counting the ones folded into it."""
+    kept = {}
+    collapsed = []
+    for job in jobs:
+        job.collapsed_duplicates = 0
+        cluster = job.duplicate_cluster or job.pk
+        if cluster in kept:
+            kept[cluster].collapsed_duplicates += 1
+            continue
+        kept[cluster] = job
+        collapsed.append(job)
+    return collapsed
+
+
+def render_job_cards(pks):
+    listings = JobListing.objects.in_bulk(pks)
+    return {pk: render_json(JobCardSerializer(listing).data) for pk, listing in listings.items()}
+
+
+def render_companies(pks):
+    companies = JobPosterProfile.objects.select_related('user').in_bulk(pks)
+    return {pk: render_json(JobPosterProfileSerializer(company).data) for pk, company in companies.items()}
+
+
+def render_categories(pks):
+    categories = JobCategory.objects.in_bulk(pks)
+    return {pk: render_json(JobCategorySerializer(category).data) for pk, category in categories.items()}
+
+
+def render_job_details(pks):
+    """Job detail payloads without the live counters, embedding company and category fragments."""
+    jobs = list(job_list_queryset().filter(pk__in=pks))
+    companies = get_fragments(
+        'company', {(job.company_id, timestamp_version(job.company.updated_at)) for job in jobs}, render_companies,
+    )
+    categories = get_fragments(
+        'category', {(job.category_id, timestamp_version(job.category.updated_at)) for job in jobs}, render_categories,
+    )
+    rendered = {}
+    for job in jobs:
+        data = dict(JobSerializer(job).data)
+        for field in ('company', 'category', 'views_count', 'applications_count'):
+            data.pop(field)
+        fragment = splice_raw(render_json(data), 'company', companies[job.company_id])
+        rendered[job.pk] = splice_raw(fragment, 'category', categories[job.category_id])
+    return rendered
+
+
+class JobListView(generics.ListAPIView):
+    """
+    Job cards served from the flattened JobListing table, with no joins. The
+    page query only reads ids and versions; the cards themselves come from the
+    fragment cache in one round trip.
+    """
+    serializer_class = JobCardSerializer
+    pagination_class = JobCursorPagination
+    permission_classes = [permissions.AllowAny]
+    read_from_replicas = True
+
+    def get_queryset(self):
+        self.filters = get_job_filters(self.request)
+        self.filters_key = job_filters_key(self.filters)
+        self.cursor_ordering = cursor_ordering(self.filters)
+        return apply_job_filters(JobListing.objects.all(), self.filters)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.get_queryset().only('id', 'version', 'created_at', 'salary_max_monthly')
+        page = self.paginate_queryset(queryset)
+        versions = [(row.pk, row.version) for row in page]
+        envelope = self.paginator.get_paginated_envelope()
+        # Sidebar counts ride along with the page when asked for
+        if request.query_params.get('facets') in ('1', 'true'):
+            envelope['facets'] = get_job_facets(JobListing.objects.all(), self.filters)
+
+        # The page is fully described by the filters, its rows' versions and the envelope
+        etag = make_etag(request.get_full_path(), self.filters_key, versions, envelope)
+        response = not_modified(request, etag)
+        if response is None:
+            cards = get_fragments('job_card', versions, render_job_cards)
+            results = [
+                splice(cards[row.pk], distance_km=self.get_distance(row))
+                for row in page if row.pk in cards
+            ]
+            response = fragment_response(splice_raw(render_json(envelope), 'results', join_array(results)))
+        # Private: "jobs near me" falls back to the signed-in seeker's own location
+        return set_validators(response, etag, private=True, no_cache=True)
+
+    def get_distance(self, row):
+        distance = getattr(row, 'distance_km', None)
+        return round(distance, 2) if distance is not None else None
+
+
+class JobDetailView(generics.RetrieveAPIView):
+    serializer_class = JobSerializer
+    permission_classes = [permissions.AllowAny]
+    read_from_replicas = True
+
+    def get_queryset(self):
+        return job_list_queryset()
+
+    def retrieve(self, request, *args, **kwargs):
+        pk = kwargs['pk']
+        row = (
+            Job.objects.filter(pk=pk, status='active')
+            .annotate(version=Subquery(JobListing.objects.filter(pk=OuterRef('pk')).values('version')[:1]))
+            .values('version', 'updated_at', 'views_count', 'applications_count')
+            .first()
+        )
+        if row is None:
+            raise NotFound()
+        # Spooled and counted later by flush_job_views, off the request path
+        record_view(
+            pk, request.user.pk if request.user.is_authenticated else None,
+            request.META.get('REMOTE_ADDR'), request.META.get('HTTP_USER_AGENT'),
+        )
+        version = row['version'] or timestamp_version(row['updated_at'])
+        etag = make_etag('job', pk, version, row['views_count'], row['applications_count'])
+        response = not_modified(request, etag)
+        if response is None:
+            details = get_fragments('job', [(pk, version)], render_job_details)
+            if pk not in details:
+                raise NotFound()
+            # Counters change far more often than the job, so they are never cached
+            response = fragment_response(splice(
+                details[pk], views_count=row['views_count'], applications_count=row['applications_count'],
+            ))
+        return set_validators(response, etag, no_cache=True)
+
+
+class RecommendedJobListView(APIView):
+    """The signed-in job seeker's best matching jobs, as cards with a `match_score`."""
+    max_limit = 100
+
+    def get(self, request):
+        profile = getattr(request.user, 'job_seeker_profile', None)
+        if profile is None:
+            raise PermissionDenied('Recommendations are only available to job seekers.')
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), self.max_limit)
+        except ValueError:
+            raise ValidationError({'limit': 'Must be a whole number.'})
+
+        matches = recommend_jobs(profile, limit)
+        versions = dict(
+            JobListing.objects.filter(pk__in=[job_id for job_id, _ in matches]).values_list('pk', 'version')
+        )
+        cards = get_fragments('job_card', versions.items(), render_job_cards)
+        return fragment_response(join_array([
+            splice(cards[job_id], match_score=round(score, 4))
+            for job_id, score in matches if job_id in cards
+        ]))
+
+
+class JobAnalyticsView(APIView):
+    """Daily view totals for one of the signed-in employer's jobs, read from the rollups only."""
+    max_days = 365
+
+    def get(self, request, pk):
+        job = get_object_or_404(Job.objects.only('pk'), pk=pk, posted_by=request.user)
+        try:
+            days = min(max(int(request.query_params.get('days', 30)), 1), self.max_days)
+        except ValueError:
+            raise ValidationError({'days': 'Must be a whole number.'})
+        since = timezone.localdate() - timedelta(days=days - 1)
+        daily = list(
+            JobViewDaily.objects.filter(job=job, day__gte=since)
+            .order_by('day')
+            .values('day', 'views', 'unique_users', 'unique_ips')
+        )
+        return Response({
+            'job': job.pk,
+            'days': days,
+            'total_views': sum(row['views'] for row in daily),
+            'daily': daily,
+        })
+
+
+class JobCategoryListView(ConditionalListMixin, generics.ListAPIView):
+    serializer_class = JobCategorySerializer
+    pagination_class = None
+    permission_classes = [permissions.AllowAny]
+    read_from_replicas = True
+    cache_control = {'public': True, 'max_age': settings.TAXONOMY_CACHE_MAX_AGE}
+
+    def get_queryset(self):
+        return JobCategory.objects.filter(is_active=True)
+
+
+class JobSearchView(generics.ListAPIView):
+    """
+    Top matches for `search` ordered by relevance, with highlighted snippets.
+    With `collapse=true`, near-duplicate postings (see jobs.duplicates) fold
+    into their best-ranked one, which reports how many it stands for.
+    """
+    serializer_class = JobSearchResultSerializer
+    pagination_class = None
+    permission_classes = [permissions.AllowAny]
+    read_from_replicas = True
+
+    # Extra hits fetched when collapsing, so folded duplicates don't leave the page short
+    collapse_overfetch = 3
+
+    def get_queryset(self):
+        filters = get_job_filters(self.request)
+        query = filters.pop('search', None)
+        if not query:
+            raise ValidationError({'search': 'This query parameter is required.'})
+        limit = JobCursorPagination().get_page_size(self.request)
+        collapse = self.request.query_params.get('collapse') in ('1', 'true')
+        queryset = apply_job_filters(job_list_queryset(), filters)
+        jobs = get_search_backend().search(queryset, query, limit * self.collapse_overfetch if collapse else limit)
+        return collapse_duplicates(jobs)[:limit] if collapse else jobs
@@ -0,0 +1,273 @@
+"""
+Non-blocking logging: records are queued on the request thread and written as JSON lines by a
+listener thread, dropping (and counting) records when the queue is full.
+"""
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+
+from . import metrics
+
+# LogRecord attributes that aren't `extra=` fields
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'process': record.process,
+            'thread': record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = record.stack_info
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+
+class JSONLinesFileHandler(logging.Handler):
+    """
+    Buffers formatted records and appends them to the current bucket's file in one write. Files
+    are named by time bucket and part, so every process appends to the same one and rotating
+    needs no renames or locks.
+    """
+
+    def __init__(self, directory, prefix='bluehired', rotate_seconds=3600, max_bytes=50 * 1024 * 1024,
+                 backup_count=48, batch_size=200):
+        super().__init__()
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.rotate_seconds = rotate_seconds
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self.setFormatter(JSONFormatter())
+        self._buffer = []
+        self._stream = None
+        self._bucket = None
+        self._part = None
+
+    def emit(self, record):
+        try:
+            self._buffer.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            if not self._buffer:
+                return
+            data = ('\n'.join(self._buffer) + '\n').encode()
+            self._buffer = []
+            try:
+                self._stream_for(len(data)).write(data)
+            except OSError:
+                self.handleError(logging.makeLogRecord({'msg': f'writing {len(data)} bytes of log records'}))
+
+    def close(self):
+        with self.lock:
+            self.flush()
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
+        super().close()
+
+    def reset_after_fork(self):
+        # The parent still holds these lines and will write them itself
+        self._buffer = []
+
+    def _stream_for(self, size):
+        bucket = int(time.time() // self.rotate_seconds)
+        if self._stream is None or bucket != self._bucket:
+            self._open(bucket, self._last_part(bucket))
+        elif os.fstat(self._stream.fileno()).st_size + size > self.max_bytes:
+            self._open(bucket, self._part + 1)
+        return self._stream
+
+    def _path(self, bucket, part):
+        started = time.strftime('%Y%m%d-%H%M%S', time.gmtime(bucket * self.rotate_seconds))
+        return self.directory / f'{self.prefix}-{started}-{part:03d}.jsonl'
+
+    def _last_part(self, bucket):
+        stem = self._path(bucket, 0).name[:-len('000.jsonl')]
+        parts = [int(path.name[len(stem):-len('.jsonl')]) for path in self.directory.glob(f'{stem}*.jsonl')]
+        return max(parts, default=0)
+
+    def _open(self, bucket, part):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Other processes may have filled this part already; they advance the same way
+        path = self._path(bucket, part)
+        while path.exists() and path.stat().st_size >= self.max_bytes:
+            part += 1
+            path = self._path(bucket, part)
+        if self._stream is not None:
+            self._stream.close()
+        # Unbuffered append: every batch is a single write() to the end of the file
+        self._stream = open(path, 'ab', buffering=0)
+        self._bucket, self._part = bucket, part
+        self._prune(path)
+
+    def _prune(self, current):
+        # Names start with the bucket's start time, so they sort oldest first
+        files = sorted(self.directory.glob(f'{self.prefix}-*.jsonl'))
+        for path in files[:max(len(files) - self.backup_count, 0)]:
+            if path != current:
+                path.unlink(missing_ok=True)
+
+
+class BatchingQueueListener(QueueListener):
+    """A QueueListener that also flushes its handlers every `flush_seconds`."""
+
+    def __init__(self, queue, *handlers, flush_seconds=1.0, on_wake=None):
+        super().__init__(queue, *handlers, respect_handler_level=True)
+        self.flush_seconds = flush_seconds
+        self.on_wake = on_wake
+        self._flushed_at = time.monotonic()
+
+    def dequeue(self, block):
+        while True:
+            if self.on_wake is not None:
+                self.on_wake()
+            remaining = self._flushed_at + self.flush_seconds - time.monotonic()
+            if remaining <= 0:
+                self.flush()
+                continue
+            try:
+                return self.queue.get(timeout=remaining)
+            except queue.Empty:
+                pass
+
+    def flush(self):
+        for handler in self.handlers:
+            handler.flush()
+        self._flushed_at = time.monotonic()
+
+    def enqueue_sentinel(self):
+        # Blocks rather than failing on a full queue; the listener is draining it
+        self.queue.put(self._sentinel)
+
+
+class QueuedHandler(QueueHandler):
+    """
+    Puts records on a bounded queue for a BatchingQueueListener that writes
+    them to a JSONLinesFileHandler in `directory` and, with `console`, to
+    stderr. Configured from LOGGING with `'()': 'monitoring.logs.QueuedHandler'`.
+    """
+
+    def __init__(self, directory, queue_size=10000, console=False, flush_seconds=1.0, **file_options):
+        # Created first, so logging.shutdown() closes this handler, and stops its listener, before them
+        self.targets = [JSONLinesFileHandler(directory, **file_options)]
+        if console:
+            self.targets.append(logging.StreamHandler())
+        super().__init__(queue.Queue(queue_size))
+        self.queue_size = queue_size
+        self.flush_seconds = flush_seconds
+        self.dropped = 0
+        self._reported = 0
+        self._dropped_lock = threading.Lock()
+        self.listener = None
+        self._start()
+        os.register_at_fork(after_in_child=self._restart_after_fork)
+
+    def _start(self):
+        self.listener = BatchingQueueListener(
+            self.queue, *self.targets, flush_seconds=self.flush_seconds, on_wake=self._report_drops,
+        )
+        self.listener.start()
+
+    def _restart_after_fork(self):
+        if self.listener is None:
+            return
+        # The listener thread doesn't survive a fork; the child gets its own
+        self.queue = queue.Queue(self.queue_size)
+        self.dropped = self._reported = 0
+        self._dropped_lock = threading.Lock()
+        for target in self.targets:
+            if isinstance(target, JSONLinesFileHandler):
+                target.reset_after_fork()
+        self._start()
+
+    def prepare(self, record):
+        # Like QueueHandler.prepare, but keeps the traceback apart from the message for the JSON output
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg, record.args, record.exc_info = record.message, None, None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+            metrics.LOG_RECORDS_DROPPED.inc()
+
+    def _report_drops(self):
+        dropped = self.dropped
+        if dropped == self._reported:
+            return
+        record = logging.makeLogRecord({
+            'name': __name__,
+            'levelno': logging.WARNING,
+            'levelname': 'WARNING',
+            'msg': f'{dropped - self._reported} log records dropped: the logging queue was full',
+            'dropped': dropped - self._reported,
+        })
+        self._reported = dropped
+        self.listener.handle(record)
+
+    def close(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+        for target in self.targets:
+            target.close()
+        super().close()
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Passes `rates[name]` of the records below WARNING from logger `name`
+    and its children, e.g. `{'monitoring.middleware': 0.1}`. The most
+    specific name wins. Loggers not listed pass everything.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = {name: float(rate) for name, rate in (rates or {}).items()}
+        self._resolved = {}
+
+    def rate(self, name):
+        rate = self._resolved.get(name)
+        if rate is None:
+            candidates = [key for key in self.rates if name == key or name.startswith(f'{key}.')]
+            rate = self._resolved[name] = self.rates[max(candidates, key=len)] if candidates else 1.0
+        return rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self.rate(record.name)
+        return rate >= 1 or random.random() < rate
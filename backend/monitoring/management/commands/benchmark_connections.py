@@ -0,0 +1,145 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.db.backends.signals import connection_created
+from django.test import Client
+
+from config.db.pool import all_pools
+from jobs.benchmarks import scratch_view_spool
+from jobs.models import Job
+
+# Settings each mode runs under; DB_* are read from the environment by config.settings
+MODES = {
+    'no-reuse': {'DB_POOL': 'False', 'DB_CONN_MAX_AGE': '0'},
+    'persistent': {'DB_POOL': 'False', 'DB_CONN_MAX_AGE': '60'},
+    'pooled': {'DB_POOL': 'True'},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare request latency (p50/p99) with a new connection per request, persistent connections '
+        'and the connection pool, at several levels of concurrency'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', default='1,8,32',
+            help='Comma separated numbers of concurrent request threads (default: 1,8,32)',
+        )
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per mode and concurrency level')
+        parser.add_argument('--mode', action='append', choices=list(MODES), help='Only these modes (repeatable)')
+        parser.add_argument('--pool-size', type=int, default=10, help='DB_POOL_MAX_SIZE for the pooled mode')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+        # Internal: run one mode and concurrency level in this process and print its numbers
+        parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        concurrency = [int(level) for level in options['concurrency'].split(',')]
+        if options['worker']:
+            # The detail requests spool views, which flush_job_views would add to the job's real counters
+            with scratch_view_spool():
+                result = self.run_worker(concurrency[0], options['requests'])
+            self.stdout.write(json.dumps(result))
+            return
+
+        if connection.vendor != 'postgresql':
+            raise CommandError(
+                'Connection reuse only matters for PostgreSQL; run with DEBUG=False and the DB_* settings '
+                'pointing at a server with data (e.g. from populate_sample_data)'
+            )
+        results = []
+        self.stdout.write(f'{"mode":<12}{"threads":>8}{"p50 ms":>10}{"p99 ms":>10}{"req/s":>10}{"opened":>8}{"errors":>8}')
+        for mode in options['mode'] or list(MODES):
+            for level in concurrency:
+                result = {'mode': mode, 'concurrency': level, **self.run_mode(mode, level, options)}
+                results.append(result)
+                self.stdout.write(
+                    f'{mode:<12}{level:>8}{result["p50_ms"]:>10.2f}{result["p99_ms"]:>10.2f}'
+                    f'{result["throughput"]:>10.0f}{result["connections_opened"]:>8}{result["errors"]:>8}'
+                )
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f'💾 Results written to {options["output"]}')
+
+    def run_mode(self, mode, level, options):
+        # A process per run, so each mode gets its own settings and starts without connections
+        env = {**os.environ, **MODES[mode], 'DB_POOL_MAX_SIZE': str(options['pool_size'])}
+        command = [
+            sys.executable, '-m', 'django', 'benchmark_connections', '--worker',
+            '--concurrency', str(level), '--requests', str(options['requests']),
+        ]
+        completed = subprocess.run(command, env=env, cwd=settings.BASE_DIR, capture_output=True, text=True)
+        if completed.returncode:
+            raise CommandError(f'{mode} with {level} threads failed:\n{completed.stderr}')
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+
+    def run_worker(self, threads, requests):
+        job = Job.objects.filter(status='active').order_by('-views_count', 'pk').first()
+        if job is None:
+            raise CommandError('No active jobs; generate data first')
+        paths = ['/jobs/', f'/jobs/{job.pk}/', '/categories/']
+        connection.close()
+
+        opened = 0
+        opened_lock = threading.Lock()
+
+        def count_connection(**kwargs):
+            nonlocal opened
+            with opened_lock:
+                opened += 1
+
+        connection_created.connect(count_connection)
+        latencies = []
+        errors = 0
+        per_thread = max(requests // threads, 1)
+
+        def run():
+            nonlocal errors
+            client = Client(HTTP_HOST='localhost', raise_request_exception=False)
+            timings = []
+            failed = 0
+            for i in range(per_thread):
+                # What the request_started and request_finished handlers do around a real request
+                started = time.perf_counter()
+                close_old_connections()
+                status = client.get(paths[i % len(paths)]).status_code
+                close_old_connections()
+                timings.append(time.perf_counter() - started)
+                failed += status >= 500
+            connection.close()
+            with opened_lock:
+                latencies.extend(timings)
+                errors += failed
+
+        workers = [threading.Thread(target=run) for _ in range(threads)]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+
+        pools = all_pools()
+        percentiles = statistics.quantiles(latencies, n=100)
+        return {
+            'requests': len(latencies),
+            'p50_ms': round(statistics.median(latencies) * 1000, 3),
+            'p99_ms': round(percentiles[98] * 1000, 3),
+            'mean_ms': round(statistics.fmean(latencies) * 1000, 3),
+            'throughput': round(len(latencies) / elapsed, 1),
+            # A pooled checkout also sends connection_created, so count what the pool really opened
+            'connections_opened': sum(pool.opened for pool in pools) if pools else opened,
+            'errors': errors,
+        }
@@ -0,0 +1,76 @@
+import json
+import sys
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from monitoring.profiling import (
+    format_collapsed, parse_name, profile_dir, read_collapsed, to_speedscope, to_svg,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Merge the request profiles of one route (e.g. "/jobs/<uuid:pk>/") into an aggregate flamegraph; '
+        'without a route, list the profiled routes'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('route', nargs='?', help='URL pattern as listed, e.g. /jobs/<uuid:pk>/')
+        parser.add_argument('--since', type=float, help='Only profiles from the last SINCE hours')
+        parser.add_argument(
+            '--format', choices=['svg', 'speedscope', 'collapsed'], default='svg',
+            help='SVG flamegraph, speedscope JSON, or collapsed stacks for flamegraph.pl/inferno (default: svg)',
+        )
+        parser.add_argument('--output', default='-', help='File to write (default: stdout)')
+
+    def handle(self, *args, **options):
+        since = time.time() - options['since'] * 3600 if options['since'] else 0
+        profiles = defaultdict(list)
+        for path in profile_dir().glob('*.collapsed'):
+            parsed = parse_name(path.name)
+            if parsed is not None and parsed[0] >= since:
+                profiles[parsed[1]].append(path)
+
+        if not options['route']:
+            self.list_routes(profiles)
+            return
+
+        route = options['route']
+        stacks = Counter()
+        merged = 0
+        for path in profiles.get(route, ()):
+            try:
+                read_collapsed(path, into=stacks)
+            except FileNotFoundError:
+                # Rotated away while merging
+                continue
+            merged += 1
+        if not merged:
+            raise CommandError(f'No profiles of {route} in {profile_dir()}; run without a route to list them')
+
+        title = f'{route}: {merged} requests, {sum(stacks.values())} samples'
+        if options['format'] == 'svg':
+            content = to_svg(stacks, title)
+        elif options['format'] == 'speedscope':
+            content = json.dumps(to_speedscope(stacks, title, settings.PROFILING_INTERVAL_MS))
+        else:
+            content = format_collapsed(stacks)
+
+        if options['output'] == '-':
+            sys.stdout.write(content)
+            # Keep stdout clean for piping
+            self.stderr.write(f'🔥 {title}')
+        else:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(content)
+            self.stdout.write(self.style.SUCCESS(f'🔥 {title}, written to {options["output"]}'))
+
+    def list_routes(self, profiles):
+        if not profiles:
+            self.stdout.write(f'No profiles in {profile_dir()}')
+            return
+        for route, paths in sorted(profiles.items(), key=lambda item: -len(item[1])):
+            self.stdout.write(f'  {len(paths):>5} profiles  {route}')
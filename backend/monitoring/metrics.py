@@ -0,0 +1,324 @@
+"""
+Prometheus metrics shared across processes: each process adds to a memory-mapped file of its own
+and /metrics/ sums them all.
+"""
+import bisect
+import fcntl
+import json
+import mmap
+import os
+import struct
+import threading
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+
+# Entry layout: key length (int32), key (UTF-8, padded so the value is 8-byte aligned), value (float64)
+_HEADER = struct.Struct('<Q')  # bytes used, header included
+_LENGTH = struct.Struct('<i')
+_VALUE = struct.Struct('<d')
+INITIAL_FILE_SIZE = 64 * 1024
+# Where the counters and histograms of exited processes are summed, so their files can go
+ARCHIVE_NAME = 'archive.db'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+# Methods outside this set are reported as "other", to keep label values bounded
+METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+
+REGISTRY = {}
+
+
+def metrics_dir():
+    return Path(settings.METRICS_DIR)
+
+
+def _entry_size(key_length):
+    return _LENGTH.size + key_length + (-(_LENGTH.size + key_length) % 8) + _VALUE.size
+
+
+def _read_entries(data, used):
+    position = _HEADER.size
+    while position < used:
+        (length,) = _LENGTH.unpack_from(data, position)
+        key = bytes(data[position + _LENGTH.size:position + _LENGTH.size + length]).decode()
+        value_at = position + _entry_size(length) - _VALUE.size
+        yield key, _VALUE.unpack_from(data, value_at)[0], value_at
+        position = value_at + _VALUE.size
+
+
+class ValueFile:
+    """An append-only key -> float table in a memory-mapped file, written by one process."""
+
+    def __init__(self, path):
+        self._file = open(path, 'a+b')
+        size = os.fstat(self._file.fileno()).st_size
+        if size < INITIAL_FILE_SIZE:
+            self._file.truncate(INITIAL_FILE_SIZE)
+            size = INITIAL_FILE_SIZE
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self._used = _HEADER.unpack_from(self._map, 0)[0] or _HEADER.size
+        self._positions = {key: at for key, _, at in _read_entries(self._map, self._used)}
+
+    def add(self, key, amount):
+        position = self._position(key)
+        _VALUE.pack_into(self._map, position, _VALUE.unpack_from(self._map, position)[0] + amount)
+
+    def set(self, key, value):
+        _VALUE.pack_into(self._map, self._position(key), value)
+
+    def _position(self, key):
+        position = self._positions.get(key)
+        return self._append(key) if position is None else position
+
+    def _append(self, key):
+        encoded = key.encode()
+        size = _entry_size(len(encoded))
+        if self._used + size > len(self._map):
+            self._grow(self._used + size)
+        _LENGTH.pack_into(self._map, self._used, len(encoded))
+        self._map[self._used + _LENGTH.size:self._used + _LENGTH.size + len(encoded)] = encoded
+        position = self._used + size - _VALUE.size
+        _VALUE.pack_into(self._map, position, 0.0)
+        self._used += size
+        # Published last, so readers never see a half-written entry
+        _HEADER.pack_into(self._map, 0, self._used)
+        self._positions[key] = position
+        return position
+
+    def _grow(self, needed):
+        size = len(self._map)
+        while size < needed:
+            size *= 2
+        self._map.close()
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+
+
+def read_values(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < _HEADER.size:
+        return
+    used = min(_HEADER.unpack_from(data, 0)[0], len(data))
+    for key, value, _ in _read_entries(data, used):
+        yield key, value
+
+
+def write_values(path, values):
+    """Write {key: value} to `path` in the ValueFile format, replacing it atomically."""
+    entries = bytearray()
+    for key, value in values.items():
+        encoded = key.encode()
+        entry = bytearray(_entry_size(len(encoded)))
+        _LENGTH.pack_into(entry, 0, len(encoded))
+        entry[_LENGTH.size:_LENGTH.size + len(encoded)] = encoded
+        _VALUE.pack_into(entry, len(entry) - _VALUE.size, value)
+        entries += entry
+    partial = path.with_suffix('.partial')
+    partial.write_bytes(_HEADER.pack(_HEADER.size + len(entries)) + entries)
+    os.replace(partial, path)
+
+
+_lock = threading.Lock()
+_values = None  # (pid, ValueFile) of this process
+
+
+def _update(updates, replace=False):
+    global _values
+    with _lock:
+        pid = os.getpid()
+        # A forked worker gets a file of its own
+        if _values is None or _values[0] != pid:
+            directory = metrics_dir()
+            directory.mkdir(parents=True, exist_ok=True)
+            _values = (pid, ValueFile(directory / f'metrics-{pid}.db'))
+        for key, amount in updates:
+            if replace:
+                _values[1].set(key, amount)
+            else:
+                _values[1].add(key, amount)
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+@lru_cache(maxsize=4096)
+def _key(name, suffix, labels):
+    return json.dumps([name, suffix, labels], separators=(',', ':'))
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        REGISTRY[name] = self
+
+    def _labels(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} takes labels {self.labelnames}, got {tuple(labels)}')
+        return tuple((name, str(labels[name])) for name in self.labelnames)
+
+    def samples(self, values):
+        for (suffix, labels), value in sorted(values.items()):
+            yield self.name + suffix, labels, value
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        _update([(_key(self.name, '', self._labels(labels)), amount)])
+
+
+class Gauge(Metric):
+    """A current value per process, summed over the running processes and dropped when one exits."""
+    type = 'gauge'
+
+    def set(self, value, **labels):
+        _update([(_key(self.name, '', self._labels(labels)), value)], replace=True)
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        labels = self._labels(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        # Stored per bucket and made cumulative when exported
+        le = _format_value(self.buckets[index]) if index < len(self.buckets) else '+Inf'
+        _update([
+            (_key(self.name, '_bucket', labels + (('le', le),)), 1),
+            (_key(self.name, '_sum', labels), value),
+            (_key(self.name, '_count', labels), 1),
+        ])
+
+    def samples(self, values):
+        label_sets = sorted({labels for suffix, labels in values if suffix != '_bucket'})
+        for labels in label_sets:
+            cumulative = 0
+            for bound in [_format_value(bound) for bound in self.buckets] + ['+Inf']:
+                cumulative += values.get(('_bucket', labels + (('le', bound),)), 0)
+                yield self.name + '_bucket', labels + (('le', bound),), cumulative
+            yield self.name + '_sum', labels, values.get(('_sum', labels), 0)
+            yield self.name + '_count', labels, values.get(('_count', labels), 0)
+
+
+def _pid(path):
+    return int(path.stem.split('-')[1])
+
+
+def fold_exited(directory):
+    """Sum the files of exited processes into the archive and delete them; call under the metrics lock."""
+    exited = [path for path in directory.glob('metrics-*.db') if not _alive(_pid(path))]
+    if not exited:
+        return
+    archive = directory / ARCHIVE_NAME
+    totals = defaultdict(float)
+    if archive.exists():
+        for key, value in read_values(archive):
+            totals[key] += value
+    for path in exited:
+        for key, value in read_values(path):
+            # A gauge describes its process, which is gone
+            if not isinstance(REGISTRY.get(json.loads(key)[0]), Gauge):
+                totals[key] += value
+    write_values(archive, totals)
+    for path in exited:
+        path.unlink()
+
+
+def collect():
+    """{metric name: {(suffix, labels): value}} summed over every process's file and the archive."""
+    directory = metrics_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    totals = defaultdict(lambda: defaultdict(float))
+    with open(directory / 'metrics.lock', 'a') as lock:
+        # Concurrent scrapes would otherwise fold the same file twice or read it after it was folded
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        fold_exited(directory)
+        paths = [directory / ARCHIVE_NAME, *directory.glob('metrics-*.db')]
+        for path in paths:
+            if not path.exists():
+                continue
+            for key, value in read_values(path):
+                name, suffix, labels = json.loads(key)
+                totals[name][suffix, tuple(tuple(label) for label in labels)] += value
+    return totals
+
+
+def render():
+    """Every registered metric in the Prometheus text exposition format."""
+    totals = collect()
+    lines = []
+    for name, metric in sorted(REGISTRY.items()):
+        lines.append(f'# HELP {name} {metric.documentation}')
+        lines.append(f'# TYPE {name} {metric.type}')
+        for sample, labels, value in metric.samples(totals.get(name, {})):
+            lines.append(f'{sample}{_format_labels(labels)} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def method_label(method):
+    return method if method in METHODS else 'other'
+
+
+REQUESTS = Counter('http_requests_total', 'HTTP responses by route, method and status.', ['route', 'method', 'status'])
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', 'Time from request to response, by route.', ['route', 'method'],
+)
+REQUEST_DB_DURATION = Histogram(
+    'http_request_db_duration_seconds', 'Time spent in SQL per request, by route.', ['route', 'method'],
+)
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes', 'Response body size, by route.', ['route', 'method'], buckets=SIZE_BUCKETS,
+)
+
+APPLICATIONS_CREATED = Counter('bluehired_applications_created_total', 'Job applications submitted.')
+JOBS_PUBLISHED = Counter('bluehired_jobs_published_total', 'Jobs that went live for the first time.')
+ALERT_EMAILS_SENT = Counter('bluehired_alert_emails_sent_total', 'Job alert digests emailed.', ['frequency'])
+
+LOG_RECORDS_DROPPED = Counter('log_records_dropped_total', 'Log records dropped because the logging queue was full.')
+
+DB_POOL_CONNECTIONS = Gauge('db_pool_connections', 'Open pooled database connections.', ['alias', 'state'])
+DB_POOL_MAX_CONNECTIONS = Gauge('db_pool_max_connections', 'Pool size limit, summed over processes.', ['alias'])
+DB_POOL_WAITING = Gauge('db_pool_waiting', 'Threads waiting for a pooled connection.', ['alias'])
+DB_POOL_WAIT = Histogram(
+    'db_pool_wait_seconds', 'Time taken to check a connection out of the pool.', ['alias'],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5),
+)
+DB_POOL_TIMEOUTS = Counter('db_pool_timeouts_total', 'Checkouts that gave up waiting for a connection.', ['alias'])
+DB_POOL_CONNECTIONS_OPENED = Counter('db_pool_connections_opened_total', 'Connections the pool opened.', ['alias'])
+DB_REPLICA_FAILOVERS = Counter(
+    'db_replica_failovers_total', 'Times an unreachable replica was skipped for a while.', ['alias'],
+)
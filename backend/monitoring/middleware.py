@@ -0,0 +1,164 @@
+import hmac
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from . import metrics
+from .profiling import Sampler, save_profile
+from .sql import QueryRecorder, QueryTimer
+
+logger = logging.getLogger(__name__)
+
+# Repeated shapes named in the Server-Timing header; the log line lists them all
+SERVER_TIMING_REPEATED = 3
+
+
+def sampled(rate):
+    return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+def route_of(request):
+    match = getattr(request, 'resolver_match', None)
+    return f'/{match.route}' if match is not None and match.route else request.path
+
+
+class MetricsMiddleware:
+    """
+    Records every request in the per-route metrics of monitoring.metrics:
+    latency, SQL time, status and response size. The route label is the URL
+    pattern, and "unmatched" stands in for URLs that don't resolve, so label
+    values stay bounded whatever paths clients request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        match = getattr(request, 'resolver_match', None)
+        route = f'/{match.route}' if match is not None and match.route else 'unmatched'
+        method = metrics.method_label(request.method)
+        metrics.REQUESTS.inc(route=route, method=method, status=response.status_code)
+        metrics.REQUEST_DURATION.observe(elapsed, route=route, method=method)
+        metrics.REQUEST_DB_DURATION.observe(timer.duration, route=route, method=method)
+        if not response.streaming:
+            metrics.RESPONSE_SIZE.observe(len(response.content), route=route, method=method)
+        return response
+
+
+class SQLInstrumentationMiddleware:
+    """
+    Records the SQL of a sample of requests (see monitoring.sql). A sampled
+    response carries a Server-Timing header, and a structured log line is
+    written at WARNING when a statement shape repeats enough to look like an
+    N+1, at INFO otherwise. Requests that aren't sampled cost one random draw.
+
+    Sync only on purpose. Under ASGI, Django runs sync middleware in the
+    same thread as the sync views, and Django's connections are per thread,
+    so the wrappers installed here are the ones the view's queries go
+    through. The same code therefore works under config.wsgi and config.asgi.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not sampled(settings.SQL_INSTRUMENTATION_SAMPLE_RATE):
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        repeated = recorder.repeated(settings.SQL_REPEATED_QUERY_THRESHOLD)
+        if settings.SQL_SERVER_TIMING_HEADER:
+            response['Server-Timing'] = self.server_timing(recorder, repeated, elapsed)
+        self.log(request, response, recorder, repeated, elapsed)
+        return response
+
+    def server_timing(self, recorder, repeated, elapsed):
+        metrics = [
+            f'app;dur={elapsed * 1000:.1f}',
+            f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries"',
+        ]
+        metrics += [
+            f'db-repeated-{fp};dur={seconds * 1000:.1f};desc="{count}x"'
+            for fp, _, count, seconds in repeated[:SERVER_TIMING_REPEATED]
+        ]
+        return ', '.join(metrics)
+
+    def log(self, request, response, recorder, repeated, elapsed):
+        route = route_of(request)
+        fields = {
+            'method': request.method,
+            'route': route,
+            'status': response.status_code,
+            'duration_ms': round(elapsed * 1000, 1),
+            'db_queries': recorder.count,
+            'db_time_ms': round(recorder.duration * 1000, 1),
+            'db_repeated': [
+                {'fingerprint': fp, 'count': count, 'time_ms': round(seconds * 1000, 1), 'sql': statement_shape[:300]}
+                for fp, statement_shape, count, seconds in repeated
+            ],
+        }
+        level = logging.WARNING if repeated else logging.INFO
+        logger.log(
+            level, '%s %s: %d queries in %.1f ms%s',
+            request.method, route, recorder.count, recorder.duration * 1000,
+            f' ({len(repeated)} repeated shapes, possible N+1)' if repeated else '',
+            extra={'sql': fields},
+        )
+
+
+class ProfilingMiddleware:
+    """
+    Runs the sampling profiler (see monitoring.profiling) around one request
+    and writes its stacks to PROFILING_DIR. A request is profiled when it
+    carries `X-Profile: <PROFILING_TOKEN>`, or by chance at
+    PROFILING_SAMPLE_RATE. An empty token turns the header off. Responses to
+    header-triggered requests name their profile in `X-Profile-File`; a
+    request that finishes within one sampling interval leaves no profile.
+
+    Place it last so the stacks begin at the view rather than at the
+    middleware. Sync only, like SQLInstrumentationMiddleware, so the thread
+    it samples is the one the view runs in.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        requested = self.requested(request)
+        if not (requested or sampled(settings.PROFILING_SAMPLE_RATE)):
+            return self.get_response(request)
+
+        with Sampler(settings.PROFILING_INTERVAL_MS / 1000) as sampler:
+            response = self.get_response(request)
+
+        if sampler.samples:
+            route = route_of(request)
+            path = save_profile(sampler.stacks, route)
+            if requested:
+                response['X-Profile-File'] = path.name
+            logger.info('%s %s: profiled, %d samples in %s', request.method, route, sampler.samples, path.name)
+        return response
+
+    def requested(self, request):
+        token = settings.PROFILING_TOKEN
+        header = request.headers.get('X-Profile')
+        return bool(token and header) and hmac.compare_digest(header.encode(), token.encode())
@@ -0,0 +1,221 @@
+"""
+On-demand sampling profiler for single requests: a thread samples the request thread's stack
+(no trace hooks) and the counts are saved in the collapsed-stack format flame graph tools read.
+"""
+import base64
+import html
+import os
+import sys
+import threading
+import time
+import uuid
+import zlib
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+
+SUFFIX = '.collapsed'
+# Longest request path used in a route key, so file names stay within limits for unresolved URLs
+MAX_ROUTE_LENGTH = 150
+
+SVG_WIDTH = 1200
+SVG_FRAME_HEIGHT = 16
+# Frames narrower than this many pixels are left out of the SVG
+SVG_MIN_WIDTH = 0.5
+
+
+def profile_dir():
+    return Path(settings.PROFILING_DIR)
+
+
+@lru_cache(maxsize=1024)
+def _short_path(filename):
+    """`filename` relative to the sys.path entry it was imported from."""
+    best = ''
+    for entry in sys.path:
+        if entry and filename.startswith(entry) and len(entry) > len(best):
+            best = entry
+    return filename[len(best):].lstrip(os.sep) if best else filename
+
+
+@lru_cache(maxsize=8192)
+def frame_label(code):
+    name = getattr(code, 'co_qualname', code.co_name)
+    # ';' separates frames in the collapsed format
+    return f'{_short_path(code.co_filename)}:{name}'.replace(';', ':')
+
+
+class Sampler:
+    """
+    Samples the stack of the thread that enters it until it exits. Stacks
+    are recorded from the frame that entered it down, so the server and
+    outer middleware frames every request shares are left out.
+
+    The sampler needs the GIL to take a sample, so a CPU-bound view is
+    sampled at most every `sys.getswitchinterval()` (5 ms by default).
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._target = None
+        self._root = None
+
+    def __enter__(self):
+        self._target = threading.get_ident()
+        self._root = sys._getframe(1)
+        self._thread = threading.Thread(target=self._run, name='profiling-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self._root = None
+        return False
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                return
+            labels = []
+            while frame is not None and frame is not self._root:
+                labels.append(frame_label(frame.f_code))
+                frame = frame.f_back
+            del frame
+            # A sample taken while __exit__ runs shows the sampler, not the request
+            if labels and not self._stop.is_set():
+                labels.reverse()
+                self.stacks[';'.join(labels)] += 1
+                self.samples += 1
+
+
+def route_key(route):
+    # URL-safe, so merge_profiles can find every profile of an endpoint by file name
+    return base64.urlsafe_b64encode(route[:MAX_ROUTE_LENGTH].encode()).decode().rstrip('=')
+
+
+def parse_name(name):
+    """(created at in seconds, route) of a profile file name, or None for other files."""
+    if not name.endswith(SUFFIX):
+        return None
+    try:
+        millis, _, _, key = name[:-len(SUFFIX)].split('-', 3)
+        route = base64.urlsafe_b64decode(key + '=' * (-len(key) % 4)).decode()
+        return int(millis) / 1000, route
+    except ValueError:
+        return None
+
+
+def save_profile(stacks, route):
+    """Write `stacks` as a profile of `route`, rotate the directory, and return the file's path."""
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    name = f'{int(time.time() * 1000)}-{os.getpid()}-{uuid.uuid4().hex[:6]}-{route_key(route)}{SUFFIX}'
+    path = directory / name
+    # Written aside and renamed, so a concurrent merge never reads half a profile
+    partial = path.with_suffix('.partial')
+    partial.write_text(format_collapsed(stacks), encoding='utf-8')
+    os.replace(partial, path)
+    rotate(directory, settings.PROFILING_MAX_FILES)
+    return path
+
+
+def rotate(directory, keep):
+    # Names start with the creation time in milliseconds, so they sort oldest first
+    profiles = sorted(path for path in directory.iterdir() if path.name.endswith(SUFFIX))
+    for path in profiles[:max(len(profiles) - keep, 0)]:
+        # Another process may be rotating too
+        path.unlink(missing_ok=True)
+
+
+def read_collapsed(path, into=None):
+    stacks = Counter() if into is None else into
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            stack, _, count = line.rstrip('\n').rpartition(' ')
+            if stack and count.isdigit():
+                stacks[stack] += int(count)
+    return stacks
+
+
+def format_collapsed(stacks):
+    return ''.join(f'{stack} {count}\n' for stack, count in sorted(stacks.items()))
+
+
+def to_speedscope(stacks, name, interval_ms):
+    """`stacks` as a speedscope sampled profile, weighted in milliseconds."""
+    frames = {}
+    samples = []
+    weights = []
+    for stack, count in sorted(stacks.items()):
+        samples.append([frames.setdefault(label, len(frames)) for label in stack.split(';')])
+        weights.append(count * interval_ms)
+    return {
+        '$schema': 'https://www.speedscope.app/file-format-schema.json',
+        'shared': {'frames': [{'name': label} for label in frames]},
+        'profiles': [{
+            'type': 'sampled',
+            'name': name,
+            'unit': 'milliseconds',
+            'startValue': 0,
+            'endValue': sum(weights),
+            'samples': samples,
+            'weights': weights,
+        }],
+        'name': name,
+        'exporter': 'bluehired merge_profiles',
+    }
+
+
+def to_svg(stacks, title):
+    """A static flamegraph of `stacks`: roots at the bottom, widths proportional to samples."""
+    tree = {}
+    for stack, count in stacks.items():
+        children = tree
+        for label in stack.split(';'):
+            node = children.setdefault(label, [0, {}])
+            node[0] += count
+            children = node[1]
+
+    total = sum(stacks.values()) or 1
+    depth = _depth(tree)
+    height = (depth + 3) * SVG_FRAME_HEIGHT
+    scale = SVG_WIDTH / total
+    rects = []
+
+    def layout(children, x, level):
+        for label, (count, grandchildren) in sorted(children.items()):
+            width = count * scale
+            if width >= SVG_MIN_WIDTH:
+                y = height - (level + 1) * SVG_FRAME_HEIGHT
+                hue = zlib.crc32(label.encode()) % 60
+                tip = html.escape(f'{label} ({count} samples, {count * 100 / total:.1f}%)')
+                text = html.escape(label[:int(width / 7)]) if width > 35 else ''
+                rects.append(
+                    f'<g><title>{tip}</title>'
+                    f'<rect x="{x:.1f}" y="{y}" width="{width:.1f}" height="{SVG_FRAME_HEIGHT - 1}" '
+                    f'fill="hsl({hue},80%,60%)"/>'
+                    f'<text x="{x + 3:.1f}" y="{y + SVG_FRAME_HEIGHT - 4}">{text}</text></g>'
+                )
+                layout(grandchildren, x, level + 1)
+            x += width
+
+    layout(tree, 0.0, 0)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{SVG_WIDTH}" height="{height}" '
+        f'font-family="monospace" font-size="11">'
+        f'<text x="{SVG_WIDTH / 2}" y="{SVG_FRAME_HEIGHT}" text-anchor="middle" font-size="14">'
+        f'{html.escape(title)}</text>'
+        + ''.join(rects) + '</svg>\n'
+    )
+
+
+def _depth(children):
+    return max((1 + _depth(node[1]) for node in children.values()), default=0)
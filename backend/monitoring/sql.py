@@ -0,0 +1,76 @@
+"""
+Per-request SQL instrumentation: query counts and time, grouped by statement shape so a
+query repeated once per row (an N+1) shows up under one fingerprint.
+"""
+import hashlib
+import re
+import time
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'(?<![\w"])-?\d+(?:\.\d+)?\b')
+_LIST_RE = re.compile(r'\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)')
+_VALUES_RE = re.compile(r'(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+')
+_SPACE_RE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=2048)
+def shape(sql):
+    """`sql` with literals and placeholder lists collapsed."""
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = _LIST_RE.sub('(...)', sql)
+    sql = _VALUES_RE.sub(r'\1', sql)
+    return _SPACE_RE.sub(' ', sql).strip()
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement_shape):
+    return hashlib.md5(statement_shape.encode()).hexdigest()[:8]
+
+
+class QueryTimer:
+    """An execute wrapper that only counts statements and sums their time."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+class QueryRecorder:
+    """An execute wrapper that records count, time and shapes of the statements it sees."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+        self.shape_durations = defaultdict(float)
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            statement_shape = shape(sql)
+            self.count += 1
+            self.duration += elapsed
+            self.shapes[statement_shape] += 1
+            self.shape_durations[statement_shape] += elapsed
+
+    def repeated(self, threshold):
+        """[(fingerprint, shape, count, seconds), ...] of shapes run `threshold` or more times, most first."""
+        return [
+            (fingerprint(statement_shape), statement_shape, count, self.shape_durations[statement_shape])
+            for statement_shape, count in self.shapes.most_common()
+            if count >= threshold
+        ]
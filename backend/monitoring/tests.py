@@ -0,0 +1,59 @@
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from . import metrics
+
+
+class MetricsTestMixin:
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        overridden = override_settings(METRICS_DIR=directory.name)
+        overridden.enable()
+        self.addCleanup(overridden.disable)
+
+    def write_process_file(self, pid, values):
+        metrics.write_values(self.directory / f'metrics-{pid}.db', {
+            metrics._key(name, suffix, labels): value for (name, suffix, labels), value in values.items()
+        })
+
+
+class MetricsArchiveTest(MetricsTestMixin, TestCase):
+    def test_exited_processes_are_folded_into_the_archive(self):
+        applications = ('bluehired_applications_created_total', '', ())
+        waiting = ('db_pool_waiting', '', (('alias', 'default'),))
+        self.write_process_file(101, {applications: 3, waiting: 2})
+        self.write_process_file(102, {applications: 4, waiting: 1})
+        self.write_process_file(103, {applications: 5, waiting: 7})
+
+        with mock.patch.object(metrics, '_alive', lambda pid: pid == 103):
+            totals = metrics.collect()
+            self.assertEqual(totals['bluehired_applications_created_total']['', ()], 12)
+            # Only the running process's gauge is left
+            self.assertEqual(totals['db_pool_waiting']['', (('alias', 'default'),)], 7)
+            self.assertEqual(
+                sorted(path.name for path in self.directory.glob('*.db')), ['archive.db', 'metrics-103.db'],
+            )
+
+            # Later folds add to the archive instead of replacing it
+            self.write_process_file(104, {applications: 1})
+            totals = metrics.collect()
+        self.assertEqual(totals['bluehired_applications_created_total']['', ()], 13)
+        self.assertFalse((self.directory / 'metrics-104.db').exists())
+
+
+class MetricsViewTest(MetricsTestMixin, TestCase):
+    @override_settings(DEBUG=False, METRICS_TOKEN='')
+    def test_disabled_without_token_in_production(self):
+        self.assertEqual(self.client.get('/metrics/').status_code, 404)
+
+    @override_settings(DEBUG=False, METRICS_TOKEN='scrape-secret')
+    def test_requires_token(self):
+        self.assertEqual(self.client.get('/metrics/').status_code, 403)
+        response = self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'# TYPE http_requests_total counter', response.content)
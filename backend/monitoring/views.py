@@ -0,0 +1,23 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+
+from . import metrics
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@require_GET
+def metrics_view(request):
+    """Prometheus scrape endpoint; see monitoring.metrics."""
+    token = settings.METRICS_TOKEN
+    if not token and not settings.DEBUG:
+        # Only development serves metrics without a token
+        raise Http404
+    if token:
+        authorization = request.headers.get('Authorization', '')
+        if not hmac.compare_digest(authorization.encode(), f'Bearer {token}'.encode()):
+            return HttpResponseForbidden()
+    return HttpResponse(metrics.render(), content_type=PROMETHEUS_CONTENT_TYPE)
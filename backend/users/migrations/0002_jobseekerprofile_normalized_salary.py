@@ -0,0 +1,27 @@
+# Generated by Django 4.2.23 on 2026-10-17 20:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobseekerprofile',
+            name='expected_salary_max_monthly',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobseekerprofile',
+            name='expected_salary_min_monthly',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='jobseekerprofile',
+            index=models.Index(fields=['expected_salary_min_monthly', 'expected_salary_max_monthly'], name='seeker_expected_salary_idx'),
+        ),
+    ]
@@ -104,14 +104,39 @@ class JobSeekerProfile(models.Model):
     availability = models.BooleanField(default=True)
     expected_salary_min = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
     expected_salary_max = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    # Monthly expected salary in paise, comparable with Job.salary_*_monthly
+    expected_salary_min_monthly = models.BigIntegerField(blank=True, null=True, editable=False)
+    expected_salary_max_monthly = models.BigIntegerField(blank=True, null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.user.email} - Job Seeker Profile"
     
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or set(update_fields) & {'expected_salary_min', 'expected_salary_max'}:
+            self.update_normalized_salary()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {
+                    'expected_salary_min_monthly', 'expected_salary_max_monthly',
+                }
+        super().save(*args, **kwargs)
+    
+    def update_normalized_salary(self):
+        # Expected salaries are entered per month
+        from jobs.salary import monthly_minor_units
+        self.expected_salary_min_monthly = monthly_minor_units(self.expected_salary_min)
+        self.expected_salary_max_monthly = monthly_minor_units(self.expected_salary_max)
+    
     class Meta:
         db_table = 'job_seeker_profiles'
+        indexes = [
+            models.Index(
+                fields=['expected_salary_min_monthly', 'expected_salary_max_monthly'],
+                name='seeker_expected_salary_idx',
+            ),
+        ]
 
 
 class JobPosterProfile(models.Model):
@@ -168,6 +193,7 @@ class Skill(models.Model):
     description = models.TextField(blank=True, null=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return self.name
@@ -0,0 +1,32 @@
+from rest_framework import serializers
+from .models import User, JobPosterProfile, Skill
+
+
+class UserSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = [
+            'id', 'email', 'first_name', 'last_name', 'role',
+            'phone_number', 'is_verified', 'created_at',
+        ]
+        read_only_fields = fields
+
+
+class JobPosterProfileSerializer(serializers.ModelSerializer):
+    user = UserSerializer(read_only=True)
+
+    class Meta:
+        model = JobPosterProfile
+        fields = [
+            'id', 'user', 'company_name', 'company_description', 'company_size',
+            'industry', 'website', 'company_logo', 'address', 'city', 'state',
+            'pincode', 'contact_phone', 'is_company_verified',
+        ]
+        read_only_fields = fields
+
+
+class SkillSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Skill
+        fields = ['id', 'name', 'category', 'description']
+        read_only_fields = fields
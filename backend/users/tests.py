@@ -1,3 +1,29 @@
+from decimal import Decimal
+
 from django.test import TestCase
 
-# Create your tests here.
+from .models import User, JobSeekerProfile
+
+
+class JobSeekerProfileSalaryTest(TestCase):
+    def setUp(self):
+        user = User.objects.create(username='seeker', email='seeker@example.com')
+        self.profile = JobSeekerProfile.objects.create(user=user, expected_salary_min=Decimal('20000'))
+
+    def test_salary_save_normalizes(self):
+        self.profile.expected_salary_min = Decimal('25000')
+        self.profile.save(update_fields=['expected_salary_min'])
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.expected_salary_min_monthly, 2500000)
+
+    def test_unrelated_save_leaves_salary_alone(self):
+        profile = JobSeekerProfile.objects.only('pk', 'bio').get(pk=self.profile.pk)
+        # Changed by another request after this instance was loaded
+        JobSeekerProfile.objects.filter(pk=self.profile.pk).update(
+            expected_salary_min=Decimal('30000'), expected_salary_min_monthly=3000000,
+        )
+        profile.bio = 'Electrician with ten years on site.'
+        with self.assertNumQueries(1):
+            profile.save(update_fields=['bio'])
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.expected_salary_min_monthly, 3000000)
@@ -1,3 +1,17 @@
-from django.shortcuts import render
+from django.conf import settings
+from rest_framework import generics, permissions
 
-# Create your views here.
+from jobs.conditional import ConditionalListMixin
+from .models import Skill
+from .serializers import SkillSerializer
+
+
+class SkillListView(ConditionalListMixin, generics.ListAPIView):
+    serializer_class = SkillSerializer
+    pagination_class = None
+    permission_classes = [permissions.AllowAny]
+    read_from_replicas = True
+    cache_control = {'public': True, 'max_age': settings.TAXONOMY_CACHE_MAX_AGE}
+
+    def get_queryset(self):
+        return Skill.objects.filter(is_active=True)
@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { User, Job, JobApplication, JobCategory, Skill, PaginatedResponse, JobFilters, RegisterData, LoginData } from '../types';
+import { User, Job, JobAnalytics, ApplicantComparison, RankedApplicantsResponse, JobListResponse, JobSearchResult, RecommendedJob, JobApplication, JobCategory, Skill, JobFilters, RegisterData, LoginData } from '../types';
 
 const API_BASE_URL = 'http://localhost:8001';
 
@@ -50,7 +50,7 @@ export const authAPI = {
 
 // Jobs API
 export const jobsAPI = {
-  getJobs: async (filters?: JobFilters): Promise<PaginatedResponse<Job>> => {
+  getJobs: async (filters?: JobFilters): Promise<JobListResponse> => {
     const params = new URLSearchParams();
     if (filters) {
       Object.entries(filters).forEach(([key, value]) => {
@@ -63,11 +63,31 @@ export const jobsAPI = {
     return response.data;
   },
 
+  getJobsPage: async (cursorUrl: string): Promise<JobListResponse> => {
+    const response = await api.get(cursorUrl);
+    return response.data;
+  },
+
+  searchJobs: async (filters: JobFilters & { search: string; collapse?: boolean }): Promise<JobSearchResult[]> => {
+    const response = await api.get('/jobs/search/', { params: filters });
+    return response.data;
+  },
+
+  getRecommendedJobs: async (limit = 20): Promise<RecommendedJob[]> => {
+    const response = await api.get('/jobs/recommended/', { params: { limit } });
+    return response.data;
+  },
+
   getJob: async (id: string): Promise<Job> => {
     const response = await api.get(`/jobs/${id}/`);
     return response.data;
   },
 
+  getJobAnalytics: async (id: string, days = 30): Promise<JobAnalytics> => {
+    const response = await api.get(`/jobs/${id}/analytics/`, { params: { days } });
+    return response.data;
+  },
+
   createJob: async (jobData: Partial<Job>) => {
     const response = await api.post('/jobs/', jobData);
     return response.data;
@@ -117,6 +137,26 @@ export const applicationsAPI = {
     return response.data;
   },
 
+  getRankedApplicants: async (
+    jobId: string,
+    params?: { ordering?: string; status?: string; page?: number; page_size?: number },
+  ): Promise<RankedApplicantsResponse> => {
+    const response = await api.get(`/jobs/${jobId}/applicants/`, { params });
+    return response.data;
+  },
+
+  compareApplicants: async (jobId: string, applicationIds: string[]): Promise<ApplicantComparison> => {
+    const response = await api.get(`/jobs/${jobId}/applicants/compare/`, {
+      params: { ids: applicationIds.join(',') },
+    });
+    return response.data;
+  },
+
+  withdrawApplication: async (applicationId: string): Promise<JobApplication> => {
+    const response = await api.post(`/applications/${applicationId}/withdraw/`);
+    return response.data;
+  },
+
   updateApplicationStatus: async (applicationId: string, status: string) => {
     const response = await api.patch(`/applications/${applicationId}/`, { status });
     return response.data;
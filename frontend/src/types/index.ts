@@ -76,6 +76,10 @@ export interface Job {
   state: string;
   pincode?: string;
   is_remote: boolean;
+  latitude?: number | null;
+  longitude?: number | null;
+  // Only present on radius searches
+  distance_km?: number | null;
   salary_min?: number;
   salary_max?: number;
   salary_type: 'hourly' | 'daily' | 'weekly' | 'monthly' | 'yearly' | 'project';
@@ -94,6 +98,49 @@ export interface Job {
   skill_requirements: JobSkillRequirement[];
 }
 
+// Flattened job card returned by the job listing
+export interface JobCard {
+  id: string;
+  title: string;
+  category: Pick<JobCategory, 'id' | 'name' | 'icon'>;
+  company: {
+    id: string;
+    company_name: string;
+    company_logo?: string | null;
+    is_company_verified: boolean;
+  };
+  posted_by: { id: string; name: string };
+  job_type: Job['job_type'];
+  experience_level: Job['experience_level'];
+  location: string;
+  city: string;
+  state: string;
+  pincode?: string;
+  is_remote: boolean;
+  latitude?: number | null;
+  longitude?: number | null;
+  salary_min?: number;
+  salary_max?: number;
+  salary_type: Job['salary_type'];
+  salary_negotiable: boolean;
+  is_featured: boolean;
+  application_deadline?: string;
+  created_at: string;
+  published_at?: string;
+  skills: { id: string; name: string; requirement_level: JobSkillRequirement['requirement_level'] }[];
+  distance_km?: number | null;
+}
+
+export interface JobSearchResult extends Job {
+  search_rank: number;
+  // Matching excerpt with hits wrapped in <mark></mark>
+  search_snippet: string;
+  // Id of the earliest posting this one near-duplicates, if any
+  duplicate_cluster: string | null;
+  // Near-duplicates folded into this result; only present with collapse=true
+  collapsed_duplicates?: number;
+}
+
 export interface JobSkillRequirement {
   id: string;
   skill: Skill;
@@ -107,7 +154,7 @@ export interface JobApplication {
   applicant: User;
   job_seeker_profile: JobSeekerProfile;
   cover_letter?: string;
-  status: 'pending' | 'under_review' | 'shortlisted' | 'rejected' | 'hired';
+  status: 'pending' | 'under_review' | 'shortlisted' | 'rejected' | 'hired' | 'withdrawn';
   applied_at: string;
   reviewed_at?: string;
   notes?: string;
@@ -144,14 +191,109 @@ export interface JobFilters {
   location?: string;
   job_type?: string;
   experience_level?: string;
+  // Monthly amounts; jobs paid hourly/daily/weekly/yearly are compared by their monthly equivalent
   salary_min?: number;
   salary_max?: number;
   is_remote?: boolean;
+  ordering?: 'newest' | 'salary' | 'distance';
+  // Radius search around lat/lng, or around the pincode/city given as location
+  radius_km?: number;
+  lat?: number;
+  lng?: number;
+  cursor?: string;
+  page_size?: number;
+  // Include sidebar facet counts in the response
+  facets?: boolean;
 }
 
 export interface PaginatedResponse<T> {
-  count: number;
-  next?: string;
-  previous?: string;
+  // null when the total is not cached yet for a cursor page
+  count: number | null;
+  // Opaque cursor URLs; pass them back unchanged to fetch the adjacent page
+  next?: string | null;
+  previous?: string | null;
   results: T[];
 }
+
+export interface FacetValue {
+  value: string | boolean;
+  label: string;
+  count: number;
+}
+
+// Each facet's counts ignore that facet's own filter, so alternatives stay visible
+export interface JobFacets {
+  category: FacetValue[];
+  job_type: FacetValue[];
+  experience_level: FacetValue[];
+  is_remote: FacetValue[];
+  state: FacetValue[];
+}
+
+export interface RecommendedJob extends JobCard {
+  // 0..1 blend of skill, experience, salary and location fit
+  match_score: number;
+}
+
+export interface JobListResponse extends PaginatedResponse<JobCard> {
+  facets?: JobFacets;
+}
+
+// Rolled up daily; today's numbers appear after the next rollup run
+export interface JobViewDay {
+  day: string;
+  views: number;
+  unique_users: number;
+  unique_ips: number;
+}
+
+export interface JobAnalytics {
+  job: string;
+  days: number;
+  total_views: number;
+  daily: JobViewDay[];
+}
+
+export interface SkillRequirementSummary {
+  skill_id: string;
+  name: string;
+  requirement_level: 'required' | 'preferred' | 'nice_to_have';
+  min_experience_years: number;
+}
+
+// One entry per job requirement, in the same order as `requirements`
+export interface ApplicantSkillMatch {
+  skill_id: string;
+  proficiency_level: 'beginner' | 'intermediate' | 'advanced' | 'expert' | null;
+  years_of_experience: number | null;
+  meets_years: boolean;
+  credit: number;
+}
+
+export interface RankedApplicant {
+  application_id: string;
+  status: JobApplication['status'];
+  applied_at: string;
+  applicant: { id: string; name: string; email: string };
+  experience_level: string;
+  city?: string;
+  match_score: number;
+  skill_score: number;
+  experience_fit: number;
+  salary_fit: number;
+  missing_required: number;
+  skills: ApplicantSkillMatch[];
+}
+
+export interface RankedApplicantsResponse {
+  count: number;
+  next?: string | null;
+  previous?: string | null;
+  results: RankedApplicant[];
+  requirements: SkillRequirementSummary[];
+}
+
+export interface ApplicantComparison {
+  requirements: SkillRequirementSummary[];
+  candidates: RankedApplicant[];
+}